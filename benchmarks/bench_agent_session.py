@@ -0,0 +1,74 @@
+"""
+Benchmark: per-query MCP overhead with a fresh server vs. a persistent session.
+
+"before" spawns the server, initializes and lists tools for every query (the
+old `MCPAgent.process_query` behaviour); "after" reuses one
+`MCPServerConnection`. Each query makes one `search_datasets` call, which is
+answered from the local catalog index, so no ABS API access is needed.
+
+Usage:
+  python benchmarks/bench_agent_session.py [queries]
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+# Add src/client to path
+sys.path.insert(0, os.path.abspath(os.path.join("src", "client")))
+
+from mcp.client.stdio import StdioServerParameters
+from server_connection import MCPServerConnection
+
+ROOT = os.path.abspath(".")
+
+
+def server_params():
+    return StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "abs_mcp_server.server"],
+        env={**os.environ, "PYTHONPATH": os.path.join(ROOT, "src")},
+        cwd=ROOT
+    )
+
+
+async def one_query(connection):
+    start = time.perf_counter()
+    await connection.call_tool("search_datasets", {"keyword": "consumer price", "limit": 3})
+    return time.perf_counter() - start
+
+
+async def before(n):
+    timings = []
+    for _ in range(n):
+        connection = MCPServerConnection(server_params())
+        start = time.perf_counter()
+        await one_query(connection)
+        timings.append(time.perf_counter() - start)
+        await connection.close()
+    return timings
+
+
+async def after(n):
+    connection = MCPServerConnection(server_params())
+    timings = [await one_query(connection) for _ in range(n)]
+    await connection.close()
+    return timings
+
+
+def report(label, timings):
+    ms = [t * 1000 for t in timings]
+    print(f"{label:<22} first {ms[0]:8.1f} ms   median {statistics.median(ms):8.1f} ms   "
+          f"mean(2..n) {statistics.mean(ms[1:] or ms):8.1f} ms")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"Per-query latency over {n} queries (one tool call each)\n")
+    report("before (fresh server)", asyncio.run(before(n)))
+    report("after (persistent)", asyncio.run(after(n)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Benchmark: full-history download vs. SDMX lastNObservations.
+
+For typical "latest value" queries, compares bytes transferred and latency
+of fetching the whole series against letting the API return only the last N
+observations per series.
+
+Usage:
+  python benchmarks/bench_last_n.py [N]
+"""
+import os
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.abspath("src"))
+
+from abs_mcp_server.sdmx_service import SDMXService
+
+QUERIES = [
+    ("CPI_M", "3.10001.10.50.M"),        # Monthly CPI, % change, all groups
+    ("LF", "M13.3.1599.20.AUS.M"),       # Unemployment rate, seasonally adjusted
+    ("WPI", "all"),                      # Wage Price Index, all series
+]
+
+
+def fetch(dataset_id, key, last_n=None):
+    start = time.perf_counter()
+    data, meta = SDMXService.get_data_with_meta(dataset_id, key, last_n_observations=last_n)
+    return time.perf_counter() - start, meta["bytes"], sum(SDMXService.series_lengths(data))
+
+
+def main():
+    last_n = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+
+    print(f"{'Dataset':<10} {'Mode':<12} {'Time (s)':>9} {'Bytes':>13} {'Obs':>8}")
+    print("-" * 56)
+    for dataset_id, key in QUERIES:
+        try:
+            full = fetch(dataset_id, key)
+            limited = fetch(dataset_id, key, last_n)
+        except Exception as e:
+            print(f"{dataset_id:<10} failed: {e}")
+            continue
+        for label, (elapsed, size, obs) in (("full", full), (f"last {last_n}", limited)):
+            print(f"{dataset_id:<10} {label:<12} {elapsed:>9.2f} {size:>13,} {obs:>8,}")
+        print(f"{'':<10} {'saved':<12} {full[0] - limited[0]:>9.2f} {full[1] - limited[1]:>13,}\n")
+
+
+if __name__ == "__main__":
+    main()
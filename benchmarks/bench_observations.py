@@ -0,0 +1,88 @@
+"""
+Benchmark: dict-per-observation parsing vs. the columnar ObservationTable.
+
+Builds a synthetic SDMX-JSON series payload and compares parse time and peak
+memory of materializing every observation as a dict against parsing into an
+`ObservationTable` and materializing only the rows a tool returns.
+
+Usage:
+  python benchmarks/bench_observations.py [SERIES] [PERIODS]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+# Add src to path
+sys.path.append(os.path.abspath("src"))
+
+from abs_mcp_server.observations import parse_observation_table
+
+RETURNED_ROWS = 200  # server.MAX_OBS
+
+
+def build_payload(n_series, n_periods, n_dims=5):
+    """SDMX-JSON message with n_series series of n_periods observations."""
+    series_dims = [
+        {"id": f"DIM{d}", "name": f"Dimension {d}",
+         "values": [{"id": str(i), "name": f"Dimension {d} code {i}"} for i in range(n_series)]}
+        for d in range(n_dims)
+    ]
+    time_dim = {"id": "TIME_PERIOD", "name": "Time Period",
+                "values": [{"id": str(p), "name": f"{1950 + p // 12}-{p % 12 + 1:02d}"} for p in range(n_periods)]}
+    series = {
+        ":".join([str(s)] * n_dims): {"observations": {str(p): [float(p)] for p in range(n_periods)}}
+        for s in range(n_series)
+    }
+    dimensions = [{"id": d["id"], "name": d["name"], "values": d["values"]} for d in series_dims + [time_dim]]
+    return {"dataSets": [{"series": series}]}, dimensions
+
+
+def parse_dicts(data, dimensions):
+    """Previous parser: one dict per observation, built eagerly."""
+    observations = []
+    for series_key, series_data in data["dataSets"][0]["series"].items():
+        series_indices = [int(i) for i in series_key.split(":")]
+        for obs_key, obs_val in series_data.get("observations", {}).items():
+            obs_dict = {"value": obs_val[0]}
+            indices = series_indices + [int(i) for i in obs_key.split(":")]
+            for dim, idx in zip(dimensions, indices):
+                if idx < len(dim["values"]):
+                    obs_dict[dim["name"]] = dim["values"][idx]["name"]
+            observations.append(obs_dict)
+    return observations[-RETURNED_ROWS:]
+
+
+def parse_columnar(data, dimensions):
+    return parse_observation_table(data, dimensions)[-RETURNED_ROWS:].to_records()
+
+
+def measure(parse, data, dimensions):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = parse(data, dimensions)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    n_series = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_periods = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    data, dimensions = build_payload(n_series, n_periods)
+    print(f"{n_series} series x {n_periods} periods = {n_series * n_periods:,} observations\n")
+
+    print(f"{'Method':<12} {'Time (s)':>10} {'Peak MB':>10}")
+    print("-" * 34)
+    results = []
+    for label, parse in (("dicts", parse_dicts), ("columnar", parse_columnar)):
+        elapsed, peak, result = measure(parse, data, dimensions)
+        results.append(result)
+        print(f"{label:<12} {elapsed:>10.3f} {peak / 1e6:>10.1f}")
+
+    assert results[0] == results[1], "parsers disagree"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Benchmark: `data_sample` records vs. the compact table output of data tools.
+
+Builds realistic tool results (one 200-row monthly series, and four 50-row
+regional series) and compares the serialized size as sent over MCP stdio
+(FastMCP serializes dict results with `indent=2`) and an estimate of the
+prompt tokens. With GOOGLE_API_KEY set, it also counts tokens with Gemini
+and times answering a question from each payload.
+
+Usage:
+  python benchmarks/bench_output_format.py [RUNS]
+"""
+import json
+import os
+import re
+import statistics
+import sys
+import time
+
+# Add src to path
+sys.path.append(os.path.abspath("src"))
+
+from abs_mcp_server.observations import ObservationTable
+
+ROWS = 200  # server.MAX_OBS
+TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+CPI_DIMENSIONS = [
+    ("Measure", ["Percentage change from previous period"]),
+    ("Index", ["All groups CPI"]),
+    ("Adjustment Type", ["Original"]),
+    ("Region", ["Weighted average of eight capital cities"]),
+    ("Frequency", ["Monthly"]),
+]
+CITIES = ["Sydney", "Melbourne", "Brisbane", "Perth"]
+
+
+def build_table(regions, periods):
+    """One series per region, `periods` months each, CPI-like labels."""
+    months = [f"{2009 + p // 12}-{p % 12 + 1:02d}" for p in range(periods)]
+    names = [name for name, _ in CPI_DIMENSIONS[:3]] + ["Region", "Frequency", "Time Period"]
+    labels = [labels for _, labels in CPI_DIMENSIONS[:3]] + [regions, ["Monthly"], months]
+    table = ObservationTable(names, labels)
+    for r in range(len(regions)):
+        for p in range(periods):
+            table.append(round(0.1 + (p * 7 + r) % 23 / 10, 1), [0, 0, 0, r, 0, p])
+    return table
+
+
+def serialize(payload):
+    """Text of a tool result as FastMCP sends it."""
+    return json.dumps(payload, indent=2)
+
+
+def measure(label, table):
+    records = serialize({"data_sample": table.to_records()})
+    compact = serialize({"table": table.to_compact()})
+    print(f"\n{label} ({len(table)} rows)")
+    print(f"  {'':10} {'bytes':>9} {'~tokens':>9}")
+    for name, text in (("records", records), ("compact", compact)):
+        print(f"  {name:10} {len(text.encode()):>9,} {len(TOKEN_RE.findall(text)):>9,}")
+    saved = 1 - len(compact.encode()) / len(records.encode())
+    print(f"  compact is {saved:.0%} smaller")
+    return records, compact
+
+
+def gemini_latency(payloads, runs):
+    """Gemini token counts and answer latency per payload (needs GOOGLE_API_KEY)."""
+    from google import genai
+
+    client = genai.Client(api_key=os.environ["GOOGLE_API_KEY"])
+    model = os.getenv("LLM_MODEL", "gemini-2.0-flash")
+    print(f"\nGemini ({model}, {runs} runs each)")
+    for name, text in payloads:
+        prompt = f"What was the most recent monthly value? Answer in one sentence.\n```json\n{text}\n```"
+        tokens = client.models.count_tokens(model=model, contents=prompt).total_tokens
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            client.models.generate_content(model=model, contents=prompt)
+            timings.append(time.perf_counter() - start)
+        print(f"  {name:10} {tokens:>7,} tokens  median {statistics.median(timings) * 1000:,.0f} ms")
+
+
+if __name__ == "__main__":
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    single = measure("One series", build_table(["Weighted average of eight capital cities"], ROWS))
+    multi = measure("Four regions", build_table(CITIES, ROWS // len(CITIES)))
+
+    if os.getenv("GOOGLE_API_KEY"):
+        gemini_latency([("records", single[0]), ("compact", single[1])], runs)
+    else:
+        print("\nSet GOOGLE_API_KEY to measure Gemini token counts and latency.")
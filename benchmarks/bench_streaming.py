@@ -0,0 +1,69 @@
+"""
+Benchmark: whole-body `json.loads` vs. the streaming SDMX-JSON parser.
+
+Feeds a synthetic data message in 64 KiB chunks (as it would arrive over
+HTTP) and compares parse time and peak traced memory of decoding the whole
+document against `StreamingDataParser` keeping the latest 200 observations.
+
+Usage:
+  python benchmarks/bench_streaming.py [SERIES] [PERIODS]
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Add src to path
+sys.path.append(os.path.abspath("src"))
+
+from abs_mcp_server.sdmx_stream import CHUNK_SIZE, StreamingDataParser, streaming_available
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from bench_observations import RETURNED_ROWS, build_payload
+
+
+def chunks(body):
+    for i in range(0, len(body), CHUNK_SIZE):
+        yield body[i:i + CHUNK_SIZE]
+
+
+def parse_whole(body):
+    return json.loads(b"".join(chunks(body)))
+
+
+def parse_stream(body):
+    parser = StreamingDataParser(max_observations=RETURNED_ROWS)
+    for chunk in chunks(body):
+        parser.feed(chunk)
+    return parser.close()
+
+
+def measure(parse, body):
+    tracemalloc.start()
+    start = time.perf_counter()
+    parse(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main():
+    n_series = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    n_periods = int(sys.argv[2]) if len(sys.argv) > 2 else 600
+    data, _ = build_payload(n_series, n_periods)
+    body = json.dumps(data).encode()
+    del data
+    print(f"{n_series * n_periods:,} observations, {len(body) / 1e6:.1f} MB body"
+          f" (ijson {'available' if streaming_available() else 'missing: buffered fallback'})\n")
+
+    print(f"{'Method':<12} {'Time (s)':>10} {'Peak MB':>10}")
+    print("-" * 34)
+    for label, parse in (("json.loads", parse_whole), ("streaming", parse_stream)):
+        elapsed, peak = measure(parse, body)
+        print(f"{label:<12} {elapsed:>10.3f} {peak / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark: structure-only lookup vs. full-dataset download.
+
+Compares bytes transferred and latency of `SDMXService.get_structure`
+(dataflow -> DSD -> codelists) against the legacy
+`SDMXService.get_structure_from_data` (whole dataset with detail=full).
+Caching is turned off for every run, so both methods go to the ABS API,
+and bytes are counted as received on the wire.
+
+Usage:
+  python benchmarks/bench_structure.py                # CPI_M, LF, MERCH_EXP
+  python benchmarks/bench_structure.py CPI_M RT       # custom datasets
+"""
+import os
+import sys
+import time
+from unittest.mock import patch
+
+# Add src to path
+sys.path.append(os.path.abspath("src"))
+
+from abs_mcp_server import sdmx_service
+from abs_mcp_server.config import Config
+from abs_mcp_server.http_pool import HTTPPool, wire_size
+from abs_mcp_server.sdmx_service import SDMXService
+
+DEFAULT_DATASETS = ["CPI_M", "LF", "MERCH_EXP"]
+
+
+def measure(fetch, dataset_id):
+    """Run one uncached fetch, returning (seconds, bytes, dimension count)."""
+    transferred = []
+    # Fresh pool per run so each method pays its own connection setup
+    pool = HTTPPool()
+    session = pool.session
+
+    def count(response, *args, **kwargs):
+        body = response.content  # Read the body so the raw stream has counted it
+        transferred.append(wire_size(response, len(body)))
+
+    session.hooks["response"].append(count)
+
+    # No disk, memory or response cache: every run fetches from the API
+    with patch.object(sdmx_service, "_get_session", return_value=session), \
+            patch.object(Config, "ENABLE_CACHING", False):
+        start = time.perf_counter()
+        structure = fetch(dataset_id)
+        elapsed = time.perf_counter() - start
+
+    pool.close()
+    dims = SDMXService.parse_dimensions(structure)
+    return elapsed, sum(transferred), len(dims)
+
+
+def main():
+    datasets = sys.argv[1:] or DEFAULT_DATASETS
+
+    print(f"{'Dataset':<12} {'Method':<16} {'Time (s)':>10} {'Bytes':>14} {'Dims':>6}")
+    print("-" * 62)
+    for dataset_id in datasets:
+        methods = [
+            ("structure", SDMXService._fetch_structure),
+            ("full data", SDMXService.get_structure_from_data),
+        ]
+        results = {}
+        for label, fetch in methods:
+            try:
+                results[label] = measure(fetch, dataset_id)
+            except Exception as e:
+                print(f"{dataset_id:<12} {label:<16} failed: {e}")
+                continue
+            elapsed, size, dims = results[label]
+            print(f"{dataset_id:<12} {label:<16} {elapsed:>10.2f} {size:>14,} {dims:>6}")
+
+        if len(results) == 2:
+            fast, slow = results["structure"], results["full data"]
+            print(f"{'':<12} {'speedup':<16} {slow[0] / max(fast[0], 1e-9):>9.1f}x "
+                  f"{slow[1] / max(fast[1], 1):>13.1f}x")
+        print()
+
+
+if __name__ == "__main__":
+    main()
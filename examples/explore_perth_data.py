@@ -1,18 +1,19 @@
 
+import asyncio
 import sys
 import os
 import json
 sys.path.append(os.path.abspath("src"))
 
-from abs_mcp_server.server import search_datasets, get_dataset_structure
+from abs_mcp_server.server import search_datasets, get_dataset_structure, get_dataset_data
 
 def explore():
     print("--- Step 1: Search ---")
-    results = search_datasets("Regional Population")
+    results = asyncio.run(search_datasets("Regional Population"))
     # If empty, try "ERP"
     if not results:
         print("Retrying with 'ERP'...")
-        results = search_datasets("ERP")
+        results = asyncio.run(search_datasets("ERP"))
 
     print(f"Found {len(results)} datasets.")
     for r in results[:10]:
@@ -30,7 +31,7 @@ def explore():
 
     print(f"\n--- Step 2: Structure for {target_id} ---")
     if target_id:
-        struct = get_dataset_structure(target_id)
+        struct = asyncio.run(get_dataset_structure(target_id))
         
         if "error" in struct:
             print(f"Error: {struct['error']}")
@@ -64,7 +65,7 @@ def explore():
             # I'll try to find a "Persons" measure or similar
             
             print(f"Attempting fetch with filters: {filters}")
-            data = get_dataset_data(target_id, filters=filters)
+            data = asyncio.run(get_dataset_data(target_id, filters=filters))
             
             if "error" in data:
                  print(f"Fetch Error: {data['error']}")
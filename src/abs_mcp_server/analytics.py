@@ -0,0 +1,159 @@
+"""Per-series statistics computed on the server.
+
+Trend questions ("inflation change over the last 5 years") used to ship
+every observation to the LLM for it to do the arithmetic in context.
+`series_statistics` computes the usual figures once per series, in single
+passes over the ordered values:
+
+- `pop`: change on the previous period (absolute and %)
+- `yoy`: change on the same period a year earlier (absolute and %)
+- `rolling`: trailing mean over `window` periods
+- `minmax`: lowest and highest observation
+- `cagr`: compound annual growth rate between the first and last observation
+
+The result is a short summary per series plus a compact table of the last
+few periods with the requested columns.
+"""
+import math
+from typing import Any, Dict, List, Optional, Sequence
+
+from .observations import MISSING, ObservationTable, series_labels, series_rows
+from .periods import PERIODS_PER_YEAR, period_index, period_start
+
+METRICS = ("pop", "yoy", "rolling", "minmax", "cagr")
+DAYS_PER_YEAR = 365.2425
+
+
+def _round(value: Optional[float], digits: int = 4) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+def pct_change(current: float, previous: Optional[float]) -> Optional[float]:
+    """Change from `previous` to `current` in % (None without a non-zero previous value)."""
+    if previous is None or previous == 0:
+        return None
+    return (current / previous - 1) * 100
+
+
+def rolling_mean(values: Sequence[float], window: int) -> List[Optional[float]]:
+    """Trailing mean over `window` values (None until the window is full)."""
+    means: List[Optional[float]] = []
+    total = 0.0
+    for i, value in enumerate(values):
+        total += value
+        if i >= window:
+            total -= values[i - window]
+        means.append(total / window if i >= window - 1 else None)
+    return means
+
+
+def cagr(first_period: str, first_value: float, last_period: str, last_value: float) -> Optional[float]:
+    """Compound annual growth rate in % between two observations (None if undefined)."""
+    return _growth_rate(first_value, last_value, period_start(last_period) - period_start(first_period))
+
+
+def _growth_rate(first_value: float, last_value: float, days: int) -> Optional[float]:
+    years = days / DAYS_PER_YEAR
+    if years <= 0 or first_value <= 0 or last_value <= 0:
+        return None
+    return ((last_value / first_value) ** (1 / years) - 1) * 100
+
+
+def series_statistics(periods: Sequence[str], values: Sequence[Any],
+                      metrics: Sequence[str] = METRICS, window: Optional[int] = None,
+                      rows: int = 12) -> Dict[str, Any]:
+    """Statistics of one series given its periods and values (in any order).
+
+    Non-numeric values are skipped; a period given twice keeps its last value.
+
+    Args:
+        periods: SDMX period strings
+        values: Observation values, one per period
+        metrics: Any of `METRICS`
+        window: Rolling window in periods (default: one year of periods, at least 2)
+        rows: Number of latest periods returned in `table` (0 for none)
+
+    Raises:
+        ValueError: If a period is not in a supported format, or a metric is unknown
+    """
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        raise ValueError(f"Unknown metrics: {', '.join(sorted(unknown))} (use {', '.join(METRICS)})")
+
+    by_period = {
+        period: float(value) for period, value in zip(periods, values)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+    }
+    if not by_period:
+        return {"count": 0}
+    labels = list(by_period)
+    index = period_index(labels, strict=True)
+    order = index.order()
+    ordered = [labels[i] for i in order]
+    vals = [by_period[p] for p in ordered]
+    frequency = index.frequencies[order[-1]]
+    window = window or max(2, PERIODS_PER_YEAR[frequency])
+
+    result: Dict[str, Any] = {
+        "frequency": frequency,
+        "count": len(ordered),
+        "first": [ordered[0], vals[0]],
+        "last": [ordered[-1], vals[-1]],
+        "change": _round(vals[-1] - vals[0]),
+        "change_pct": _round(pct_change(vals[-1], vals[0])),
+    }
+    columns: Dict[str, List[Optional[float]]] = {}
+
+    if "pop" in metrics:
+        columns["pop_change"] = [None] + [vals[i] - vals[i - 1] for i in range(1, len(vals))]
+        columns["pop_pct"] = [None] + [pct_change(vals[i], vals[i - 1]) for i in range(1, len(vals))]
+    if "yoy" in metrics:
+        earlier = index.year_earlier()
+        previous = [by_period[labels[earlier[i]]] if earlier[i] is not None else None for i in order]
+        columns["yoy_change"] = [v - prev if prev is not None else None for v, prev in zip(vals, previous)]
+        columns["yoy_pct"] = [pct_change(v, prev) for v, prev in zip(vals, previous)]
+    if "rolling" in metrics:
+        result["window"] = window
+        columns[f"rolling_mean_{window}"] = rolling_mean(vals, window)
+    for name, column in columns.items():
+        result[f"latest_{name}"] = _round(column[-1])
+    if "minmax" in metrics:
+        low = min(range(len(vals)), key=vals.__getitem__)
+        high = max(range(len(vals)), key=vals.__getitem__)
+        result["min"] = [ordered[low], vals[low]]
+        result["max"] = [ordered[high], vals[high]]
+    if "cagr" in metrics:
+        days = index.starts[order[-1]] - index.starts[order[0]]
+        result["cagr_pct"] = _round(_growth_rate(vals[0], vals[-1], days))
+
+    if rows:
+        start = max(0, len(ordered) - rows)
+        result["table"] = {
+            "columns": ["period", "value"] + list(columns),
+            "rows": [
+                [ordered[i], vals[i]] + [_round(column[i]) for column in columns.values()]
+                for i in range(start, len(ordered))
+            ],
+        }
+    return result
+
+
+def table_statistics(table: ObservationTable, metrics: Sequence[str] = METRICS,
+                     window: Optional[int] = None, rows: int = 12) -> List[Dict[str, Any]]:
+    """`series_statistics` for every series of a table (time is the last dimension).
+
+    Each entry starts with `series`, the labels that tell it apart from the
+    other series; a series whose periods cannot be read gets an `error`.
+    """
+    groups = series_rows(table)
+    time_dim = len(table.dimension_names) - 1
+    results = []
+    for group, labels in zip(groups, series_labels(table, groups)):
+        group = [row for row in group if table.codes[time_dim][row] != MISSING]
+        periods = [table.labels[time_dim][table.codes[time_dim][row]] for row in group]
+        try:
+            stats = series_statistics(periods, [table.values[row] for row in group], metrics, window, rows)
+        except ValueError as e:
+            stats = {"error": str(e)}
+        results.append({"series": labels, **stats})
+    return results
@@ -0,0 +1,444 @@
+"""asyncio-native ABS API client mirroring `SDMXService`.
+
+Requests go through one `httpx.AsyncClient` per event loop with a bounded
+number of in-flight calls, so slow ABS responses do not block other tool
+calls. Parsing is shared with the synchronous `SDMXService`. The caches
+are synchronous (SQLite, zstd/zlib), so their reads and writes run in
+worker threads (`asyncio.to_thread`) instead of on the event loop.
+"""
+import asyncio
+import json
+import logging
+import time
+import weakref
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+from .catalog_search import CatalogIndex, get_catalog_index, set_catalog_index
+from .http_pool import RETRY_STATUS_CODES
+from .sdmx_stream import CHUNK_SIZE as STREAM_CHUNK_SIZE, StreamingDataParser
+from .memory_cache import get_memory_cache
+from .series_store import gap_periods, load_series, request_days, save_series, series_store_enabled
+from .singleflight import AsyncSingleFlight
+from .response_cache import BodyRecorder, ResponseCache, get_response_cache
+from .sdmx_service import (
+    ABS_API_BASE,
+    API_TIMEOUT,
+    DATA_ACCEPT,
+    STRUCTURE_ACCEPT,
+    SDMXService,
+    _params_key,
+)
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        HTTP_POOL_SIZE = 10
+        HTTP_RETRIES = 3
+        HTTP_BACKOFF = 0.5
+        MAX_CONCURRENT_REQUESTS = 8
+        SERIES_STORE_MAX_OBSERVATIONS = 50000
+
+logger = logging.getLogger(__name__)
+
+# One client and semaphore per event loop (both are loop-bound)
+_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+_pool_stats = {"requests": 0, "connections_opened": 0}
+
+# In-flight upstream calls, so identical concurrent requests share one fetch
+_flights = AsyncSingleFlight()
+
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the pooled async client for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            timeout=API_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=Config.HTTP_POOL_SIZE,
+                max_keepalive_connections=Config.HTTP_POOL_SIZE
+            )
+        )
+        _clients[loop] = client
+    return client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    """Limit on concurrent ABS requests for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _semaphores.get(loop)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(Config.MAX_CONCURRENT_REQUESTS)
+        _semaphores[loop] = semaphore
+    return semaphore
+
+
+async def _trace(event_name: str, info: Dict[str, Any]) -> None:
+    """httpcore trace hook: count newly opened TCP connections."""
+    if event_name == "connection.connect_tcp.complete":
+        _pool_stats["connections_opened"] += 1
+
+
+async def _send(url: str, params: Optional[Dict[str, str]], accept: str, stream: bool,
+                headers: Optional[Dict[str, str]]) -> httpx.Response:
+    """GET with the shared retry policy; returns the final response holding a concurrency permit.
+
+    The permit is taken per attempt and released before each backoff sleep,
+    so retries do not hold up other requests. The caller releases it once the
+    response is finished with.
+    """
+    client = _get_client()
+    semaphore = _get_semaphore()
+    attempt = 0
+    while True:
+        await semaphore.acquire()
+        try:
+            _pool_stats["requests"] += 1
+            request = client.build_request(
+                "GET", url, params=params, headers={"Accept": accept, **(headers or {})},
+                extensions={"trace": _trace}
+            )
+            response = await client.send(request, stream=stream)
+        except httpx.TransportError as e:
+            semaphore.release()
+            if attempt >= Config.HTTP_RETRIES:
+                raise
+            logger.warning(f"ABS API transport error for {url}: {e}, retrying")
+        except BaseException:
+            semaphore.release()
+            raise
+        else:
+            if response.status_code not in RETRY_STATUS_CODES or attempt >= Config.HTTP_RETRIES:
+                return response
+            try:
+                if stream:
+                    await response.aclose()
+            finally:
+                semaphore.release()
+            logger.warning(f"ABS API {response.status_code} for {url}, retrying")
+        await asyncio.sleep(Config.HTTP_BACKOFF * (2 ** attempt))
+        attempt += 1
+
+
+async def _request(url: str, params: Optional[Dict[str, str]] = None, accept: str = DATA_ACCEPT,
+                   headers: Optional[Dict[str, str]] = None) -> httpx.Response:
+    """GET with the shared retry policy (same status codes and backoff as the sync pool).
+
+    Returns the final response with its body read; callers decide how to
+    treat error statuses.
+    """
+    response = await _send(url, params, accept, False, headers)
+    _get_semaphore().release()
+    return response
+
+
+@asynccontextmanager
+async def _stream(url: str, params: Optional[Dict[str, str]] = None, accept: str = DATA_ACCEPT,
+                  headers: Optional[Dict[str, str]] = None) -> AsyncIterator[httpx.Response]:
+    """Streamed GET (see `_request`); the concurrency permit is held until the body is closed,
+    so `MAX_CONCURRENT_REQUESTS` also bounds large downloads."""
+    response = await _send(url, params, accept, True, headers)
+    try:
+        yield response
+    finally:
+        try:
+            await response.aclose()
+        finally:
+            _get_semaphore().release()
+
+
+def _wire_size(response: httpx.Response, default: int) -> int:
+    """Bytes of `response` read off the connection, like `http_pool.wire_size`.
+
+    Responses built in memory (no connection) fall back to `Content-Length`.
+    """
+    if response.num_bytes_downloaded:
+        return response.num_bytes_downloaded
+    length = response.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else default
+
+
+async def _conditional_get(url: str, params: Optional[Dict[str, str]], accept: str,
+                           allow_404: bool = False) -> Tuple[int, bytes, Dict[str, Any]]:
+    """Async counterpart of `SDMXService._conditional_get` (same response cache)."""
+    cache = get_response_cache()
+    key, entry = None, None
+    headers = {}
+    if cache is not None:
+        key = ResponseCache.key(url, params, accept)
+        entry, headers = await asyncio.to_thread(cache.lookup, key)
+        if cache.is_fresh(entry):
+            body = await asyncio.to_thread(cache.hit, entry)
+            return 200, body, {"bytes": 0, "body_bytes": len(body), "cache": "hit"}
+
+    response = await _request(url, params, accept, headers=headers)
+    body = response.content
+    wire_bytes = _wire_size(response, len(body))
+
+    if response.status_code == 304 and entry is not None:
+        body = await asyncio.to_thread(cache.revalidated, key, entry, response.headers)
+        return 200, body, {"bytes": wire_bytes, "body_bytes": len(body), "cache": "revalidated"}
+    if response.status_code == 404 and allow_404:
+        return 404, b"", {"bytes": wire_bytes, "body_bytes": 0, "cache": None}
+
+    response.raise_for_status()
+    if cache is not None:
+        await asyncio.to_thread(cache.store_response, key, response.headers, body)
+    return response.status_code, body, {
+        "bytes": wire_bytes, "body_bytes": len(body), "cache": "miss" if cache is not None else None
+    }
+
+
+class AsyncSDMXService:
+    @staticmethod
+    async def get_structure(dataset_id: str) -> Dict[str, Any]:
+        """Fetch and parse structure for a dataset (see `SDMXService.get_structure`).
+
+        Raises:
+            httpx.HTTPError: If API request fails
+        """
+        memory = get_memory_cache()
+        if memory is not None:
+            structure = await asyncio.to_thread(memory.get, ("structure", dataset_id))
+            if structure is not None:
+                return structure
+
+        # Concurrent first calls for one dataset share a single fetch
+        return await _flights.do(("structure", dataset_id), AsyncSDMXService._fetch_structure, dataset_id)
+
+    @staticmethod
+    async def _fetch_structure(dataset_id: str) -> Dict[str, Any]:
+        """Load a structure from the disk cache or the structure endpoints."""
+        started = time.perf_counter()
+        structure = await asyncio.to_thread(SDMXService._cached_structure, dataset_id)
+        if structure is not None:
+            await asyncio.to_thread(
+                SDMXService._remember_structure, dataset_id, structure, time.perf_counter() - started
+            )
+            return structure
+
+        params = {"references": "children"}
+        try:
+            url = SDMXService._dataflow_url(dataset_id)
+            logger.info(f"Fetching dataflow from: {url}")
+            _, body, _ = await _conditional_get(url, params, STRUCTURE_ACCEPT)
+            dataflow = SDMXService._extract_dataflow(json.loads(body), dataset_id)
+
+            url = SDMXService._datastructure_url(dataflow)
+            logger.info(f"Fetching data structure from: {url}")
+            _, body, _ = await _conditional_get(url, params, STRUCTURE_ACCEPT)
+            structure = SDMXService._parse_structure_message(dataflow, json.loads(body))
+        except httpx.HTTPError as e:
+            logger.error(f"Failed to get structure for {dataset_id}: {e}")
+            raise e
+
+        await asyncio.to_thread(SDMXService._store_structure, dataset_id, structure)
+        await asyncio.to_thread(
+            SDMXService._remember_structure, dataset_id, structure, time.perf_counter() - started
+        )
+        return structure
+
+    @staticmethod
+    async def get_data(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                       last_n_observations: Optional[int] = None, first_n_observations: Optional[int] = None) -> Dict[str, Any]:
+        """Fetch data with specific key and time params (see `SDMXService.get_data`)."""
+        data, _ = await AsyncSDMXService.get_data_with_meta(
+            dataset_id, key, start_period, end_period, last_n_observations, first_n_observations
+        )
+        return data
+
+    @staticmethod
+    async def get_data_with_meta(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                                 last_n_observations: Optional[int] = None, first_n_observations: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Like `get_data`, also returning transfer metadata (`url`, `params`, `bytes`)."""
+        url, params = SDMXService._data_request(
+            dataset_id, key, start_period, end_period, last_n_observations, first_n_observations
+        )
+        return await _flights.do(("data", url, _params_key(params)), AsyncSDMXService._fetch_data, url, params)
+
+    @staticmethod
+    async def _fetch_data(url: str, params: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        try:
+            status, body, cache_meta = await _conditional_get(url, params, DATA_ACCEPT, allow_404=True)
+            meta = {"url": url, "params": params, **cache_meta}
+
+            if status == 404:
+                logger.warning(f"ABS API 404 for {url}")
+                return {}, meta # Return empty dict for no data
+
+            data = await asyncio.to_thread(json.loads, body)
+            SDMXService._log_data_sets(data)
+            return data, meta
+        except httpx.HTTPError as e:
+            logger.error(f"ABS API Request failed: {e}")
+            raise e
+
+    @staticmethod
+    async def stream_data_with_meta(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                                    last_n_observations: Optional[int] = None, first_n_observations: Optional[int] = None,
+                                    max_observations: Optional[int] = None, keep: str = "last") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Incrementally parsed data fetch (see `SDMXService.stream_data_with_meta`)."""
+        url, params = SDMXService._data_request(
+            dataset_id, key, start_period, end_period, last_n_observations, first_n_observations
+        )
+        return await _flights.do(
+            ("stream", url, _params_key(params), max_observations, keep),
+            AsyncSDMXService._stream_data, url, params, max_observations, keep
+        )
+
+    @staticmethod
+    async def _stream_data(url: str, params: Dict[str, str], max_observations: Optional[int],
+                           keep: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        cache = get_response_cache()
+        key, entry = None, None
+        headers = {}
+        if cache is not None:
+            key = ResponseCache.key(url, params, DATA_ACCEPT)
+            entry, headers = await asyncio.to_thread(cache.lookup, key)
+            if cache.is_fresh(entry):
+                body = await asyncio.to_thread(cache.hit, entry)
+                return await asyncio.to_thread(
+                    SDMXService._parse_cached_body, url, params, body, "hit", max_observations, keep
+                )
+
+        try:
+            async with _stream(url, params, DATA_ACCEPT, headers=headers) as response:
+                if response.status_code == 304 and entry is not None:
+                    body = await asyncio.to_thread(cache.revalidated, key, entry, response.headers)
+                    return await asyncio.to_thread(
+                        SDMXService._parse_cached_body, url, params, body, "revalidated", max_observations, keep
+                    )
+                if response.status_code == 404:
+                    logger.warning(f"ABS API 404 for {url}")
+                    return {}, {"url": url, "params": params, "bytes": 0}
+
+                response.raise_for_status()
+                parser = StreamingDataParser(max_observations, keep)
+                recorder = BodyRecorder(cache.max_body_bytes if cache is not None else 0)
+                async for chunk in response.aiter_bytes(STREAM_CHUNK_SIZE):
+                    recorder.add(chunk)
+                    if parser.feed(chunk):
+                        logger.info(f"Stopped reading {url} after {parser.bytes_read} bytes")
+                        break
+                data = parser.close()
+                wire_bytes = _wire_size(response, parser.bytes_read)
+            if cache is not None:
+                await asyncio.to_thread(
+                    cache.store_response, key, response.headers, recorder.body if parser.complete else None
+                )
+            SDMXService._log_data_sets(data)
+            meta = parser.meta()
+            return data, {"url": url, "params": params, **meta, "bytes": wire_bytes,
+                          "body_bytes": meta["bytes"], "cache": "miss" if cache is not None else None}
+        except httpx.HTTPError as e:
+            logger.error(f"ABS API Request failed: {e}")
+            raise e
+
+    @staticmethod
+    async def get_series_data(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                              max_observations: Optional[int] = None, keep: str = "last") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Period-range data fetching only missing periods (see `SDMXService.get_series_data`)."""
+        if not series_store_enabled():
+            return await AsyncSDMXService.stream_data_with_meta(
+                dataset_id, key, start_period, end_period, max_observations=max_observations, keep=keep
+            )
+        return await _flights.do(
+            ("series", dataset_id, key, start_period, end_period, max_observations, keep),
+            AsyncSDMXService._series_data, dataset_id, key, start_period, end_period, max_observations, keep
+        )
+
+    @staticmethod
+    async def _series_data(dataset_id: str, key: str, start_period: Optional[str], end_period: Optional[str],
+                           max_observations: Optional[int], keep: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        entry = await asyncio.to_thread(load_series, dataset_id, key)
+        started = time.perf_counter()
+        try:
+            start, end = request_days(start_period, end_period)
+            gaps = entry.gaps(start, end)
+            fetched = []
+            for gap in gaps:
+                gap_start, gap_end = gap_periods(gap, start_period, end_period)
+                data, meta = await AsyncSDMXService.stream_data_with_meta(
+                    dataset_id, key, gap_start, gap_end,
+                    max_observations=Config.SERIES_STORE_MAX_OBSERVATIONS
+                )
+                if not SDMXService._merge_gap(dataset_id, entry, gap, data, meta):
+                    raise ValueError(f"gap {gap_start}..{gap_end} too large to store")
+                fetched.append(meta)
+        except ValueError as e:
+            logger.info(f"Series store skipped for {dataset_id}/{key}: {e}")
+            return await AsyncSDMXService.stream_data_with_meta(
+                dataset_id, key, start_period, end_period, max_observations=max_observations, keep=keep
+            )
+
+        if gaps:
+            await asyncio.to_thread(save_series, dataset_id, key, entry, time.perf_counter() - started)
+        return SDMXService._series_result(dataset_id, key, start_period, end_period, entry, gaps, fetched,
+                                          max_observations, keep)
+
+    @staticmethod
+    async def fetch_dataflows() -> List[Dict[str, Any]]:
+        """Download the live `/dataflow` listing (revalidated through the response cache)."""
+        _, body, _ = await _conditional_get(f"{ABS_API_BASE}/dataflow", None, STRUCTURE_ACCEPT)
+        dataflows_container = json.loads(body).get("data", {})
+        if isinstance(dataflows_container, dict):
+            return dataflows_container.get("dataflows", [])
+        return []
+
+    @staticmethod
+    async def search_datasets(keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Search available ABS datasets (local index; see `SDMXService.search_datasets`)."""
+        try:
+            await asyncio.to_thread(get_catalog_index)  # Loads the snapshot file on first use
+        except FileNotFoundError:
+            try:
+                set_catalog_index(CatalogIndex.from_dataflows(await AsyncSDMXService.fetch_dataflows()))
+            except Exception as e:
+                logger.error(f"Search failed: {e}")
+                return []
+        return SDMXService.search_datasets(keyword, limit)
+
+    @staticmethod
+    async def gather(calls: Iterable[Awaitable[Any]]) -> List[Any]:
+        """Run several service calls concurrently, returning results or exceptions in order.
+
+        In-flight HTTP requests stay bounded by `MAX_CONCURRENT_REQUESTS`.
+        """
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    @staticmethod
+    def pool_stats() -> Dict[str, Any]:
+        """Async connection pool statistics (same shape as `SDMXService.pool_stats`)."""
+        requests_made = _pool_stats["requests"]
+        opened = _pool_stats["connections_opened"]
+        reused = max(requests_made - opened, 0)
+        return {
+            "pool_maxsize": Config.HTTP_POOL_SIZE,
+            "max_concurrent_requests": Config.MAX_CONCURRENT_REQUESTS,
+            "requests": requests_made,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_rate": round(reused / requests_made, 3) if requests_made else 0.0,
+        }
+
+    @staticmethod
+    def coalescing_stats() -> Dict[str, int]:
+        """Upstream calls made vs. concurrent identical calls that shared one."""
+        return _flights.stats()
+
+    @staticmethod
+    async def aclose() -> None:
+        """Close the HTTP client of the running event loop."""
+        loop = asyncio.get_running_loop()
+        client = _clients.pop(loop, None)
+        _semaphores.pop(loop, None)
+        if client is not None:
+            await client.aclose()
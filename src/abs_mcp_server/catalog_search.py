@@ -0,0 +1,215 @@
+"""Local full-text search over the ABS dataflow catalog.
+
+Builds a tokenized inverted index from a catalog snapshot
+(`docs/abs_dataset_catalog.json`, `dta.xml`, or a live `/dataflow` listing)
+and ranks matches with BM25, so `search_datasets` needs no network call.
+"""
+import json
+import logging
+import math
+import re
+import threading
+import xml.etree.ElementTree as ET
+from bisect import bisect_left
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        CATALOG_FILE = None
+
+logger = logging.getLogger(__name__)
+
+# Repository snapshot, used when CATALOG_FILE is not set
+DEFAULT_CATALOG_FILES = [
+    Path(__file__).resolve().parents[2] / "docs" / "abs_dataset_catalog.json",
+    Path(__file__).resolve().parents[2] / "dta.xml",
+]
+
+SDMX_NS = {
+    "structure": "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/structure",
+    "common": "http://www.sdmx.org/resources/sdmxml/schemas/v2_1/common",
+}
+
+STOPWORDS = {"a", "an", "and", "by", "for", "in", "of", "on", "or", "the", "to", "with"}
+
+# BM25 parameters
+K1 = 1.2
+B = 0.75
+ID_BOOST = 2        # Dataset id tokens count this many times in a document
+PREFIX_WEIGHT = 0.5  # Score multiplier for prefix (vs exact) term matches
+MIN_PREFIX_LENGTH = 3  # Shorter tokens only match exactly
+MAX_PREFIX_TERMS = 50
+EXACT_ID_BONUS = 10.0  # Added when the whole query is a dataset id
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase alphanumeric tokens with stopwords removed."""
+    return [t for t in _TOKEN_RE.findall(text.lower()) if t not in STOPWORDS]
+
+
+def _id_tokens(dataset_id: str) -> List[str]:
+    """Tokens for a dataset id: the whole id plus its `_`-separated parts."""
+    parts = tokenize(dataset_id)
+    whole = dataset_id.lower()
+    return [whole] + parts if whole not in parts else parts
+
+
+class CatalogIndex:
+    """Inverted index over dataflow entries with BM25 ranking and prefix matching."""
+
+    def __init__(self, entries: List[Dict[str, Any]]):
+        self.entries = entries
+        self._postings: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        self._doc_lengths: List[int] = []
+        self._ids: Dict[str, int] = {}
+
+        for doc_id, entry in enumerate(entries):
+            self._ids.setdefault((entry.get("id") or "").lower(), doc_id)
+            tokens = _id_tokens(entry.get("id") or "") * ID_BOOST
+            tokens += tokenize(entry.get("name") or "")
+            tokens += tokenize(entry.get("description") or "")
+            self._doc_lengths.append(len(tokens))
+            for term, tf in Counter(tokens).items():
+                self._postings[term].append((doc_id, tf))
+
+        n_docs = len(entries)
+        self._avg_length = (sum(self._doc_lengths) / n_docs) if n_docs else 0.0
+        self._idf = {
+            term: math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for term, postings in self._postings.items()
+        }
+        self._vocabulary = sorted(self._postings)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def _expand(self, token: str) -> List[Tuple[str, float]]:
+        """Index terms matching `token` exactly or by prefix, with match weights."""
+        matches = []
+        if token in self._postings:
+            matches.append((token, 1.0))
+        if len(token) < MIN_PREFIX_LENGTH:
+            return matches
+        start = bisect_left(self._vocabulary, token)
+        for term in self._vocabulary[start:start + MAX_PREFIX_TERMS + 1]:
+            if not term.startswith(token):
+                break
+            if term != token:
+                matches.append((term, PREFIX_WEIGHT))
+        return matches
+
+    def search(self, query: str, limit: int = 10) -> List[Tuple[Dict[str, Any], float]]:
+        """Return up to `limit` (entry, score) pairs, best first.
+
+        An empty query returns the first `limit` catalog entries with score 0.
+        """
+        tokens = tokenize(query)
+        # Keep whole dataset ids such as "cpi_m" as terms too
+        tokens += [word for word in query.lower().split() if "_" in word]
+        if not tokens:
+            return [(entry, 0.0) for entry in self.entries[:limit]]
+
+        scores: Dict[int, float] = defaultdict(float)
+        for token in dict.fromkeys(tokens):
+            for term, weight in self._expand(token):
+                idf = self._idf[term]
+                for doc_id, tf in self._postings[term]:
+                    norm = K1 * (1 - B + B * self._doc_lengths[doc_id] / self._avg_length)
+                    scores[doc_id] += weight * idf * tf * (K1 + 1) / (tf + norm)
+
+        exact = self._ids.get(query.strip().lower())
+        if exact is not None:
+            scores[exact] += EXACT_ID_BONUS
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [(self.entries[doc_id], score) for doc_id, score in ranked]
+
+    @classmethod
+    def from_file(cls, path: Path) -> "CatalogIndex":
+        """Build from a JSON catalog (list of dataflows) or SDMX-ML dataflow XML."""
+        path = Path(path)
+        if path.suffix.lower() == ".xml":
+            return cls(_load_xml_catalog(path))
+        with open(path) as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_dataflows(cls, dataflows: List[Dict[str, Any]]) -> "CatalogIndex":
+        """Build from the `data.dataflows` list of a live SDMX-JSON listing."""
+        return cls([
+            {
+                "id": df.get("id"),
+                "name": df.get("name"),
+                "description": df.get("description"),
+                "version": df.get("version"),
+                "agencyID": df.get("agencyID"),
+            }
+            for df in dataflows
+        ])
+
+
+def _load_xml_catalog(path: Path) -> List[Dict[str, Any]]:
+    """Read dataflows from an SDMX-ML structure message (e.g. `dta.xml`)."""
+    root = ET.parse(path).getroot()
+    entries = []
+    for dataflow in root.findall(".//structure:Dataflow", SDMX_NS):
+        name_elem = dataflow.find("common:Name", SDMX_NS)
+        desc_elem = dataflow.find("common:Description", SDMX_NS)
+        entries.append({
+            "id": dataflow.get("id"),
+            "name": name_elem.text if name_elem is not None else "",
+            "description": desc_elem.text if desc_elem is not None else None,
+            "version": dataflow.get("version"),
+            "agencyID": dataflow.get("agencyID"),
+        })
+    return entries
+
+
+def find_catalog_file() -> Optional[Path]:
+    """Locate the catalog snapshot: CATALOG_FILE first, then the bundled files."""
+    candidates = [Path(Config.CATALOG_FILE)] if Config.CATALOG_FILE else []
+    candidates += DEFAULT_CATALOG_FILES
+    for path in candidates:
+        if path.exists():
+            return path
+    return None
+
+
+_index: Optional[CatalogIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_catalog_index(loader=None) -> CatalogIndex:
+    """Return the process-wide catalog index, building it on first use.
+
+    Args:
+        loader: Callable returning live `dataflows` when no snapshot file exists.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                path = find_catalog_file()
+                if path is not None:
+                    _index = CatalogIndex.from_file(path)
+                    logger.info(f"Loaded catalog index from {path} ({len(_index)} datasets)")
+                elif loader is not None:
+                    _index = CatalogIndex.from_dataflows(loader())
+                    logger.info(f"Built catalog index from live dataflows ({len(_index)} datasets)")
+                else:
+                    raise FileNotFoundError("No dataflow catalog snapshot found")
+    return _index
+
+
+def set_catalog_index(index: Optional[CatalogIndex]) -> None:
+    """Replace the process-wide index (e.g. after a refresh); None forces a rebuild."""
+    global _index
+    with _index_lock:
+        _index = index
@@ -14,7 +14,16 @@ class Config:
     LLM_MODEL = os.getenv("LLM_MODEL", "gemini-2.0-flash")  # Stable production model
     
     # Data Settings
-    MAX_OBSERVATIONS = int(os.getenv("MAX_OBSERVATIONS", "50"))
+    MAX_OBSERVATIONS = int(os.getenv("MAX_OBSERVATIONS", "200"))  # Rows parsed per data request
+    # Bytes a data tool result may take (estimated tokens x 4); larger results are shaped to fit, 0 = no limit
+    RESPONSE_MAX_BYTES = int(os.getenv("RESPONSE_MAX_BYTES", "32768"))
+    ANALYTICS_MAX_OBSERVATIONS = int(os.getenv("ANALYTICS_MAX_OBSERVATIONS", "5000"))  # Rows get_series_statistics and join_series read per request
+    # Default row layout of data tools: records (one dict per row) or compact (header + rows)
+    OUTPUT_FORMAT = os.getenv("OUTPUT_FORMAT", "records")
+    
+    # Dataflow catalog snapshot for search_datasets (JSON list or SDMX-ML XML);
+    # defaults to docs/abs_dataset_catalog.json in the repository
+    CATALOG_FILE = os.getenv("CATALOG_FILE")
     
     # Logging Settings
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
@@ -23,7 +32,40 @@ class Config:
     
     # Performance Settings
     ENABLE_CACHING = os.getenv("ENABLE_CACHING", "true").lower() == "true"
-    CACHE_SIZE = int(os.getenv("CACHE_SIZE", "100"))
+    # In-process cache of structures, response bodies and the dataflow listing, bounded in bytes
+    MEMORY_CACHE_MAX_MB = int(os.getenv("MEMORY_CACHE_MAX_MB", "256"))
+    MEMORY_CACHE_COMPRESSION = os.getenv("MEMORY_CACHE_COMPRESSION", "zstd")  # Cold entries: zstd, zlib or none
+    HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "4"))  # Hosts kept in the pool
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "10"))  # Keep-alive connections per host
+    HTTP_RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+    HTTP_BACKOFF = float(os.getenv("HTTP_BACKOFF", "0.5"))  # seconds, exponential
+    MAX_CONCURRENT_REQUESTS = int(os.getenv("MAX_CONCURRENT_REQUESTS", "8"))  # In-flight async ABS calls
+    
+    # batch_get_dataset_data tool
+    BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "20"))
+    BATCH_MAX_PARALLEL = int(os.getenv("BATCH_MAX_PARALLEL", "4"))  # Items run at once
+    BATCH_ITEM_TIMEOUT = float(os.getenv("BATCH_ITEM_TIMEOUT", "30"))  # seconds per item
+    
+    # Persistent cache (shared by server processes, survives restarts)
+    DISK_CACHE_ENABLED = os.getenv("DISK_CACHE_ENABLED", "true").lower() == "true"
+    DISK_CACHE_PATH = Path(os.getenv("DISK_CACHE_PATH", "~/.cache/abs-mcp-server/cache.sqlite3")).expanduser()
+    DISK_CACHE_MAX_MB = int(os.getenv("DISK_CACHE_MAX_MB", "256"))
+    STRUCTURE_CACHE_TTL = int(os.getenv("STRUCTURE_CACHE_TTL", "86400"))  # seconds
+    
+    # Conditional-request (ETag / Last-Modified) cache of ABS responses: disk, memory or off
+    RESPONSE_CACHE = os.getenv("RESPONSE_CACHE", "disk")
+    RESPONSE_CACHE_MAX_MB = int(os.getenv("RESPONSE_CACHE_MAX_MB", "64"))  # Largest streamed body kept
+    RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", str(30 * 86400)))  # seconds kept on disk for revalidation
+    
+    # Incremental series store: period-range requests only fetch periods not already held
+    SERIES_STORE_ENABLED = os.getenv("SERIES_STORE_ENABLED", "true").lower() == "true"
+    SERIES_STORE_MAX_OBSERVATIONS = int(os.getenv("SERIES_STORE_MAX_OBSERVATIONS", "50000"))  # Per gap fetch
+    SERIES_STORE_TTL = int(os.getenv("SERIES_STORE_TTL", str(7 * 86400)))  # seconds; then refetched for revisions
+    
+    # Scheduled ABS release dates: cached responses stay fresh until a dataflow's next release;
+    # defaults to release_calendar.json in the package (a placeholder: no dataflow is verified)
+    RELEASE_CALENDAR_ENABLED = os.getenv("RELEASE_CALENDAR_ENABLED", "true").lower() == "true"
+    RELEASE_CALENDAR_FILE = os.getenv("RELEASE_CALENDAR_FILE")
     
     # Safety Settings
     MAX_TURNS = int(os.getenv("MAX_TURNS", "5"))  # Max LLM invocations per query
@@ -0,0 +1,180 @@
+"""Persistent SQLite cache shared by all server processes.
+
+The agent starts a fresh server process per query, so in-memory caches are
+always cold. Entries stored here (parsed structures and the like) survive
+restarts. Values are zlib-compressed JSON with a per-entry expiry; the file
+is size-limited by evicting least recently used entries. SQLite WAL mode
+gives atomic writes and safe concurrent access from several processes.
+"""
+import json
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        ENABLE_CACHING = True
+        DISK_CACHE_ENABLED = True
+        DISK_CACHE_PATH = Path.home() / ".cache" / "abs-mcp-server" / "cache.sqlite3"
+        DISK_CACHE_MAX_MB = 256
+        STRUCTURE_CACHE_TTL = 86400
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    namespace TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    expires REAL,
+    accessed REAL NOT NULL,
+    PRIMARY KEY (namespace, key)
+)
+"""
+
+
+class DiskCache:
+    """Size-limited key/value store with per-entry TTL, backed by SQLite."""
+
+    def __init__(self, path: Path, max_bytes: int, default_ttl: Optional[float] = None):
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), timeout=10, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(_SCHEMA)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed ON entries (accessed)")
+
+    def get(self, namespace: str, key: str) -> Optional[Any]:
+        """Return the stored value, or None if missing or expired."""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires FROM entries WHERE namespace = ? AND key = ?",
+                (namespace, key)
+            ).fetchone()
+            if row is None or (row[1] is not None and row[1] <= now):
+                self._misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE entries SET accessed = ? WHERE namespace = ? AND key = ?",
+                (now, namespace, key)
+            )
+            self._hits += 1
+        return json.loads(zlib.decompress(row[0]))
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store a JSON-serializable value; `ttl` seconds (None = default TTL)."""
+        blob = zlib.compress(json.dumps(value, separators=(",", ":")).encode("utf-8"))
+        if len(blob) > self.max_bytes:
+            logger.warning(f"Not caching {namespace}/{key}: {len(blob)} bytes exceeds cache size")
+            return
+
+        now = time.time()
+        ttl = self.default_ttl if ttl is None else ttl
+        expires = now + ttl if ttl is not None else None
+        with self._lock:
+            # One transaction: the write and any eviction commit atomically
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (namespace, key, blob, len(blob), now, expires, now)
+                )
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        self._conn.execute("DELETE FROM entries WHERE expires IS NOT NULL AND expires <= ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for namespace, key, size in self._conn.execute(
+            "SELECT namespace, key, size FROM entries ORDER BY accessed"
+        ).fetchall():
+            self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def delete(self, namespace: str, key: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM entries WHERE namespace = ? AND key = ?", (namespace, key))
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Remove all entries (or all entries of one namespace)."""
+        with self._lock:
+            if namespace is None:
+                self._conn.execute("DELETE FROM entries")
+            else:
+                self._conn.execute("DELETE FROM entries WHERE namespace = ?", (namespace,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()
+        return {
+            "path": str(self.path),
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self.max_bytes,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[DiskCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_disk_cache() -> Optional[DiskCache]:
+    """Return the process-wide disk cache, or None if disabled or unavailable."""
+    global _cache
+    if not (Config.ENABLE_CACHING and Config.DISK_CACHE_ENABLED):
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                try:
+                    _cache = DiskCache(
+                        Config.DISK_CACHE_PATH,
+                        max_bytes=Config.DISK_CACHE_MAX_MB * 1024 * 1024,
+                        default_ttl=Config.STRUCTURE_CACHE_TTL
+                    )
+                    logger.info(f"Opened disk cache at {Config.DISK_CACHE_PATH}")
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(f"Disk cache unavailable ({e}); continuing without it")
+                    Config.DISK_CACHE_ENABLED = False
+                    return None
+    return _cache
+
+
+def set_disk_cache(cache: Optional[DiskCache]) -> None:
+    """Replace the process-wide disk cache (e.g. to point tests at a temp file)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
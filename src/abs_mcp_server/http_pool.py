@@ -0,0 +1,134 @@
+"""Process-wide pooled HTTP session for ABS API calls."""
+import atexit
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        HTTP_POOL_CONNECTIONS = 4
+        HTTP_POOL_SIZE = 10
+        HTTP_RETRIES = 3
+        HTTP_BACKOFF = 0.5
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = [429, 500, 502, 503, 504]
+
+
+def build_retry() -> Retry:
+    """Retry policy shared by every ABS request."""
+    return Retry(
+        total=Config.HTTP_RETRIES,
+        backoff_factor=Config.HTTP_BACKOFF,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=["HEAD", "GET", "OPTIONS"]
+    )
+
+
+class HTTPPool:
+    """A lazily created `requests.Session` with a keep-alive connection pool.
+
+    One instance is shared by all `SDMXService` calls so TCP/TLS connections to
+    the ABS API are reused across tool calls instead of re-handshaking.
+    """
+
+    def __init__(self, pool_connections: Optional[int] = None, pool_maxsize: Optional[int] = None):
+        self.pool_connections = pool_connections or Config.HTTP_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or Config.HTTP_POOL_SIZE
+        self._session: Optional[requests.Session] = None
+        self._adapter: Optional[HTTPAdapter] = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Return the shared session, creating it on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    session = requests.Session()
+                    adapter = HTTPAdapter(
+                        pool_connections=self.pool_connections,
+                        pool_maxsize=self.pool_maxsize,
+                        max_retries=build_retry()
+                    )
+                    session.mount("https://", adapter)
+                    session.mount("http://", adapter)
+                    session.headers["Connection"] = "keep-alive"
+                    self._adapter = adapter
+                    self._session = session
+                    logger.info(f"Opened HTTP pool (maxsize={self.pool_maxsize} per host)")
+        return self._session
+
+    def stats(self) -> Dict[str, Any]:
+        """Connection statistics summed over all host pools.
+
+        `connections_reused` counts requests served on an already-open
+        connection (requests made minus connections opened).
+        """
+        opened = 0
+        requests_made = 0
+        hosts = 0
+        if self._adapter is not None:
+            pools = self._adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                hosts += 1
+                opened += pool.num_connections
+                requests_made += pool.num_requests
+
+        reused = max(requests_made - opened, 0)
+        return {
+            "hosts": hosts,
+            "pool_maxsize": self.pool_maxsize,
+            "requests": requests_made,
+            "connections_opened": opened,
+            "connections_reused": reused,
+            "reuse_rate": round(reused / requests_made, 3) if requests_made else 0.0,
+        }
+
+    def close(self) -> None:
+        """Close all pooled connections; the next request reopens the pool."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                logger.info("Closed HTTP pool")
+            self._session = None
+            self._adapter = None
+
+
+_pool = HTTPPool()
+atexit.register(_pool.close)
+
+
+def get_pool() -> HTTPPool:
+    """Return the process-wide HTTP pool."""
+    return _pool
+
+
+def wire_size(response: requests.Response, default: int) -> int:
+    """Bytes of `response` read off the connection so far, else `default`.
+
+    `requests` decodes gzip transparently, so `len(response.content)` is the
+    decompressed size; urllib3's `raw.tell()` counts the bytes received.
+    `Content-Length` is the fallback when the raw stream cannot tell.
+    """
+    try:
+        read = response.raw.tell()
+    except (AttributeError, OSError, ValueError):
+        read = None
+    if isinstance(read, int):
+        return read
+    length = (response.headers or {}).get("Content-Length")
+    if isinstance(length, str) and length.isdigit():
+        return int(length)
+    return default
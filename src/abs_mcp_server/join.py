@@ -0,0 +1,166 @@
+"""Time alignment of series from different datasets.
+
+Comparison questions ("CPI vs wage growth", "exports vs imports") need
+series from several dataflows, often at different frequencies (monthly
+CPI_M, quarterly WPI). The server converts each series to a common
+frequency (`resample.resample_table`) and this module lines them up:
+
+- `table_points` reads the single series of a table as period -> value
+- `transform_points` optionally turns levels into % changes, per series
+- `align_series` joins the series on period ("inner": periods every series
+  has, "outer": any period) into one compact table, with derived columns
+  such as `"Exports - Imports"` or `"CPI / WPI"`
+"""
+import math
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .analytics import pct_change
+from .observations import MISSING, ObservationTable, series_rows
+from .periods import PERIODS_PER_YEAR, period_frequency, period_index
+
+JOIN_TYPES = ("inner", "outer")
+TRANSFORMS = ("level", "pop_pct", "yoy_pct")
+OPERATORS = ("-", "/")
+
+
+def _number(value: Any) -> Optional[float]:
+    if isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value):
+        return float(value)
+    return None
+
+
+def _round(value: Optional[float], digits: int = 4) -> Optional[float]:
+    return round(value, digits) if value is not None else None
+
+
+def coarsest_frequency(frequencies: Iterable[str]) -> str:
+    """Frequency code with the fewest periods per year (e.g. M and Q -> Q)."""
+    return min(frequencies, key=PERIODS_PER_YEAR.__getitem__)
+
+
+def points_frequency(points: Dict[str, Any]) -> str:
+    """Coarsest frequency among the periods of a series.
+
+    Raises:
+        ValueError: If a period is not in a supported format
+    """
+    return coarsest_frequency(period_frequency(p) for p in points)
+
+
+def table_points(table: ObservationTable) -> Dict[str, Optional[float]]:
+    """Period -> value of the single series of a table (time is the last dimension).
+
+    Non-numeric values become None.
+
+    Raises:
+        ValueError: If the table holds more than one series
+    """
+    groups = series_rows(table)
+    if len(groups) > 1:
+        raise ValueError(f"Filters match {len(groups)} series; give one code for every dimension")
+    time_dim = len(table.dimension_names) - 1
+    points = {}
+    for row in (groups[0] if groups else []):
+        idx = table.codes[time_dim][row]
+        if idx != MISSING:
+            points[table.labels[time_dim][idx]] = _number(table.values[row])
+    return points
+
+
+def transform_points(points: Dict[str, Optional[float]], transform: str) -> Dict[str, Optional[float]]:
+    """Levels (`"level"`), % change on the previous period (`"pop_pct"`) or on a year earlier (`"yoy_pct"`).
+
+    Raises:
+        ValueError: For an unknown transform or a period in an unsupported format
+    """
+    if transform not in TRANSFORMS:
+        raise ValueError(f"Unknown transform {transform!r} (use {', '.join(TRANSFORMS)})")
+    if transform == "level":
+        return dict(points)
+    labels = list(points)
+    index = period_index(labels, strict=True)
+    order = index.order()
+    if transform == "yoy_pct":
+        earlier = index.year_earlier()
+        bases = [points[labels[earlier[i]]] if earlier[i] is not None else None for i in order]
+    else:
+        bases = [None] + [points[labels[i]] for i in order[:-1]]
+    return {
+        labels[i]: pct_change(points[labels[i]], base) if points[labels[i]] is not None else None
+        for i, base in zip(order, bases)
+    }
+
+
+def parse_derived(expression: str, labels: Sequence[str]) -> Tuple[str, str, str]:
+    """(left label, operator, right label) of an expression like `"Exports - Imports"`.
+
+    Labels may themselves contain the operator characters; the split that
+    leaves a known label on both sides is used.
+
+    Raises:
+        ValueError: If the expression is not `<label> - <label>` or `<label> / <label>`
+    """
+    for i, char in enumerate(expression):
+        if char in OPERATORS:
+            left, right = expression[:i].strip(), expression[i + 1:].strip()
+            if left in labels and right in labels:
+                return left, char, right
+    raise ValueError(
+        f"Cannot read derived column {expression!r}: use '<label> - <label>' or '<label> / <label>' "
+        f"with labels from: {', '.join(labels)}"
+    )
+
+
+def _derive(left: Optional[float], operator: str, right: Optional[float]) -> Optional[float]:
+    if left is None or right is None:
+        return None
+    if operator == "-":
+        return left - right
+    return left / right if right else None
+
+
+def align_series(series: Dict[str, Dict[str, Optional[float]]], how: str = "inner",
+                 derived: Sequence[str] = ()) -> Dict[str, Any]:
+    """One table of several series aligned on period, oldest period first.
+
+    Args:
+        series: Label -> (period -> value), all at the same frequency
+        how: "inner" keeps periods where every series has a value, "outer" any period
+        derived: Expressions over the labels, e.g. `["Exports - Imports"]`
+
+    Returns:
+        `{"columns": ["period", *labels, *derived], "rows": [...], "unmatched": {label: periods}}`,
+        where `unmatched` counts a series' periods left out by an inner join
+
+    Raises:
+        ValueError: For an unknown join type, a bad derived expression or an unsupported period
+    """
+    if how not in JOIN_TYPES:
+        raise ValueError(f"Unknown join {how!r} (use {', '.join(JOIN_TYPES)})")
+    labels = list(series)
+    expressions = [parse_derived(expression, labels) for expression in derived]
+
+    periods = set()
+    for points in series.values():
+        periods.update(p for p, v in points.items() if v is not None)
+    if how == "inner":
+        periods = {p for p in periods if all(series[label].get(p) is not None for label in labels)}
+    candidates = sorted(periods)
+    ordered = [candidates[i] for i in period_index(candidates, strict=True).order()]
+
+    rows: List[List[Any]] = []
+    for period in ordered:
+        values = {label: series[label].get(period) for label in labels}
+        rows.append(
+            [period]
+            + [_round(values[label]) for label in labels]
+            + [_round(_derive(values[left], op, values[right])) for left, op, right in expressions]
+        )
+    return {
+        "columns": ["period"] + labels + [f"{left} {op} {right}" for left, op, right in expressions],
+        "rows": rows,
+        "unmatched": {
+            label: sum(1 for p, v in series[label].items() if v is not None and p not in periods)
+            for label in labels
+        },
+    }
@@ -0,0 +1,261 @@
+"""Byte-budgeted in-process cache with cost-aware (GDSF) eviction.
+
+Entry-count limits give no memory bound when one census structure is
+hundreds of times larger than CPI's. `ByteBudgetCache` accounts entries by
+their serialized size and evicts by Greedy-Dual-Size-Frequency priority
+(`clock + frequency * cost / size`): small, often used, expensive to refetch
+entries stay; large, rarely used ones go first. When over budget, the
+coldest entries are first compressed (zstd if installed, else zlib) and
+only evicted if that is not enough.
+
+One process-wide instance (`get_memory_cache()`) holds structures, response
+bodies and the dataflow listing, keyed by `(namespace, key)` tuples.
+"""
+import heapq
+import itertools
+import json
+import logging
+import threading
+import time
+import zlib
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised when zstandard is not installed
+    zstandard = None
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        ENABLE_CACHING = True
+        MEMORY_CACHE_MAX_MB = 256
+        MEMORY_CACHE_COMPRESSION = "zstd"
+
+logger = logging.getLogger(__name__)
+
+# Value kinds, so compressed entries decode back to the stored type
+_BYTES, _STR, _JSON = 0, 1, 2
+
+
+class _Codec:
+    """zstd / zlib compression, or none."""
+
+    def __init__(self, name: str):
+        name = (name or "none").lower()
+        if name == "zstd" and zstandard is None:
+            logger.info("zstandard not installed; compressing cold cache entries with zlib")
+            name = "zlib"
+        self.name = name
+        if name == "zstd":
+            self._compressor = zstandard.ZstdCompressor(level=3)
+            self._decompressor = zstandard.ZstdDecompressor()
+
+    @property
+    def enabled(self) -> bool:
+        return self.name in ("zstd", "zlib")
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self._compressor.compress(data)
+        return zlib.compress(data, 6)
+
+    def decompress(self, data: bytes) -> bytes:
+        if self.name == "zstd":
+            return self._decompressor.decompress(data)
+        return zlib.decompress(data)
+
+
+def _serialize(value: Any) -> Tuple[int, bytes]:
+    if isinstance(value, bytes):
+        return _BYTES, value
+    if isinstance(value, str):
+        return _STR, value.encode("utf-8")
+    return _JSON, json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _deserialize(kind: int, data: bytes) -> Any:
+    if kind == _BYTES:
+        return data
+    if kind == _STR:
+        return data.decode("utf-8")
+    return json.loads(data)
+
+
+class _Entry:
+    __slots__ = ("value", "blob", "kind", "size", "cost", "frequency", "priority", "expires", "version")
+
+    def __init__(self, value: Any, kind: int, size: int, cost: float, expires: Optional[float]):
+        self.value = value
+        self.blob: Optional[bytes] = None  # Compressed form, once the entry went cold
+        self.kind = kind
+        self.size = size
+        self.cost = cost
+        self.frequency = 1
+        self.priority = 0.0
+        self.expires = expires
+        self.version = 0
+
+
+class ByteBudgetCache:
+    """Mapping of `(namespace, key)` to values, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int, compression: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self._codec = _Codec(compression if compression is not None else Config.MEMORY_CACHE_COMPRESSION)
+        self._entries: Dict[Hashable, _Entry] = {}
+        self._heap: list = []
+        self._counter = itertools.count()
+        self._clock = 0.0  # GDSF inflation value: priority of the last eviction
+        self._resident = 0
+        self._lock = threading.RLock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "compressions": 0, "evicted_bytes": 0}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the value (decompressing a cold entry), or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires is not None and entry.expires <= time.time():
+                self._remove(key, entry)
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+
+            self._stats["hits"] += 1
+            entry.frequency += 1
+            if entry.blob is not None:
+                # Warm again: keep it decoded
+                entry.value = _deserialize(entry.kind, self._codec.decompress(entry.blob))
+                self._resident += entry.size - len(entry.blob)
+                entry.blob = None
+            self._push(key, entry)
+            value = entry.value
+            self._enforce_budget()
+            return value
+
+    def set(self, key: Hashable, value: Any, cost: float = 1.0, expires: Optional[float] = None,
+            size: Optional[int] = None) -> None:
+        """Store a value (bytes, str or JSON-serializable).
+
+        Args:
+            cost: Relative cost of refetching it (e.g. fetch seconds); costlier entries stay longer.
+            expires: Absolute expiry timestamp, or None.
+            size: Byte size if known; otherwise the serialized size is measured.
+        """
+        if value is None:
+            return
+        if size is None:
+            kind, data = _serialize(value)
+            size = len(data)
+        else:
+            kind = _BYTES if isinstance(value, bytes) else _STR if isinstance(value, str) else _JSON
+        if size > self.max_bytes:
+            logger.info(f"Not caching {key}: {size} bytes exceeds the memory cache budget")
+            return
+
+        with self._lock:
+            old = self._entries.get(key)
+            if old is not None:
+                self._remove(key, old)
+            entry = _Entry(value, kind, max(size, 1), max(cost, 1e-6), expires)
+            self._entries[key] = entry
+            self._resident += entry.size
+            self._push(key, entry)
+            self._enforce_budget()
+
+    def delete(self, key: Hashable) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._remove(key, entry)
+
+    def clear(self, namespace: Optional[str] = None) -> None:
+        """Drop every entry, or those whose key tuple starts with `namespace`."""
+        with self._lock:
+            for key in list(self._entries):
+                if namespace is None or (isinstance(key, tuple) and key[0] == namespace):
+                    self._remove(key, self._entries[key])
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return {
+                "entries": len(self._entries),
+                "resident_bytes": self._resident,
+                "max_bytes": self.max_bytes,
+                "compressed_entries": sum(1 for e in self._entries.values() if e.blob is not None),
+                "compression": self._codec.name,
+                **self._stats,
+                "hit_rate": round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            }
+
+    # -- internals (called with the lock held) -------------------------------
+
+    def _push(self, key: Hashable, entry: _Entry) -> None:
+        size = len(entry.blob) if entry.blob is not None else entry.size
+        entry.priority = self._clock + entry.frequency * entry.cost / size
+        entry.version += 1
+        heapq.heappush(self._heap, (entry.priority, next(self._counter), key, entry.version))
+        if len(self._heap) > 4 * len(self._entries) + 64:
+            self._heap = [
+                (e.priority, next(self._counter), k, e.version) for k, e in self._entries.items()
+            ]
+            heapq.heapify(self._heap)
+
+    def _remove(self, key: Hashable, entry: _Entry) -> None:
+        del self._entries[key]
+        self._resident -= len(entry.blob) if entry.blob is not None else entry.size
+
+    def _enforce_budget(self) -> None:
+        """Compress, then evict, lowest-priority entries until within max_bytes."""
+        while self._resident > self.max_bytes and self._heap:
+            priority, _, key, version = heapq.heappop(self._heap)
+            entry = self._entries.get(key)
+            if entry is None or entry.version != version:
+                continue  # Stale heap item
+
+            if entry.blob is None and self._codec.enabled:
+                blob = self._codec.compress(entry.value if entry.kind == _BYTES else _serialize(entry.value)[1])
+                if len(blob) < entry.size:
+                    entry.blob, entry.value = blob, None
+                    self._resident -= entry.size - len(blob)
+                    self._stats["compressions"] += 1
+                    self._push(key, entry)
+                    continue
+
+            self._clock = priority
+            self._remove(key, entry)
+            self._stats["evictions"] += 1
+            self._stats["evicted_bytes"] += entry.size
+
+
+_cache: Optional[ByteBudgetCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_memory_cache() -> Optional[ByteBudgetCache]:
+    """Return the process-wide memory cache, or None if caching is disabled."""
+    global _cache
+    if not Config.ENABLE_CACHING or Config.MEMORY_CACHE_MAX_MB <= 0:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ByteBudgetCache(Config.MEMORY_CACHE_MAX_MB * 1024 * 1024)
+    return _cache
+
+
+def set_memory_cache(cache: Optional[ByteBudgetCache]) -> None:
+    """Replace the process-wide memory cache (e.g. in tests); None recreates it on next use."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
@@ -0,0 +1,278 @@
+"""Columnar representation of SDMX-JSON observations.
+
+`ObservationTable` keeps one list of values plus, per dimension, an integer
+array of positions into that dimension's shared label list. Building one
+dict per observation (repeating every dimension name and label) is left to
+`to_records()`, which tools call only on the rows they actually return;
+`to_compact()` is the smaller header-plus-rows alternative.
+
+Time is the last dimension. Its labels are parsed once into a `PeriodIndex`
+(integer ordinals, see `periods.py`), and `parse_observation_table` returns
+the rows of every series in period order, whatever order the response used.
+"""
+from array import array
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .periods import PeriodIndex, period_index
+
+MISSING = -1  # Code index for a dimension the observation key does not cover
+UNKNOWN_LABEL = "Unknown"
+
+
+class ObservationTable:
+    """Observations stored column-wise.
+
+    Attributes:
+        dimension_names: Display name of each dimension, in key order.
+        labels: Per dimension, the label for each code index.
+        codes: Per dimension, one code index per row (`MISSING` if absent).
+        values: One observation value per row.
+        periods: `PeriodIndex` of the time labels once computed (shared by slices).
+    """
+
+    __slots__ = ("dimension_names", "labels", "codes", "values", "periods")
+
+    def __init__(self, dimension_names: List[str], labels: List[List[str]],
+                 codes: Optional[List[array]] = None, values: Optional[List[Any]] = None,
+                 periods: Optional[PeriodIndex] = None):
+        self.dimension_names = dimension_names
+        self.labels = labels
+        self.codes = codes if codes is not None else [array("i") for _ in dimension_names]
+        self.values = values if values is not None else []
+        self.periods = periods
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __getitem__(self, index):
+        """Rows by slice (a new table sharing the label tables) or one record by position."""
+        if isinstance(index, slice):
+            return ObservationTable(
+                self.dimension_names, self.labels,
+                [column[index] for column in self.codes], self.values[index], self.periods
+            )
+        return self._record(range(len(self))[index])
+
+    def take(self, rows: Sequence[int]) -> "ObservationTable":
+        """New table with the given rows, in that order (label tables shared)."""
+        return ObservationTable(
+            self.dimension_names, self.labels,
+            [array("i", (column[row] for row in rows)) for column in self.codes],
+            [self.values[row] for row in rows], self.periods
+        )
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in range(len(self)):
+            yield self._record(row)
+
+    def append(self, value: Any, indices: Sequence[int]) -> None:
+        """Add a row; `indices` holds one code index per dimension."""
+        self.values.append(value)
+        for column, idx in zip(self.codes, indices):
+            column.append(idx)
+
+    def column(self, dimension_name: str) -> List[Optional[str]]:
+        """Labels of one dimension for every row (None where absent)."""
+        dim = self.dimension_names.index(dimension_name)
+        labels = self.labels[dim]
+        return [labels[idx] if idx != MISSING else None for idx in self.codes[dim]]
+
+    def period_index(self) -> PeriodIndex:
+        """Ordinals of the time (last) dimension's labels, computed on first use."""
+        if self.periods is None:
+            self.periods = period_index(self.labels[-1] if self.labels else [])
+        return self.periods
+
+    def period_keys(self) -> array:
+        """Per row, the first day of its period as a date ordinal (`UNKNOWN_PERIOD` if none)."""
+        index = self.period_index()
+        return array("q", (index.start(idx) for idx in self.codes[-1])) if self.codes else array("q")
+
+    def in_period_order(self) -> "ObservationTable":
+        """This table with each series' rows sorted by period (series keep their order).
+
+        Returns the table itself when it is already in order.
+        """
+        if not self.codes:
+            return self
+        keys = self.period_keys()
+        last: Dict[tuple, int] = {}
+        series_columns = self.codes[:-1]
+        ordered = True
+        for row in range(len(self)):
+            series = tuple(column[row] for column in series_columns)
+            if keys[row] < last.get(series, keys[row]):
+                ordered = False
+                break
+            last[series] = keys[row]
+        if ordered:
+            return self
+        return self.take([row for rows in series_rows(self) for row in sorted(rows, key=keys.__getitem__)])
+
+    def _record(self, row: int) -> Dict[str, Any]:
+        record = {"value": self.values[row]}
+        for name, labels, column in zip(self.dimension_names, self.labels, self.codes):
+            idx = column[row]
+            if idx != MISSING:
+                record[name] = labels[idx]
+        return record
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize rows as `{"value": ..., <dimension name>: <label>, ...}` dicts."""
+        return [self._record(row) for row in range(len(self))]
+
+    def to_compact(self) -> Dict[str, Any]:
+        """Rows as a header-plus-rows table, without repeating constant labels.
+
+        Dimensions with the same label on every row go into `constant`; the
+        others become `columns` (followed by "value"), with one list per row
+        (None where a dimension is absent). Values are kept as they are, so
+        numbers stay numbers.
+        """
+        constant: Dict[str, str] = {}
+        varying = []
+        for dim, (name, column) in enumerate(zip(self.dimension_names, self.codes)):
+            distinct = set(column)
+            if distinct == {MISSING} or not distinct:
+                continue
+            if len(distinct) == 1:
+                constant[name] = self.labels[dim][column[0]]
+            else:
+                varying.append(dim)
+
+        columns = [
+            [self.labels[dim][idx] if idx != MISSING else None for idx in self.codes[dim]]
+            for dim in varying
+        ]
+        return {
+            "constant": constant,
+            "columns": [self.dimension_names[dim] for dim in varying] + ["value"],
+            "rows": [list(row) for row in zip(*columns, self.values)],
+        }
+
+
+def series_rows(table: ObservationTable) -> List[List[int]]:
+    """Row indices of each series (same codes on all but the last, time, dimension), in table order."""
+    groups: Dict[tuple, List[int]] = {}
+    series_columns = table.codes[:-1]
+    for row in range(len(table)):
+        groups.setdefault(tuple(column[row] for column in series_columns), []).append(row)
+    return list(groups.values())
+
+
+def series_labels(table: ObservationTable, groups: List[List[int]]) -> List[Dict[str, Optional[str]]]:
+    """Per series (`series_rows` groups), the labels of the dimensions that tell series apart."""
+    firsts = [rows[0] for rows in groups]
+    varying = [
+        dim for dim in range(len(table.dimension_names) - 1)
+        if len({table.codes[dim][row] for row in firsts}) > 1
+    ]
+    return [
+        {
+            table.dimension_names[dim]: table.labels[dim][table.codes[dim][row]]
+            if table.codes[dim][row] != MISSING else None
+            for dim in varying
+        }
+        for row in firsts
+    ]
+
+
+def _parse_key(key: str, cache: Dict[str, List[int]]) -> List[int]:
+    """Split an SDMX-JSON position key such as "0:3:1", memoizing repeats."""
+    indices = cache.get(key)
+    if indices is None:
+        indices = cache[key] = [int(i) for i in key.split(":")]
+    return indices
+
+
+def parse_observation_table(data: Dict[str, Any], dimensions: List[Dict[str, Any]]) -> ObservationTable:
+    """Parse an SDMX-JSON data message into an `ObservationTable`.
+
+    `dimensions` is the output of `SDMXService.parse_dimensions` for the
+    response structure (series dimensions first, then observation ones).
+    Each series' observations come out in period order.
+    """
+    # Handle standard SDMX-JSON 2.0 (root -> data -> dataSets)
+    # and other variants (root -> dataSets)
+    if "data" in data and isinstance(data["data"], dict) and "dataSets" in data["data"]:
+        data_sets = data["data"]["dataSets"]
+    else:
+        data_sets = data.get("dataSets", [])
+
+    n_dims = len(dimensions)
+    labels = [[v["name"] for v in dim["values"]] for dim in dimensions]
+    table = ObservationTable([dim["name"] for dim in dimensions], labels)
+    if not data_sets:
+        return table
+
+    ds = data_sets[0]
+    key_cache: Dict[str, List[int]] = {}
+
+    # Case 1: Series (Time Series usually)
+    if "series" in ds:
+        # Observation key -> its code indices, then the sort key of its period
+        tails: Dict[Any, List[int]] = {}
+        starts = table.period_index().start
+        for series_key, series_data in ds["series"].items():
+            # Out-of-range positions are left out of the record
+            series_part = [
+                idx if idx < len(labels[d]) else MISSING
+                for d, idx in enumerate(_parse_key(series_key, key_cache)[:n_dims])
+            ]
+            offset = len(series_part)
+            obs_map = series_data.get("observations", {})
+            n_obs = len(obs_map)
+            if not n_obs:
+                continue
+
+            # Columns are filled a whole series at a time
+            for d, idx in enumerate(series_part):
+                table.codes[d].extend(array("i", [idx]) * n_obs)
+            if offset == n_dims:
+                table.values.extend(obs_val[0] for obs_val in obs_map.values())
+                continue
+
+            rows = []
+            for obs_key in obs_map:
+                tail = tails.get((offset, obs_key))
+                if tail is None:
+                    tail = [
+                        idx if idx < len(labels[offset + j]) else MISSING
+                        for j, idx in enumerate(_parse_key(obs_key, key_cache)[:n_dims - offset])
+                    ]
+                    tail += [MISSING] * (n_dims - offset - len(tail))
+                    tail.append(starts(tail[-1]))
+                    tails[(offset, obs_key)] = tail
+                rows.append(tail)
+            values = [obs_val[0] for obs_val in obs_map.values()]
+
+            # Upstream order is not trusted: sort the series by period if needed
+            keys = [row[-1] for row in rows]
+            if keys != sorted(keys):
+                order = sorted(range(n_obs), key=keys.__getitem__)
+                rows = [rows[i] for i in order]
+                values = [values[i] for i in order]
+            table.values.extend(values)
+            for j, column in enumerate(table.codes[offset:]):
+                column.extend(row[j] for row in rows)
+
+    # Case 2: Flat Observations
+    elif "observations" in ds:
+        sizes = [len(dim_labels) for dim_labels in labels]
+        unknown: Dict[int, int] = {}  # dimension -> index of its "Unknown" label
+        for key, value in ds["observations"].items():
+            row = []
+            for d, idx in enumerate(_parse_key(key, key_cache)[:n_dims]):
+                if idx >= sizes[d]:
+                    # Out-of-range positions are reported as "Unknown"
+                    if d not in unknown:
+                        unknown[d] = len(labels[d])
+                        labels[d].append(UNKNOWN_LABEL)
+                    idx = unknown[d]
+                row.append(idx)
+            row += [MISSING] * (n_dims - len(row))
+            table.append(value[0], row)
+        table.periods = None  # "Unknown" may have been added to the time labels
+        table = table.in_period_order()
+
+    return table
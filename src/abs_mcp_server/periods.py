@@ -0,0 +1,292 @@
+"""SDMX reporting periods as calendar day ranges and integer ordinals.
+
+ABS time periods come as `2024` (annual), `2024-S1`, `2024-Q3`, `2024-07`
+(monthly), `2024-W05` and `2024-07-15`. `period_bounds` maps each to the
+first and last calendar day it covers, so periods of any frequency and
+`startPeriod`/`endPeriod` values can be compared on one axis.
+
+`period_ordinal` turns a period into a typed ordinal: its frequency and its
+index within that frequency (e.g. `2024-Q3` -> ("Q", 2024 * 4 + 2)), so the
+next quarter is index + 1 and the year containing it is index // 4.
+`PeriodIndex` holds the ordinals of a time dimension's periods, parsed once
+per label list, so sorting, range filtering, year-on-year lookups and
+frequency conversion of observations are integer operations instead of
+string parsing.
+"""
+import calendar
+import re
+from array import array
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import List, Optional, Sequence, Tuple
+
+_PERIOD_RE = re.compile(
+    r"^(?P<year>\d{4})(?:"
+    r"-(?P<sub>[ASQMW])(?P<n>\d{1,2})"
+    r"|-(?P<month>\d{2})(?:-(?P<day>\d{2}))?"
+    r")?$"
+)
+_MONTHS_PER = {"A": 12, "S": 6, "Q": 3, "M": 1}
+PERIODS_PER_YEAR = {"A": 1, "S": 2, "Q": 4, "M": 12, "W": 52, "D": 365}
+
+
+def _month_range(year: int, first_month: int, months: int) -> Tuple[date, date]:
+    last_month = first_month + months - 1
+    return date(year, first_month, 1), date(year, last_month, calendar.monthrange(year, last_month)[1])
+
+
+@lru_cache(maxsize=4096)
+def period_bounds(period: str) -> Tuple[date, date]:
+    """First and last day covered by an SDMX period string.
+
+    Raises:
+        ValueError: If the period is not in a supported format
+    """
+    match = _PERIOD_RE.match(period.strip())
+    if not match:
+        raise ValueError(f"Unsupported time period: {period!r}")
+    year = int(match.group("year"))
+
+    sub = match.group("sub")
+    if sub == "W":
+        start = date.fromisocalendar(year, int(match.group("n")), 1)
+        return start, start + timedelta(days=6)
+    if sub:
+        months = _MONTHS_PER[sub]
+        n = int(match.group("n"))
+        if not 1 <= n <= 12 // months:
+            raise ValueError(f"Unsupported time period: {period!r}")
+        return _month_range(year, (n - 1) * months + 1, months)
+
+    if match.group("day"):
+        day = date(year, int(match.group("month")), int(match.group("day")))
+        return day, day
+    if match.group("month"):
+        return _month_range(year, int(match.group("month")), 1)
+    return _month_range(year, 1, 12)
+
+
+def period_frequency(period: str) -> str:
+    """SDMX frequency code of a period string: A, S, Q, M, W or D.
+
+    Raises:
+        ValueError: If the period is not in a supported format
+    """
+    match = _PERIOD_RE.match(period.strip())
+    if not match:
+        raise ValueError(f"Unsupported time period: {period!r}")
+    if match.group("sub"):
+        return match.group("sub")
+    if match.group("day"):
+        return "D"
+    return "M" if match.group("month") else "A"
+
+
+def shift_years(period: str, years: int) -> str:
+    """The same period `years` later (earlier if negative), e.g. `2024-Q3` -> `2023-Q3`."""
+    period = period.strip()
+    return f"{int(period[:4]) + years:04d}{period[4:]}"
+
+
+def format_start(day: date) -> str:
+    """Shortest `startPeriod` value meaning "from `day`" (year, month or date)."""
+    if day.day == 1:
+        return str(day.year) if day.month == 1 else f"{day.year}-{day.month:02d}"
+    return day.isoformat()
+
+
+def format_end(day: date) -> str:
+    """Shortest `endPeriod` value meaning "through `day`" (year, month or date)."""
+    if day.day == calendar.monthrange(day.year, day.month)[1]:
+        return str(day.year) if day.month == 12 else f"{day.year}-{day.month:02d}"
+    return day.isoformat()
+
+
+UNKNOWN_PERIOD = -1  # Sort key of a period in an unsupported format (before any real period)
+
+
+@lru_cache(maxsize=4096)
+def period_ordinal(period: str) -> Tuple[str, int]:
+    """(frequency, index within the frequency) of an SDMX period string.
+
+    Indexes count from year 0: years for A, half-years, quarters and months
+    for S, Q and M, weeks (from Monday 0001-01-01) for W and date ordinals for D.
+
+    Raises:
+        ValueError: If the period is not in a supported format
+    """
+    match = _PERIOD_RE.match(period.strip())
+    if not match:
+        raise ValueError(f"Unsupported time period: {period!r}")
+    year = int(match.group("year"))
+    sub = match.group("sub")
+    if not (sub or match.group("month")):
+        return "A", year
+    if sub in _MONTHS_PER:
+        n = int(match.group("n"))
+        if not 1 <= n <= PERIODS_PER_YEAR[sub]:
+            raise ValueError(f"Unsupported time period: {period!r}")
+        return sub, year * PERIODS_PER_YEAR[sub] + n - 1
+    first = period_bounds(period)[0]
+    if sub == "W":
+        return "W", (first.toordinal() - 1) // 7
+    if match.group("day"):
+        return "D", first.toordinal()
+    return "M", year * 12 + first.month - 1
+
+
+def ordinal_period(frequency: str, ordinal: int) -> str:
+    """SDMX period string of a typed ordinal (the inverse of `period_ordinal`)."""
+    if frequency == "A":
+        return f"{ordinal:04d}"
+    if frequency == "M":
+        return f"{ordinal // 12:04d}-{ordinal % 12 + 1:02d}"
+    if frequency in ("S", "Q"):
+        per_year = PERIODS_PER_YEAR[frequency]
+        return f"{ordinal // per_year:04d}-{frequency}{ordinal % per_year + 1}"
+    if frequency == "W":
+        year, week, _ = date.fromordinal(ordinal * 7 + 1).isocalendar()
+        return f"{year:04d}-W{week:02d}"
+    return date.fromordinal(ordinal).isoformat()
+
+
+def ordinal_days(frequency: str, ordinal: int) -> Tuple[int, int]:
+    """First and last day (date ordinals) covered by a typed ordinal."""
+    if frequency == "D":
+        return ordinal, ordinal
+    if frequency == "W":
+        return ordinal * 7 + 1, ordinal * 7 + 7
+    months = _MONTHS_PER[frequency]
+    first = divmod(ordinal * months, 12)
+    after = divmod((ordinal + 1) * months, 12)
+    return (date(first[0], first[1] + 1, 1).toordinal(),
+            date(after[0], after[1] + 1, 1).toordinal() - 1)
+
+
+def _day_ordinal(day: int, frequency: str) -> int:
+    """Ordinal of the `frequency` period containing a date ordinal."""
+    if frequency == "D":
+        return day
+    if frequency == "W":
+        return (day - 1) // 7
+    d = date.fromordinal(day)
+    return (d.year * 12 + d.month - 1) // _MONTHS_PER[frequency]
+
+
+def convert_ordinal(frequency: str, ordinal: int, target: str) -> int:
+    """Ordinal of the `target` period containing (or, if finer, starting) the given period.
+
+    Between A, S, Q and M this is integer division (e.g. month // 3 is its
+    quarter); weeks and days go through their first day.
+    """
+    if frequency == target:
+        return ordinal
+    if frequency in _MONTHS_PER and target in _MONTHS_PER and PERIODS_PER_YEAR[frequency] >= PERIODS_PER_YEAR[target]:
+        return ordinal // (PERIODS_PER_YEAR[frequency] // PERIODS_PER_YEAR[target])
+    return _day_ordinal(ordinal_days(frequency, ordinal)[0], target)
+
+
+def shift_ordinal(frequency: str, ordinal: int, years: int) -> Optional[int]:
+    """Ordinal of the same period `years` later (earlier if negative), like `shift_years`.
+
+    None where that period does not exist (week 53 or 29 February in another year).
+    """
+    if frequency in _MONTHS_PER:
+        return ordinal + years * PERIODS_PER_YEAR[frequency]
+    try:
+        if frequency == "W":
+            year, week, _ = date.fromordinal(ordinal * 7 + 1).isocalendar()
+            return (date.fromisocalendar(year + years, week, 1).toordinal() - 1) // 7
+        day = date.fromordinal(ordinal)
+        return day.replace(year=day.year + years).toordinal()
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=4096)
+def period_days(period: str) -> Tuple[int, int]:
+    """First and last day of a period as date ordinals.
+
+    Raises:
+        ValueError: If the period is not in a supported format
+    """
+    return ordinal_days(*period_ordinal(period))
+
+
+def period_start(period: str) -> int:
+    """Sort key of a period: its first day as a date ordinal, comparable across frequencies.
+
+    Raises:
+        ValueError: If the period is not in a supported format
+    """
+    return period_days(period)[0]
+
+
+class PeriodIndex:
+    """Typed ordinals of the periods of a time dimension, parsed once.
+
+    Attributes:
+        frequencies: Frequency code of each period (None if unsupported).
+        ordinals: Index of each period within its frequency (`period_ordinal`).
+        starts: First day of each period as a date ordinal, the sort key
+            across frequencies (`UNKNOWN_PERIOD` if unsupported).
+        ends: Last day of each period as a date ordinal (`UNKNOWN_PERIOD` if unsupported).
+    """
+
+    __slots__ = ("frequencies", "ordinals", "starts", "ends")
+
+    def __init__(self, periods: Sequence[str]):
+        self.frequencies: List[Optional[str]] = []
+        self.ordinals = array("q")
+        self.starts = array("q")
+        self.ends = array("q")
+        for period in periods:
+            try:
+                frequency, ordinal = period_ordinal(period)
+            except (ValueError, AttributeError):
+                frequency, ordinal, start, end = None, 0, UNKNOWN_PERIOD, UNKNOWN_PERIOD
+            else:
+                start, end = ordinal_days(frequency, ordinal)
+            self.frequencies.append(frequency)
+            self.ordinals.append(ordinal)
+            self.starts.append(start)
+            self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def start(self, position: int) -> int:
+        """Sort key of the period at `position` (`UNKNOWN_PERIOD` if out of range)."""
+        return self.starts[position] if 0 <= position < len(self.starts) else UNKNOWN_PERIOD
+
+    def order(self) -> List[int]:
+        """Positions sorted by period, oldest first (stable for equal periods)."""
+        return sorted(range(len(self.starts)), key=self.starts.__getitem__)
+
+    def year_earlier(self) -> List[Optional[int]]:
+        """Per position, the position of the same period a year earlier (None if not listed)."""
+        positions = {
+            key: i for i, key in enumerate(zip(self.frequencies, self.ordinals)) if key[0] is not None
+        }
+        earlier: List[Optional[int]] = []
+        for frequency, ordinal in zip(self.frequencies, self.ordinals):
+            target = shift_ordinal(frequency, ordinal, -1) if frequency is not None else None
+            earlier.append(positions.get((frequency, target)) if target is not None else None)
+        return earlier
+
+
+@lru_cache(maxsize=256)
+def _cached_index(periods: Tuple[str, ...]) -> PeriodIndex:
+    return PeriodIndex(periods)
+
+
+def period_index(periods: Sequence[str], strict: bool = False) -> PeriodIndex:
+    """`PeriodIndex` of a label list, shared by every response with the same periods.
+
+    Raises:
+        ValueError: With `strict`, if a period is not in a supported format
+    """
+    index = _cached_index(tuple(periods))
+    if strict and None in index.frequencies:
+        raise ValueError(f"Unsupported time period: {periods[index.frequencies.index(None)]!r}")
+    return index
@@ -0,0 +1,183 @@
+"""Release-calendar freshness policy for cached ABS responses.
+
+ABS data only changes on scheduled release days. `ReleaseCalendar` reads a
+local calendar file mapping dataflow ids to release dates; a cached response
+for a listed dataflow stays fresh until that dataflow's next scheduled
+release, after which it is revalidated. Dataflows that are not listed, or
+whose listed releases are all in the past (an outdated calendar), get no
+calendar freshness, so they fall back to the cache TTLs and revalidation.
+
+Calendar file format (`release_calendar.json` in this package by default)::
+
+    {
+      "timezone": "Australia/Sydney",
+      "release_time": "11:30",
+      "verified": ["CPI_M", ...],
+      "dataflows": {"CPI_M": ["2026-10-28", "2026-11-25T11:30", ...], ...}
+    }
+
+When `verified` is given, only those dataflows' dates are used; the others
+are treated as unlisted. The shipped file is a placeholder: its dates follow
+the usual ABS pattern but have not been checked against the published
+release calendar, so it verifies none. Point `RELEASE_CALENDAR_FILE` at a
+calendar built from https://www.abs.gov.au/release-calendar/future-releases
+to enable release-based freshness.
+"""
+import json
+import logging
+import re
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, time as dt_time, timedelta, timezone, tzinfo
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        RELEASE_CALENDAR_ENABLED = True
+        RELEASE_CALENDAR_FILE = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CALENDAR_FILE = Path(__file__).resolve().parent / "release_calendar.json"
+DEFAULT_TIMEZONE = "Australia/Sydney"
+DEFAULT_RELEASE_TIME = "11:30"
+
+# Dataflow id in ABS REST paths: /data/{flow}/..., /dataflow/{agency}/{flow}, /datastructure/{agency}/{dsd}
+# (flows may be written "ABS,CPI_M,1.0.0")
+_URL_DATAFLOW_RE = re.compile(r"/(?:data|dataflow/[^/]+|datastructure/[^/]+)/(?:[^/,]+,)?([^/,?]+)")
+
+
+def _timezone(name: str) -> tzinfo:
+    try:
+        from zoneinfo import ZoneInfo
+        return ZoneInfo(name)
+    except Exception:
+        # No tz database available: AEST is close enough for day-level releases
+        logger.warning(f"Time zone {name} unavailable; using UTC+10")
+        return timezone(timedelta(hours=10))
+
+
+def dataflow_from_url(url: str) -> Optional[str]:
+    """Dataflow id an ABS API URL refers to (None for e.g. the full `/dataflow` listing)."""
+    match = _URL_DATAFLOW_RE.search(url)
+    return match.group(1) if match else None
+
+
+class ReleaseCalendar:
+    """Scheduled release times per dataflow."""
+
+    def __init__(self, releases: Dict[str, List[datetime]], source: Optional[str] = None,
+                 unverified: Iterable[str] = ()):
+        self.releases = {flow: sorted(times) for flow, times in releases.items()}
+        self.source = source
+        self.unverified = sorted(unverified)
+
+    @classmethod
+    def from_file(cls, path: Path) -> "ReleaseCalendar":
+        with open(path) as f:
+            raw = json.load(f)
+        tz = _timezone(raw.get("timezone", DEFAULT_TIMEZONE))
+        hour, minute = (int(part) for part in raw.get("release_time", DEFAULT_RELEASE_TIME).split(":"))
+
+        listed = raw.get("dataflows", {})
+        verified = set(raw["verified"]) if "verified" in raw else set(listed)
+        unverified = [flow for flow in listed if flow not in verified]
+        if unverified:
+            logger.info(f"Release dates not verified for {', '.join(unverified)}; using cache TTLs for them")
+
+        releases = {}
+        for flow, dates in listed.items():
+            if flow not in verified:
+                continue
+            times = []
+            for value in dates:
+                when = datetime.fromisoformat(value)
+                if "T" not in value:
+                    when = datetime.combine(when.date(), dt_time(hour, minute))
+                times.append(when if when.tzinfo else when.replace(tzinfo=tz))
+            releases[flow] = times
+        return cls(releases, source=str(path), unverified=unverified)
+
+    def __contains__(self, dataflow_id: str) -> bool:
+        return dataflow_id in self.releases
+
+    def last_release(self, dataflow_id: str, at: datetime) -> Optional[datetime]:
+        """Most recent scheduled release at or before `at`."""
+        times = self.releases.get(dataflow_id, [])
+        i = bisect_right(times, at)
+        return times[i - 1] if i else None
+
+    def next_release(self, dataflow_id: str, after: datetime) -> Optional[datetime]:
+        """First scheduled release strictly after `after` (None if unknown)."""
+        times = self.releases.get(dataflow_id, [])
+        i = bisect_right(times, after)
+        return times[i] if i < len(times) else None
+
+    def fresh_until(self, dataflow_id: Optional[str], fetched_at: float) -> Optional[float]:
+        """Timestamp until which data fetched at `fetched_at` cannot have changed.
+
+        None when the dataflow is not in the calendar or no later release is listed.
+        """
+        if not dataflow_id:
+            return None
+        when = self.next_release(dataflow_id, datetime.fromtimestamp(fetched_at, timezone.utc))
+        return when.timestamp() if when else None
+
+    def stats(self) -> Dict[str, object]:
+        now = datetime.now(timezone.utc)
+        return {
+            "source": self.source,
+            "dataflows": len(self.releases),
+            "unverified": self.unverified,
+            "without_future_releases": sorted(
+                flow for flow in self.releases if self.next_release(flow, now) is None
+            ),
+        }
+
+
+_calendar: Optional[ReleaseCalendar] = None
+_calendar_lock = threading.Lock()
+_calendar_loaded = False
+
+
+def get_release_calendar() -> Optional[ReleaseCalendar]:
+    """Return the process-wide calendar, or None if disabled or unreadable."""
+    global _calendar, _calendar_loaded
+    if not Config.RELEASE_CALENDAR_ENABLED:
+        return None
+    if not _calendar_loaded:
+        with _calendar_lock:
+            if not _calendar_loaded:
+                path = Path(Config.RELEASE_CALENDAR_FILE) if Config.RELEASE_CALENDAR_FILE else DEFAULT_CALENDAR_FILE
+                try:
+                    _calendar = ReleaseCalendar.from_file(path)
+                    logger.info(f"Loaded release calendar from {path} ({len(_calendar.releases)} dataflows)")
+                except (OSError, ValueError) as e:
+                    logger.warning(f"Release calendar unavailable ({e}); cached responses are always revalidated")
+                    _calendar = None
+                _calendar_loaded = True
+    return _calendar
+
+
+def release_expiry(dataflow_id: Optional[str], fetched_at: Optional[float] = None) -> Optional[float]:
+    """Timestamp of the dataflow's next scheduled release after `fetched_at` (default now).
+
+    None if there is no calendar or the dataflow has no known next release.
+    """
+    calendar = get_release_calendar()
+    if calendar is None:
+        return None
+    return calendar.fresh_until(dataflow_id, time.time() if fetched_at is None else fetched_at)
+
+
+def set_release_calendar(calendar: Optional[ReleaseCalendar]) -> None:
+    """Replace the process-wide calendar (e.g. in tests); None reloads the file on next use."""
+    global _calendar, _calendar_loaded
+    with _calendar_lock:
+        _calendar = calendar
+        _calendar_loaded = calendar is not None
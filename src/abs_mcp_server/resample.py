@@ -0,0 +1,199 @@
+"""Frequency conversion and downsampling of parsed time series.
+
+Long monthly series (CPI_M, LF, RT) give hundreds of rows when the question
+is about annual or quarterly figures, or when the data feeds a chart.
+Both operations work on an `ObservationTable` (time is the last dimension)
+and return a smaller table, so payloads shrink before serialization. They
+use the table's `PeriodIndex`, so grouping and ordering are integer work:
+
+- `resample_table` converts every series to a coarser frequency (A, S, Q
+  or M) with one of `AGGREGATIONS`; "last" takes the latest observation in
+  each target period, "end" only the one that closes it (e.g. December).
+- `downsample_table` keeps at most `max_points` rows per series with
+  Largest-Triangle-Three-Buckets, which preserves the visual shape (peaks,
+  troughs, turning points) better than taking every n-th point.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+
+from .observations import MISSING, ObservationTable, series_labels, series_rows
+from .periods import (
+    PERIODS_PER_YEAR, UNKNOWN_PERIOD, convert_ordinal, ordinal_days, ordinal_period, period_ordinal
+)
+
+AGGREGATIONS = ("mean", "sum", "last", "end", "min", "max")
+TARGET_FREQUENCIES = ("A", "S", "Q", "M")
+MAX_PARTIAL_LISTED = 20  # Partial periods listed individually in the metadata
+
+
+def target_period(period: str, frequency: str) -> str:
+    """The `frequency` period containing `period`, e.g. ("2024-08", "Q") -> "2024-Q3"."""
+    source, ordinal = period_ordinal(period)
+    return ordinal_period(frequency, convert_ordinal(source, ordinal, frequency))
+
+
+def _numeric(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _aggregate(points: List[Tuple[int, Any]], aggregation: str, closes: bool) -> Optional[Any]:
+    """Value of one target period from its (time position, value) points, in time order.
+
+    `closes` tells whether the last point ends on the target period's last day.
+    """
+    if aggregation == "last":
+        return points[-1][1]
+    if aggregation == "end":
+        return points[-1][1] if closes else None
+    values = [v for _, v in points if _numeric(v)]
+    if not values:
+        return None
+    if aggregation == "sum":
+        return sum(values)
+    if aggregation == "min":
+        return min(values)
+    if aggregation == "max":
+        return max(values)
+    return sum(values) / len(values)
+
+
+def resample_table(table: ObservationTable, frequency: str,
+                   aggregation: str = "mean") -> Tuple[ObservationTable, Dict[str, Any]]:
+    """Every series converted to `frequency`; returns the new table and metadata.
+
+    Target periods with fewer source observations than they normally hold
+    (e.g. the current, unfinished year) are listed under `partial`.
+
+    Raises:
+        ValueError: For an unknown frequency or aggregation, a period in an
+            unsupported format, or a target frequency finer than the data's
+    """
+    if frequency not in TARGET_FREQUENCIES:
+        raise ValueError(f"Unknown frequency {frequency!r} (use {', '.join(TARGET_FREQUENCIES)})")
+    if aggregation not in AGGREGATIONS:
+        raise ValueError(f"Unknown aggregation {aggregation!r} (use {', '.join(AGGREGATIONS)})")
+
+    time_dim = len(table.dimension_names) - 1
+    time_codes = table.codes[time_dim]
+    index = table.period_index()
+    keys = table.period_keys()
+    groups = series_rows(table)
+    labels = series_labels(table, groups)
+    target_labels: List[str] = []
+    target_index: Dict[int, int] = {}  # Target ordinal -> position in target_labels
+    result = ObservationTable(table.dimension_names, table.labels[:time_dim] + [target_labels])
+    partial = []
+    source_frequencies = set()
+
+    for group, series in zip(groups, labels):
+        buckets: Dict[int, List[Tuple[int, Any]]] = {}
+        for row in sorted((r for r in group if time_codes[r] != MISSING), key=keys.__getitem__):
+            position = time_codes[row]
+            if keys[row] == UNKNOWN_PERIOD:
+                raise ValueError(f"Unsupported time period: {table.labels[time_dim][position]!r}")
+            source = index.frequencies[position]
+            if PERIODS_PER_YEAR[source] < PERIODS_PER_YEAR[frequency]:
+                raise ValueError(f"Cannot convert {source} data to the finer frequency {frequency}")
+            source_frequencies.add(source)
+            target = convert_ordinal(source, index.ordinals[position], frequency)
+            buckets.setdefault(target, []).append((position, table.values[row]))
+
+        series_codes = [table.codes[dim][group[0]] for dim in range(time_dim)]
+        for target, points in buckets.items():
+            last = points[-1][0]
+            source = index.frequencies[last]
+            expected = PERIODS_PER_YEAR[source] // PERIODS_PER_YEAR[frequency]
+            if len(points) < expected:
+                partial.append({"series": series, "period": ordinal_period(frequency, target),
+                                "observations": len(points), "expected": expected})
+            closes = ordinal_days(source, index.ordinals[last])[1] == ordinal_days(frequency, target)[1]
+            value = _aggregate(points, aggregation, closes)
+            if value is None:
+                continue
+            if target not in target_index:
+                target_index[target] = len(target_labels)
+                target_labels.append(ordinal_period(frequency, target))
+            result.append(value, series_codes + [target_index[target]])
+
+    meta: Dict[str, Any] = {
+        "frequency": frequency,
+        "from": sorted(source_frequencies),
+        "aggregation": aggregation,
+        "rows_before": len(table),
+        "rows_after": len(result),
+        "partial": partial[:MAX_PARTIAL_LISTED],
+    }
+    if len(partial) > MAX_PARTIAL_LISTED:
+        meta["partial_not_listed"] = len(partial) - MAX_PARTIAL_LISTED
+    return result, meta
+
+
+def lttb(xs: List[float], ys: List[float], max_points: int) -> List[int]:
+    """Indices of the points Largest-Triangle-Three-Buckets keeps (always the first and last).
+
+    `max_points` must be at least 3.
+    """
+    n = len(xs)
+    if max_points >= n:
+        return list(range(n))
+    selected = [0]
+    bucket_size = (n - 2) / (max_points - 2)
+    a = 0
+    for i in range(max_points - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        # Average of the next bucket (or the last point)
+        next_start, next_end = end, min(int((i + 2) * bucket_size) + 1, n)
+        if next_start >= next_end:
+            next_start, next_end = n - 1, n
+        avg_x = sum(xs[next_start:next_end]) / (next_end - next_start)
+        avg_y = sum(ys[next_start:next_end]) / (next_end - next_start)
+
+        best, best_area = start, -1.0
+        for j in range(start, min(end, n - 1)):
+            area = abs((xs[a] - avg_x) * (ys[j] - ys[a]) - (xs[a] - xs[j]) * (avg_y - ys[a]))
+            if area > best_area:
+                best, best_area = j, area
+        selected.append(best)
+        a = best
+    selected.append(n - 1)
+    return selected
+
+
+def downsample_table(table: ObservationTable, max_points: int) -> Tuple[ObservationTable, Dict[str, Any]]:
+    """At most `max_points` rows per series, chosen by LTTB; returns the new table and metadata.
+
+    Rows with non-numeric values are dropped from a series that is downsampled.
+
+    Raises:
+        ValueError: If `max_points` is below 3, or a period is in an unsupported format
+    """
+    if max_points < 3:
+        raise ValueError("`max_points` must be at least 3")
+    time_dim = len(table.dimension_names) - 1
+    keys = table.period_keys()
+    keep: List[int] = []
+    downsampled = 0
+    for group in series_rows(table):
+        if len(group) <= max_points:
+            keep.extend(group)
+            continue
+        rows = sorted(
+            (r for r in group if table.codes[time_dim][r] != MISSING and _numeric(table.values[r])),
+            key=keys.__getitem__
+        )
+        unsupported = next((r for r in rows if keys[r] == UNKNOWN_PERIOD), None)
+        if unsupported is not None:
+            raise ValueError(f"Unsupported time period: {table.labels[time_dim][table.codes[time_dim][unsupported]]!r}")
+        xs = [float(keys[r]) for r in rows]
+        ys = [float(table.values[r]) for r in rows]
+        keep.extend(rows[i] for i in lttb(xs, ys, max_points))
+        downsampled += 1
+    keep.sort()
+    result = table.take(keep) if downsampled else table
+    return result, {
+        "method": "lttb",
+        "max_points": max_points,
+        "series_downsampled": downsampled,
+        "rows_before": len(table),
+        "rows_after": len(result),
+    }
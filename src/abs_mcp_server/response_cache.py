@@ -0,0 +1,259 @@
+"""HTTP conditional-request cache for ABS API responses.
+
+Response bodies are stored with their validators (`ETag`, `Last-Modified`).
+The next request for the same URL sends `If-None-Match`/`If-Modified-Since`;
+a `304 Not Modified` answer is served from the stored body, so unchanged
+structures and data cost a round trip instead of a full download. Responses
+still fresh under `Cache-Control: max-age`/`Expires`, or for a dataflow
+whose next scheduled release has not happened yet (see `release_calendar`),
+are served without a request at all.
+
+Storage is pluggable: `MemoryResponseStore` (the process-wide byte-budgeted
+memory cache) or `DiskResponseStore` (the shared SQLite `DiskCache`, with
+the memory cache in front of it).
+"""
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+from .disk_cache import DiskCache, get_disk_cache
+from .memory_cache import ByteBudgetCache, get_memory_cache
+from .release_calendar import dataflow_from_url, release_expiry
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        ENABLE_CACHING = True
+        RESPONSE_CACHE = "disk"
+        RESPONSE_CACHE_MAX_MB = 64
+        RESPONSE_CACHE_TTL = 30 * 86400
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "http"
+
+
+class MemoryResponseStore:
+    """In-process store in a `ByteBudgetCache` (entries sized by their body)."""
+
+    name = "memory"
+
+    def __init__(self, cache: ByteBudgetCache):
+        self.cache = cache
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        return self.cache.get((NAMESPACE, key))
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        self.cache.set((NAMESPACE, key), entry, size=len(entry["body"]))
+
+
+class DiskResponseStore:
+    """Store in the shared SQLite disk cache (survives server restarts).
+
+    With a `memory` store, recently used entries are also kept in process so
+    repeated lookups skip SQLite and JSON decoding.
+    """
+
+    name = "disk"
+
+    def __init__(self, cache: DiskCache, ttl: Optional[float] = None,
+                 memory: Optional[MemoryResponseStore] = None):
+        self.cache = cache
+        self.ttl = ttl
+        self.memory = memory
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        if self.memory is not None:
+            entry = self.memory.get(key)
+            if entry is not None:
+                return entry
+        entry = self.cache.get(NAMESPACE, key)
+        if entry is not None and self.memory is not None:
+            self.memory.set(key, entry)
+        return entry
+
+    def set(self, key: str, entry: Dict[str, Any]) -> None:
+        if self.memory is not None:
+            self.memory.set(key, entry)
+        try:
+            self.cache.set(NAMESPACE, key, entry, ttl=self.ttl)
+        except Exception as e:
+            logger.warning(f"Failed to write response for {key} to disk cache: {e}")
+
+
+def _max_age(headers: Mapping[str, str], now: float) -> Optional[float]:
+    """Freshness lifetime from Cache-Control max-age or Expires (None if absent)."""
+    directives = [d.strip().lower() for d in headers.get("Cache-Control", "").split(",")]
+    if "no-cache" in directives:
+        return 0.0
+    for directive in directives:
+        if directive.startswith("max-age="):
+            try:
+                return float(directive.split("=", 1)[1])
+            except ValueError:
+                return None
+    if headers.get("Expires"):
+        try:
+            return max(parsedate_to_datetime(headers["Expires"]).timestamp() - now, 0.0)
+        except (TypeError, ValueError):
+            return 0.0
+    return None
+
+
+class BodyRecorder:
+    """Copy of a streamed body for the cache, abandoned past `limit` bytes."""
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._chunks = []
+        self._size = 0
+
+    def add(self, chunk: bytes) -> None:
+        if self._chunks is None:
+            return
+        self._size += len(chunk)
+        if self._size > self.limit:
+            self._chunks = None  # Too large to cache; keep streaming memory bounded
+        else:
+            self._chunks.append(chunk)
+
+    @property
+    def body(self) -> Optional[bytes]:
+        return b"".join(self._chunks) if self._chunks is not None else None
+
+
+class ResponseCache:
+    """Validators + bodies for conditional GETs, with hit/revalidated/miss counts."""
+
+    def __init__(self, store, max_body_bytes: Optional[int] = None):
+        self.store = store
+        if max_body_bytes is None:
+            max_body_bytes = Config.RESPONSE_CACHE_MAX_MB * 1024 * 1024
+        self.max_body_bytes = max_body_bytes  # Largest streamed body kept for revalidation
+        self._lock = threading.Lock()
+        self._counts = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    @staticmethod
+    def key(url: str, params: Optional[Mapping[str, str]], accept: str) -> str:
+        query = "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+        return f"{accept} {url}?{query}"
+
+    def lookup(self, key: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, str]]:
+        """Return the stored entry and the conditional headers for a request.
+
+        If the entry is still fresh the caller can use it without a request
+        (see `is_fresh`).
+        """
+        entry = self.store.get(key)
+        headers = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        return entry, headers
+
+    @staticmethod
+    def is_fresh(entry: Optional[Dict[str, Any]]) -> bool:
+        return entry is not None and entry.get("fresh_until", 0) > time.time()
+
+    def hit(self, entry: Dict[str, Any]) -> bytes:
+        """Body of a fresh entry served without a request."""
+        self._count("hits")
+        return entry["body"].encode("utf-8")
+
+    def revalidated(self, key: str, entry: Dict[str, Any], headers: Mapping[str, str]) -> bytes:
+        """Handle a 304: refresh validators/freshness and return the stored body."""
+        self._count("revalidated")
+        validators = self._validators(key, headers, time.time())
+        updated = dict(entry, fresh_until=validators["fresh_until"])
+        # A 304 may carry new validators; keep the stored ones otherwise
+        for name in ("etag", "last_modified"):
+            if validators[name]:
+                updated[name] = validators[name]
+        self.store.set(key, updated)
+        return entry["body"].encode("utf-8")
+
+    def store_response(self, key: str, headers: Mapping[str, str], body: Optional[bytes]) -> None:
+        """Record a full (200) response; `body=None` means it was not kept."""
+        self._count("misses")
+        if body is None or "no-store" in headers.get("Cache-Control", "").lower():
+            return
+        entry = self._validators(key, headers, time.time())
+        if not (entry["etag"] or entry["last_modified"] or entry["fresh_until"]):
+            return  # Nothing to revalidate with and not cacheable by lifetime
+        try:
+            entry["body"] = body.decode("utf-8")
+        except UnicodeDecodeError:
+            return
+        self.store.set(key, entry)
+
+    @staticmethod
+    def _validators(key: str, headers: Mapping[str, str], now: float) -> Dict[str, Any]:
+        """Validators plus freshness: the HTTP lifetime or, if later, the next scheduled release."""
+        max_age = _max_age(headers, now)
+        fresh_until = now + max_age if max_age else 0
+        if max_age != 0.0:  # Not for no-cache responses
+            fresh_until = max(fresh_until, release_expiry(dataflow_from_url(key), now) or 0)
+        return {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "fresh_until": fresh_until,
+        }
+
+    def _count(self, outcome: str) -> None:
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counts = dict(self._counts)
+        total = sum(counts.values())
+        return {
+            "backend": self.store.name,
+            **counts,
+            "hit_rate": round((counts["hits"] + counts["revalidated"]) / total, 3) if total else 0.0,
+        }
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None if disabled.
+
+    `RESPONSE_CACHE` selects the backend: "disk" (falls back to memory if
+    the disk cache is unavailable), "memory" or "off". Both keep recently
+    used responses in the process-wide memory cache when it is enabled.
+    """
+    global _cache
+    backend = (Config.RESPONSE_CACHE or "off").lower()
+    if not Config.ENABLE_CACHING or backend == "off":
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                memory_cache = get_memory_cache()
+                memory = MemoryResponseStore(memory_cache) if memory_cache is not None else None
+                disk_cache = get_disk_cache() if backend == "disk" else None
+                if disk_cache is not None:
+                    store = DiskResponseStore(disk_cache, ttl=Config.RESPONSE_CACHE_TTL, memory=memory)
+                elif memory is not None:
+                    store = memory
+                else:
+                    return None
+                _cache = ResponseCache(store)
+    return _cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]) -> None:
+    """Replace the process-wide response cache (e.g. in tests)."""
+    global _cache
+    with _cache_lock:
+        _cache = cache
@@ -0,0 +1,171 @@
+"""Fit the rows of a data tool result into a response budget.
+
+Every byte a tool returns crosses the MCP stdio transport and ends up in
+the LLM prompt, so `get_dataset_data` no longer returns its rows blindly.
+`shape_rows` tries increasingly dense representations and keeps the first
+one that fits the budget:
+
+1. `full`: all rows, in the requested output format
+2. `compact`: all rows as a compact table (constant labels given once)
+3. `series_tail`: the last (or first) K periods of every series, as a
+   compact table, with K as large as fits (at least `MIN_TAIL_PERIODS`)
+4. `summary`: per series, the first/last/min/max observations and the mean
+   (as many series as fit)
+
+The returned `shaping` metadata states the strategy used and exactly which
+rows were left out (per series: how many and which periods).
+"""
+import json
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+from .observations import MISSING, ObservationTable, series_labels, series_rows
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        RESPONSE_MAX_BYTES = 32768
+
+BYTES_PER_TOKEN = 4  # Rough size of a token of JSON text
+MAX_DROPPED_LISTED = 20  # Series listed individually in `shaping["dropped"]`
+MIN_TAIL_PERIODS = 3  # Fewer periods per series say less than a summary
+
+
+def response_size(payload: Any) -> int:
+    """Bytes of a tool result as FastMCP serializes it (indented JSON)."""
+    return len(json.dumps(payload, indent=2, default=str).encode())
+
+
+def response_budget(max_response_bytes: Optional[int] = None,
+                    max_response_tokens: Optional[int] = None) -> Optional[int]:
+    """Byte budget from tool arguments (the smaller one wins) or `RESPONSE_MAX_BYTES`.
+
+    Returns None for no budget (a limit of 0).
+    """
+    limits = [b for b in (max_response_bytes,
+                          max_response_tokens * BYTES_PER_TOKEN if max_response_tokens is not None else None)
+              if b is not None]
+    budget = min(limits) if limits else Config.RESPONSE_MAX_BYTES
+    return budget if budget and budget > 0 else None
+
+
+def _label(table: ObservationTable, dim: int, row: int) -> Optional[str]:
+    idx = table.codes[dim][row]
+    return table.labels[dim][idx] if idx != MISSING else None
+
+
+def _rows_payload(table: ObservationTable, output_format: str) -> Dict[str, Any]:
+    if output_format == "compact":
+        return {"table": table.to_compact()}
+    return {"data_sample": table.to_records()}
+
+
+def _tails(groups: List[List[int]], count: int, keep: str) -> List[int]:
+    rows = []
+    for series in groups:
+        rows.extend(series[-count:] if keep == "last" else series[:count])
+    return sorted(rows)
+
+
+def _summary(table: ObservationTable, groups: List[List[int]],
+             labels: List[Dict[str, Optional[str]]]) -> List[Dict[str, Any]]:
+    time_dim = len(table.dimension_names) - 1
+    summaries = []
+    for rows, series in zip(groups, labels):
+        numeric = [row for row in rows if isinstance(table.values[row], (int, float))]
+        point = lambda row: [_label(table, time_dim, row), table.values[row]]
+        entry: Dict[str, Any] = {"series": series, "observations": len(rows),
+                                 "first": point(rows[0]), "last": point(rows[-1])}
+        if numeric:
+            entry["min"] = point(min(numeric, key=table.values.__getitem__))
+            entry["max"] = point(max(numeric, key=table.values.__getitem__))
+            entry["mean"] = round(sum(table.values[row] for row in numeric) / len(numeric), 6)
+        summaries.append(entry)
+    return summaries
+
+
+def _dropped(table: ObservationTable, groups: List[List[int]], kept: set,
+             labels: List[Dict[str, Optional[str]]]) -> Tuple[List[Dict[str, Any]], int]:
+    """Per series with rows left out: its labels, how many rows and the first/last dropped period."""
+    time_dim = len(table.dimension_names) - 1
+    dropped = []
+    for rows, series in zip(groups, labels):
+        missing = [row for row in rows if row not in kept]
+        if missing:
+            dropped.append({
+                "series": series,
+                "rows_dropped": len(missing),
+                "periods": [_label(table, time_dim, missing[0]), _label(table, time_dim, missing[-1])],
+            })
+    return dropped[:MAX_DROPPED_LISTED], max(0, len(dropped) - MAX_DROPPED_LISTED)
+
+
+def shape_rows(table: ObservationTable, output_format: str, budget: Optional[int],
+               keep: str = "last", overhead: int = 0) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Rows of a tool result that fit `budget` bytes, plus `shaping` metadata.
+
+    Args:
+        table: Rows the tool would return
+        output_format: Requested format ("records" or "compact")
+        budget: Byte budget of the whole result (None = unlimited)
+        keep: Which periods to keep when cutting series: "last" or "first"
+        overhead: Bytes of the rest of the result (title, transfer report, ...)
+
+    Returns:
+        (payload with `data_sample`, `table` or `summary`, shaping metadata)
+    """
+    available = budget - overhead if budget is not None else None
+
+    def report(strategy: str, payload: Dict[str, Any], fmt: str, kept_rows: int, **extra: Any):
+        size = response_size(payload) + overhead
+        return payload, {
+            "strategy": strategy,
+            "format": fmt,
+            "budget_bytes": budget,
+            "response_bytes": size,
+            "estimated_tokens": math.ceil(size / BYTES_PER_TOKEN),
+            "rows_returned": kept_rows,
+            "rows_dropped": len(table) - kept_rows,
+            **extra,
+        }
+
+    payload = _rows_payload(table, output_format)
+    if available is None or response_size(payload) <= available:
+        return report("full", payload, output_format, len(table))
+    if output_format != "compact":
+        payload = _rows_payload(table, "compact")
+        if response_size(payload) <= available:
+            return report("compact", payload, "compact", len(table))
+
+    groups = series_rows(table)
+    labels = series_labels(table, groups)
+    longest = max((len(rows) for rows in groups), default=0)
+
+    # Largest number of periods per series that still fits
+    low, high, best = MIN_TAIL_PERIODS, longest - 1, None
+    while low <= high:
+        count = (low + high) // 2
+        candidate = _rows_payload(table.take(_tails(groups, count, keep)), "compact")
+        if response_size(candidate) <= available:
+            best, low = (count, candidate), count + 1
+        else:
+            high = count - 1
+    if best is not None:
+        count, payload = best
+        kept = set(_tails(groups, count, keep))
+        dropped, unlisted = _dropped(table, groups, kept, labels)
+        extra = {"periods_per_series": count, "dropped": dropped}
+        if unlisted:
+            extra["dropped_series_not_listed"] = unlisted
+        return report("series_tail", payload, "compact", len(kept), **extra)
+
+    summaries = _summary(table, groups, labels)
+    shown = len(summaries)
+    while shown > 1 and response_size({"summary": summaries[:shown]}) > available:
+        shown = max(1, shown // 2)
+    extra = {"series_summarized": shown}
+    if shown < len(summaries):
+        extra["series_dropped"] = len(summaries) - shown
+    return report("summary", {"summary": summaries[:shown]}, "summary", 0, **extra)
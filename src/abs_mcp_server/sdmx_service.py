@@ -1,9 +1,19 @@
+import itertools
+import json
 import requests
 import logging
-from typing import Dict, Any, List, Optional
-from functools import lru_cache
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
+import time
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+from .http_pool import get_pool, wire_size
+from .disk_cache import get_disk_cache
+from .memory_cache import get_memory_cache
+from .catalog_search import CatalogIndex, get_catalog_index, set_catalog_index
+from .observations import MISSING, ObservationTable, parse_observation_table
+from .singleflight import SingleFlight
+from .release_calendar import release_expiry
+from .response_cache import BodyRecorder, ResponseCache, get_response_cache
+from .sdmx_stream import CHUNK_SIZE as STREAM_CHUNK_SIZE, StreamingDataParser
+from .series_store import SeriesEntry, gap_periods, load_series, request_days, save_series, series_store_enabled
 
 try:
     from .config import Config
@@ -13,32 +23,54 @@ except ImportError:
         ABS_API_BASE = "https://api.data.abs.gov.au"
         API_TIMEOUT = 30
         ENABLE_CACHING = True
-        CACHE_SIZE = 100
+        SERIES_STORE_MAX_OBSERVATIONS = 50000
 
 logger = logging.getLogger(__name__)
 
+# In-flight upstream calls, so identical concurrent requests share one fetch
+_flights = SingleFlight()
+
 ABS_API_BASE = Config.ABS_API_BASE
 API_TIMEOUT = Config.API_TIMEOUT
 
+STRUCTURE_ACCEPT = "application/vnd.sdmx.structure+json"
+DATA_ACCEPT = "application/vnd.sdmx.data+json"
+
+# An OR-key may fetch up to this many times the requested series before it is split up
+OR_KEY_MAX_EXPANSION = 4
+
 def _get_session() -> requests.Session:
-    """Create a requests session with retry logic."""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=3,
-        backoff_factor=0.5,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "OPTIONS"]
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-    return session
+    """Return the shared pooled session (keep-alive + retry logic)."""
+    return get_pool().session
+
+def _params_key(params: Dict[str, str]) -> Tuple[Tuple[str, str], ...]:
+    """Hashable, order-independent form of query params (for request keys)."""
+    return tuple(sorted(params.items()))
+
+def _parse_urn(urn: str) -> Dict[str, Optional[str]]:
+    """Split an SDMX URN into agency, id, version and (optional) item id.
+
+    Example: ``urn:...Concept=ABS:CS_CPI(1.0.0).MEASURE`` ->
+    ``{"agency": "ABS", "id": "CS_CPI", "version": "1.0.0", "item": "MEASURE"}``
+    """
+    ref = urn.split("=", 1)[-1]
+    agency, _, rest = ref.partition(":")
+    artefact_id, _, tail = rest.partition("(")
+    version, _, item = tail.partition(")")
+    return {
+        "agency": agency or None,
+        "id": artefact_id or None,
+        "version": version or None,
+        "item": item.lstrip(".") or None,
+    }
 
 class SDMXService:
     @staticmethod
-    @lru_cache(maxsize=Config.CACHE_SIZE if Config.ENABLE_CACHING else 0)
     def get_structure(dataset_id: str) -> Dict[str, Any]:
         """Fetch and parse structure for a dataset.
+
+        Resolves dataflow -> data structure definition -> codelists through the
+        SDMX structure endpoints, so no observations are downloaded.
         
         Args:
             dataset_id: The ABS dataset identifier
@@ -49,8 +81,112 @@ class SDMXService:
         Raises:
             requests.exceptions.RequestException: If API request fails
         """
+        memory = get_memory_cache()
+        if memory is not None:
+            structure = memory.get(("structure", dataset_id))
+            if structure is not None:
+                return structure
+
+        # Concurrent first calls for one dataset share a single fetch
+        return _flights.do(("structure", dataset_id), SDMXService._fetch_structure, dataset_id)
+
+    @staticmethod
+    def _fetch_structure(dataset_id: str) -> Dict[str, Any]:
+        """Load a structure from the disk cache or the structure endpoints."""
+        started = time.perf_counter()
+        cached = SDMXService._cached_structure(dataset_id)
+        if cached is not None:
+            SDMXService._remember_structure(dataset_id, cached, time.perf_counter() - started)
+            return cached
+
+        params = {"references": "children"}
+        
+        try:
+            # 1. Dataflow (children = its DSD)
+            url = SDMXService._dataflow_url(dataset_id)
+            logger.info(f"Fetching dataflow from: {url}")
+            _, body, _ = SDMXService._conditional_get(url, params, STRUCTURE_ACCEPT)
+            dataflow = SDMXService._extract_dataflow(json.loads(body), dataset_id)
+
+            # 2. DSD (children = codelists and concept schemes)
+            url = SDMXService._datastructure_url(dataflow)
+            logger.info(f"Fetching data structure from: {url}")
+            _, body, _ = SDMXService._conditional_get(url, params, STRUCTURE_ACCEPT)
+            dsd_message = json.loads(body)
+
+            structure = SDMXService._parse_structure_message(dataflow, dsd_message)
+        except requests.exceptions.RequestException as e:
+            logger.error(f"Failed to get structure for {dataset_id}: {e}")
+            raise e
+
+        SDMXService._store_structure(dataset_id, structure)
+        SDMXService._remember_structure(dataset_id, structure, time.perf_counter() - started)
+        return structure
+
+    @staticmethod
+    def _remember_structure(dataset_id: str, structure: Dict[str, Any], cost: float) -> None:
+        """Keep a parsed structure in the memory cache until the dataflow's next release.
+
+        `cost` is the seconds it took to load, so slow structures outlive cheap ones.
+        """
+        memory = get_memory_cache()
+        if memory is not None:
+            memory.set(("structure", dataset_id), structure, cost=cost, expires=release_expiry(dataset_id))
+
+    @staticmethod
+    def _cached_structure(dataset_id: str) -> Optional[Dict[str, Any]]:
+        """Look up a parsed structure in the persistent disk cache."""
+        cache = get_disk_cache()
+        if cache is None:
+            return None
+        structure = cache.get("structure", dataset_id)
+        if structure is not None:
+            logger.info(f"Structure for {dataset_id} served from disk cache")
+        return structure
+
+    @staticmethod
+    def _store_structure(dataset_id: str, structure: Dict[str, Any]) -> None:
+        """Persist a parsed structure so other/future server processes start warm."""
+        cache = get_disk_cache()
+        if cache is not None:
+            # Keep until the dataflow's next scheduled release, if the calendar knows it
+            expires = release_expiry(dataset_id)
+            ttl = expires - time.time() if expires else None
+            try:
+                cache.set("structure", dataset_id, structure, ttl=ttl)
+            except Exception as e:
+                logger.warning(f"Failed to write structure for {dataset_id} to disk cache: {e}")
+
+    @staticmethod
+    def _dataflow_url(dataset_id: str) -> str:
+        return f"{ABS_API_BASE}/dataflow/ABS/{dataset_id}"
+
+    @staticmethod
+    def _extract_dataflow(flow_message: Dict[str, Any], dataset_id: str) -> Dict[str, Any]:
+        """Return the dataflow entry of a `/dataflow` structure message."""
+        dataflows = flow_message.get("data", {}).get("dataflows", [])
+        if not dataflows:
+            raise ValueError(f"Dataflow {dataset_id} not found in structure response")
+        return dataflows[0]
+
+    @staticmethod
+    def _datastructure_url(dataflow: Dict[str, Any]) -> str:
+        """URL of the DSD referenced by a dataflow's `structure` URN."""
+        dsd_ref = _parse_urn(dataflow.get("structure", ""))
+        url = f"{ABS_API_BASE}/datastructure/{dsd_ref['agency'] or 'ABS'}/{dsd_ref['id']}"
+        if dsd_ref["version"]:
+            url = f"{url}/{dsd_ref['version']}"
+        return url
+
+    @staticmethod
+    def get_structure_from_data(dataset_id: str) -> Dict[str, Any]:
+        """Legacy structure lookup that downloads the full dataset.
+
+        Kept for benchmarking against `get_structure`; it pulls every observation
+        just to read the dimension lists, so avoid it in tool code.
+        """
         url = f"{ABS_API_BASE}/data/{dataset_id}?detail=full&dimensionAtObservation=AllDimensions"
-        headers = {"Accept": "application/vnd.sdmx.data+json"}
+        headers = {"Accept": DATA_ACCEPT}
         logger.info(f"Fetching structure from: {url}")
         
         try:
@@ -64,8 +200,318 @@ class SDMXService:
             raise e
 
     @staticmethod
-    def get_data(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None) -> Dict[str, Any]:
+    def _parse_structure_message(dataflow: Dict[str, Any], dsd_message: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the normalized structure shape from SDMX-JSON structure messages.
+
+        Produces the same layout as a data message's `structure` block
+        (`{"name", "description", "dimensions": {"series": [], "observation": [...]}}`)
+        so `parse_dimensions` works unchanged. Dimensions are ordered by their
+        DSD position with time dimensions last, matching the data key order.
+        """
+        container = dsd_message.get("data", {})
+        
+        data_structures = container.get("dataStructures", [])
+        if not data_structures:
+            raise ValueError(f"No data structure returned for {dataflow.get('id')}")
+        dsd = data_structures[0]
+
+        codelists = {}
+        for codelist in container.get("codelists", []):
+            codelists[(codelist.get("agencyID"), codelist.get("id"), codelist.get("version"))] = codelist
+            # Fallback lookup when the URN omits agency/version
+            codelists.setdefault(codelist.get("id"), codelist)
+
+        concepts = {}
+        for scheme in container.get("conceptSchemes", []):
+            for concept in scheme.get("concepts", []):
+                concepts[(scheme.get("id"), concept.get("id"))] = concept.get("name")
+                concepts.setdefault(concept.get("id"), concept.get("name"))
+
+        dimension_list = dsd.get("dataStructureComponents", {}).get("dimensionList", {})
+        regular_dims = sorted(dimension_list.get("dimensions", []), key=lambda d: d.get("position", 0))
+        time_dims = dimension_list.get("timeDimensions", [])
+
+        dimensions = []
+        for dim in regular_dims + time_dims:
+            dim_id = dim.get("id")
+            
+            name = None
+            concept_urn = dim.get("conceptIdentity")
+            if concept_urn:
+                ref = _parse_urn(concept_urn)
+                name = concepts.get((ref["id"], ref["item"])) or concepts.get(ref["item"])
+            
+            values = []
+            enumeration = dim.get("localRepresentation", {}).get("enumeration")
+            if enumeration:
+                ref = _parse_urn(enumeration)
+                codelist = codelists.get((ref["agency"], ref["id"], ref["version"])) or codelists.get(ref["id"], {})
+                values = [{"id": c.get("id"), "name": c.get("name")} for c in codelist.get("codes", [])]
+            
+            dimensions.append({
+                "id": dim_id,
+                "name": name or dim_id,
+                "values": values
+            })
+
+        return {
+            "id": dataflow.get("id"),
+            "name": dataflow.get("name"),
+            "description": dataflow.get("description", "No description"),
+            "dimensions": {
+                "series": [],
+                "observation": dimensions
+            }
+        }
+
+    @staticmethod
+    def get_data(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                 last_n_observations: Optional[int] = None, first_n_observations: Optional[int] = None) -> Dict[str, Any]:
         """Fetch data with specific key and time params."""
+        data, _ = SDMXService.get_data_with_meta(
+            dataset_id, key, start_period, end_period, last_n_observations, first_n_observations
+        )
+        return data
+
+    @staticmethod
+    def get_data_with_meta(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                           last_n_observations: Optional[int] = None, first_n_observations: Optional[int] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Like `get_data`, also returning transfer metadata (`url`, `params`, `bytes`)."""
+        url, params = SDMXService._data_request(
+            dataset_id, key, start_period, end_period, last_n_observations, first_n_observations
+        )
+        return _flights.do(("data", url, _params_key(params)), SDMXService._fetch_data, url, params)
+
+    @staticmethod
+    def _fetch_data(url: str, params: Dict[str, str]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        try:
+            status, body, cache_meta = SDMXService._conditional_get(url, params, DATA_ACCEPT, allow_404=True)
+            meta = {"url": url, "params": params, **cache_meta}
+            
+            if status == 404:
+                logger.warning(f"ABS API 404 for {url}")
+                return {}, meta # Return empty dict for no data
+                
+            data = json.loads(body)
+            SDMXService._log_data_sets(data)
+            return data, meta
+        except requests.RequestException as e:
+            logger.error(f"ABS API Request failed: {e}")
+            raise e
+
+    @staticmethod
+    def _conditional_get(url: str, params: Optional[Dict[str, str]], accept: str,
+                         allow_404: bool = False) -> Tuple[int, bytes, Dict[str, Any]]:
+        """GET through the response cache, returning (status, body, cache meta).
+
+        Stored validators are sent as `If-None-Match`/`If-Modified-Since`; a
+        304 (or a still-fresh entry) is returned as 200 with the stored body.
+        The meta reports wire `bytes`, `body_bytes` and the `cache` outcome.
+
+        Raises:
+            requests.exceptions.HTTPError: For error statuses (except 404 if allowed)
+        """
+        cache = get_response_cache()
+        key, entry = None, None
+        headers = {"Accept": accept}
+        if cache is not None:
+            key = ResponseCache.key(url, params, accept)
+            entry, conditional = cache.lookup(key)
+            if cache.is_fresh(entry):
+                body = cache.hit(entry)
+                return 200, body, {"bytes": 0, "body_bytes": len(body), "cache": "hit"}
+            headers.update(conditional)
+
+        session = _get_session()
+        response = session.get(url, params=params, headers=headers, timeout=API_TIMEOUT)
+        body = response.content or b""
+        wire_bytes = wire_size(response, len(body))
+
+        if response.status_code == 304 and entry is not None:
+            body = cache.revalidated(key, entry, response.headers)
+            return 200, body, {"bytes": wire_bytes, "body_bytes": len(body), "cache": "revalidated"}
+        if response.status_code == 404 and allow_404:
+            return 404, b"", {"bytes": wire_bytes, "body_bytes": 0, "cache": None}
+
+        response.raise_for_status()
+        if cache is not None:
+            cache.store_response(key, response.headers, body)
+        return response.status_code, body, {
+            "bytes": wire_bytes, "body_bytes": len(body), "cache": "miss" if cache is not None else None
+        }
+
+    @staticmethod
+    def stream_data_with_meta(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                              last_n_observations: Optional[int] = None, first_n_observations: Optional[int] = None,
+                              max_observations: Optional[int] = None, keep: str = "last") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Like `get_data_with_meta`, parsing the body incrementally as it arrives.
+
+        At most `max_observations` observations are retained (the last or the
+        first ones, per `keep`); with `keep="first"` reading stops as soon as
+        enough have arrived. The returned message holds only the retained
+        observations; `meta` adds the totals seen (see `StreamingDataParser.meta`).
+        """
+        url, params = SDMXService._data_request(
+            dataset_id, key, start_period, end_period, last_n_observations, first_n_observations
+        )
+        return _flights.do(
+            ("stream", url, _params_key(params), max_observations, keep),
+            SDMXService._stream_data, url, params, max_observations, keep
+        )
+
+    @staticmethod
+    def _stream_data(url: str, params: Dict[str, str], max_observations: Optional[int],
+                     keep: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        cache = get_response_cache()
+        key, entry = None, None
+        headers = {"Accept": DATA_ACCEPT}
+        if cache is not None:
+            key = ResponseCache.key(url, params, DATA_ACCEPT)
+            entry, conditional = cache.lookup(key)
+            if cache.is_fresh(entry):
+                return SDMXService._parse_cached_body(url, params, cache.hit(entry), "hit", max_observations, keep)
+            headers.update(conditional)
+
+        try:
+            session = _get_session()
+            response = session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=API_TIMEOUT,
+                stream=True
+            )
+            try:
+                if response.status_code == 304 and entry is not None:
+                    body = cache.revalidated(key, entry, response.headers)
+                    return SDMXService._parse_cached_body(url, params, body, "revalidated", max_observations, keep)
+                if response.status_code == 404:
+                    logger.warning(f"ABS API 404 for {url}")
+                    return {}, {"url": url, "params": params, "bytes": 0}
+
+                response.raise_for_status()
+                parser = StreamingDataParser(max_observations, keep)
+                recorder = BodyRecorder(cache.max_body_bytes if cache is not None else 0)
+                for chunk in response.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+                    recorder.add(chunk)
+                    if parser.feed(chunk):
+                        logger.info(f"Stopped reading {url} after {parser.bytes_read} bytes")
+                        break
+                data = parser.close()
+                wire_bytes = wire_size(response, parser.bytes_read)
+            finally:
+                response.close()
+            if cache is not None:
+                cache.store_response(key, response.headers, recorder.body if parser.complete else None)
+            SDMXService._log_data_sets(data)
+            meta = parser.meta()
+            return data, {"url": url, "params": params, **meta, "bytes": wire_bytes, "body_bytes": meta["bytes"],
+                          "cache": "miss" if cache is not None else None}
+        except requests.RequestException as e:
+            logger.error(f"ABS API Request failed: {e}")
+            raise e
+
+    @staticmethod
+    def get_series_data(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                        max_observations: Optional[int] = None, keep: str = "last") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Period-range data served from the series store, fetching only missing periods.
+
+        Observations already held for `dataset_id`/`key` are reused; only the
+        uncovered parts of `start_period`..`end_period` are requested and
+        merged in. Returns the same shape as `stream_data_with_meta`, with
+        `cache` set to "series-hit" (nothing fetched) or "series-delta" and
+        the fetched `gaps` in the metadata. Falls back to a plain fetch when
+        the store is disabled or a gap cannot be stored completely.
+        """
+        if not series_store_enabled():
+            return SDMXService.stream_data_with_meta(
+                dataset_id, key, start_period, end_period, max_observations=max_observations, keep=keep
+            )
+        return _flights.do(
+            ("series", dataset_id, key, start_period, end_period, max_observations, keep),
+            SDMXService._series_data, dataset_id, key, start_period, end_period, max_observations, keep
+        )
+
+    @staticmethod
+    def _series_data(dataset_id: str, key: str, start_period: Optional[str], end_period: Optional[str],
+                     max_observations: Optional[int], keep: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        entry = load_series(dataset_id, key)
+        started = time.perf_counter()
+        try:
+            start, end = request_days(start_period, end_period)
+            gaps = entry.gaps(start, end)
+            fetched = []
+            for gap in gaps:
+                gap_start, gap_end = gap_periods(gap, start_period, end_period)
+                data, meta = SDMXService.stream_data_with_meta(
+                    dataset_id, key, gap_start, gap_end,
+                    max_observations=Config.SERIES_STORE_MAX_OBSERVATIONS
+                )
+                if not SDMXService._merge_gap(dataset_id, entry, gap, data, meta):
+                    raise ValueError(f"gap {gap_start}..{gap_end} too large to store")
+                fetched.append(meta)
+        except ValueError as e:
+            logger.info(f"Series store skipped for {dataset_id}/{key}: {e}")
+            return SDMXService.stream_data_with_meta(
+                dataset_id, key, start_period, end_period, max_observations=max_observations, keep=keep
+            )
+
+        if gaps:
+            save_series(dataset_id, key, entry, time.perf_counter() - started)
+        return SDMXService._series_result(dataset_id, key, start_period, end_period, entry, gaps, fetched,
+                                          max_observations, keep)
+
+    @staticmethod
+    def _merge_gap(dataset_id: str, entry: SeriesEntry, gap: Tuple[int, int], data: Dict[str, Any],
+                   meta: Dict[str, Any]) -> bool:
+        """Merge one fetched gap into a series entry; False if the fetch was truncated."""
+        if not meta.get("complete", True) or meta.get("observations", 0) > meta.get("observations_kept", 0):
+            return False
+        structure = SDMXService._parse_structure(data) if data else {}
+        dimensions = SDMXService.parse_dimensions(structure) if structure else []
+        entry.merge(data, dimensions, structure.get("name"), gap, release_expiry(dataset_id))
+        return True
+
+    @staticmethod
+    def _series_result(dataset_id: str, key: str, start_period: Optional[str], end_period: Optional[str],
+                       entry: SeriesEntry, gaps: List[Tuple[int, int]], fetched: List[Dict[str, Any]],
+                       max_observations: Optional[int], keep: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Message for the requested range plus transfer metadata summed over the gap fetches."""
+        start, end = request_days(start_period, end_period)
+        data, counts = entry.message(start, end, max_observations, keep)
+        url, params = SDMXService._data_request(dataset_id, key, start_period, end_period)
+        return data, {
+            "url": url,
+            "params": params,
+            "bytes": sum(meta.get("bytes", 0) for meta in fetched),
+            "body_bytes": sum(meta.get("body_bytes", 0) for meta in fetched),
+            **counts,
+            "complete": True,
+            "cache": "series-delta" if gaps else "series-hit",
+            "gaps": [list(gap_periods(gap, start_period, end_period)) for gap in gaps],
+        }
+
+    @staticmethod
+    def _parse_cached_body(url: str, params: Dict[str, str], body: bytes, outcome: str,
+                           max_observations: Optional[int], keep: str) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Run a body served by the response cache through the streaming parser."""
+        parser = StreamingDataParser(max_observations, keep)
+        for start in range(0, len(body), STREAM_CHUNK_SIZE):
+            if parser.feed(body[start:start + STREAM_CHUNK_SIZE]):
+                break
+        data = parser.close()
+        meta = parser.meta()
+        return data, {"url": url, "params": params, **meta, "bytes": 0, "body_bytes": len(body), "cache": outcome}
+
+    @staticmethod
+    def _data_request(dataset_id: str, key: str = "all", start_period: Optional[str] = None, end_period: Optional[str] = None,
+                      last_n_observations: Optional[int] = None, first_n_observations: Optional[int] = None) -> Tuple[str, Dict[str, str]]:
+        """Build the `/data` URL and query params for a data request.
+
+        `last_n_observations`/`first_n_observations` map to the SDMX
+        `lastNObservations`/`firstNObservations` parameters (applied per series
+        by the API, so only those observations are transferred).
+        """
         url = f"{ABS_API_BASE}/data/{dataset_id}"
         if key != "all":
             url = f"{url}/{key}"
@@ -75,39 +521,202 @@ class SDMXService:
             params["startPeriod"] = start_period
         if end_period:
             params["endPeriod"] = end_period
-            
-        try:
-            response = requests.get(
-                url,
-                params=params, 
-                headers={"Accept": "application/vnd.sdmx.data+json"},
-                timeout=30
-            )
-            
-            if response.status_code == 404:
-                logger.warning(f"ABS API 404 for {url}")
-                return {} # Return empty dict for no data
-                
-            response.raise_for_status()
-            data = response.json()
-            # Debug: Check if dataSets is empty
-            ds = data.get("data", {}).get("dataSets", [])
-            # Note: structure of response is root -> data -> dataSets (sometimes) or root -> dataSets
-            # Standard SDMX-JSON 2.0: root -> data -> dataSets
-            # But earlier we saw root -> dataSets ? verifying..
-            if "data" in data and "dataSets" in data["data"]:
-                 ds = data["data"]["dataSets"]
-                 logger.info(f"DataSets found in data.dataSets: {len(ds)}")
-            elif "dataSets" in data:
-                 ds = data["dataSets"]
-                 logger.info(f"DataSets found in root.dataSets: {len(ds)}")
-            else:
-                 logger.warning("No dataSets found in response keys: " + str(data.keys()))
-                 
-            return data
-        except requests.RequestException as e:
-            logger.error(f"ABS API Request failed: {e}")
-            raise e
+        if last_n_observations:
+            params["lastNObservations"] = str(last_n_observations)
+        if first_n_observations:
+            params["firstNObservations"] = str(first_n_observations)
+        return url, params
+
+    @staticmethod
+    def _log_data_sets(data: Dict[str, Any]) -> None:
+        """Debug: report where (and whether) dataSets appear in a data response."""
+        # Note: structure of response is root -> data -> dataSets (sometimes) or root -> dataSets
+        # Standard SDMX-JSON 2.0: root -> data -> dataSets
+        if "data" in data and "dataSets" in data["data"]:
+             ds = data["data"]["dataSets"]
+             logger.info(f"DataSets found in data.dataSets: {len(ds)}")
+        elif "dataSets" in data:
+             ds = data["dataSets"]
+             logger.info(f"DataSets found in root.dataSets: {len(ds)}")
+        else:
+             logger.warning("No dataSets found in response keys: " + str(data.keys()))
+
+    @staticmethod
+    def series_lengths(data: Dict[str, Any]) -> List[int]:
+        """Number of observations in each series of a data response."""
+        if "data" in data and isinstance(data["data"], dict) and "dataSets" in data["data"]:
+            data_sets = data["data"]["dataSets"]
+        else:
+            data_sets = data.get("dataSets", [])
+        if not data_sets:
+            return []
+        ds = data_sets[0]
+        if "series" in ds:
+            return [len(series_data.get("observations", {})) for series_data in ds["series"].values()]
+        return [len(ds.get("observations", {}))]
+
+    @staticmethod
+    def build_key(dimensions: List[Dict[str, Any]], filters: Optional[Dict[str, str]]) -> str:
+        """Construct the SDMX data key from dimension order and code filters.
+
+        Unfiltered dimensions are left empty (wildcard); returns "all" if
+        nothing is filtered.
+        """
+        path_key = "all"
+        if filters:
+             key_parts = []
+             for dim in dimensions:
+                 dim_id = dim.get("id")
+                 if dim_id in filters:
+                     key_parts.append(filters[dim_id])
+                 else:
+                     key_parts.append("") # Empty means "all"
+             
+             if any(part for part in key_parts):
+                 path_key = ".".join(key_parts)
+                 # Strip trailing empty parts (dots) which can cause API errors
+                 if path_key.endswith("."):
+                     path_key = path_key.rstrip(".")
+        return path_key
+
+    @staticmethod
+    def expand_filters(filters: Dict[str, Union[str, List[str]]]) -> List[Dict[str, str]]:
+        """One filter set per combination of the codes given for each dimension.
+
+        Codes may be a list or a `+`-joined string:
+        `{"REGION": ["1", "2"], "MEASURE": "3"}` -> `[{"REGION": "1", "MEASURE": "3"}, {"REGION": "2", ...}]`.
+        """
+        dims = list(filters)
+        choices = [
+            value if isinstance(value, list) else [code for code in str(value).split("+") if code]
+            for value in filters.values()
+        ]
+        return [dict(zip(dims, combo)) for combo in itertools.product(*choices)]
+
+    @staticmethod
+    def build_or_keys(dimensions: List[Dict[str, Any]], filter_sets: Sequence[Dict[str, str]],
+                      max_expansion: int = OR_KEY_MAX_EXPANSION) -> List[Tuple[str, List[int]]]:
+        """Group filter sets into as few SDMX keys as possible, OR-ing codes with `+`.
+
+        An OR-key selects every combination of its per-dimension codes, so all
+        sets share one key as long as that fetches at most `max_expansion`
+        times the series asked for. Otherwise sets are grouped along the
+        dimension giving the fewest exact groups (sets differing only there).
+
+        Returns:
+            list: (key, indices of the filter sets it serves)
+        """
+        def combined(indices: List[int]) -> Tuple[str, int]:
+            ored = {}
+            size = 1
+            for dim in dimensions:
+                dim_id = dim.get("id")
+                codes = [filter_sets[i].get(dim_id) for i in indices]
+                if all(codes):
+                    codes = list(dict.fromkeys(codes))
+                    ored[dim_id] = "+".join(codes)
+                    size *= len(codes)
+                # A set without this dimension needs it wildcarded
+            return SDMXService.build_key(dimensions, ored), size
+
+        everything = list(range(len(filter_sets)))
+        key, size = combined(everything)
+        distinct = len({tuple(sorted(f.items())) for f in filter_sets})
+        if size <= max_expansion * distinct:
+            return [(key, everything)]
+
+        dim_ids = [dim.get("id") for dim in dimensions]
+        best = None
+        for varying in dim_ids:
+            groups: Dict[Tuple, List[int]] = {}
+            for i, filters in enumerate(filter_sets):
+                fixed = tuple(filters.get(dim_id) for dim_id in dim_ids if dim_id != varying)
+                groups.setdefault(fixed, []).append(i)
+            if best is None or len(groups) < len(best):
+                best = list(groups.values())
+        return [(combined(group)[0], group) for group in best]
+
+    @staticmethod
+    def key_series_count(key: str) -> int:
+        """Series an SDMX key selects: the product of its `+`-OR-ed code counts.
+
+        Wildcarded (empty) dimensions count once, so for them this is a lower bound.
+        """
+        count = 1
+        for part in key.split(".") if key != "all" else []:
+            if part:
+                count *= len(part.split("+"))
+        return count
+
+    @staticmethod
+    def totals_by_filters(series_totals: Dict[str, int], dimensions: List[Dict[str, Any]],
+                          filter_sets: Sequence[Dict[str, str]]) -> List[Optional[int]]:
+        """Observations found upstream for each filter set, before any limit was applied.
+
+        `series_totals` is the `series_totals` parse metadata (SDMX-JSON series
+        key -> observations seen) and `dimensions` is `parse_dimensions` of the
+        response structure. Gives None for every set when the message has no
+        series keys (flat observations).
+        """
+        decoded = []
+        for key, count in series_totals.items():
+            if not key:
+                return [None] * len(filter_sets)
+            ids = []
+            for d, idx in enumerate(key.split(":")):
+                values = dimensions[d]["values"] if d < len(dimensions) else []
+                position = int(idx) if idx.isdigit() else -1
+                ids.append(values[position].get("id") if 0 <= position < len(values) else None)
+            decoded.append((ids, count))
+
+        positions = {dim.get("id"): d for d, dim in enumerate(dimensions)}
+        totals: List[Optional[int]] = []
+        for filters in filter_sets:
+            total = 0
+            for ids, count in decoded:
+                # Filters on dimensions that are not part of the series key are ignored
+                if all(ids[positions[dim_id]] == code for dim_id, code in filters.items()
+                       if positions.get(dim_id, len(ids)) < len(ids)):
+                    total += count
+            totals.append(total)
+        return totals
+
+    @staticmethod
+    def split_by_filters(table: ObservationTable, dimensions: List[Dict[str, Any]],
+                         filter_sets: Sequence[Dict[str, str]]) -> List[ObservationTable]:
+        """Rows of a multi-series response belonging to each filter set, in set order.
+
+        `dimensions` is `parse_dimensions` of the response structure; filters on
+        dimensions the response does not have are ignored.
+        """
+        positions = {dim.get("id"): d for d, dim in enumerate(dimensions)}
+        conditions = []
+        for filters in filter_sets:
+            wanted = []
+            for dim_id, code in filters.items():
+                d = positions.get(dim_id)
+                if d is None:
+                    continue
+                ids = [value.get("id") for value in dimensions[d]["values"]]
+                wanted.append((d, ids.index(code) if code in ids else MISSING - 1))
+            conditions.append(wanted)
+
+        rows: List[List[int]] = [[] for _ in filter_sets]
+        for row in range(len(table)):
+            for i, wanted in enumerate(conditions):
+                if all(table.codes[d][row] == idx for d, idx in wanted):
+                    rows[i].append(row)
+        return [table.take(selected) for selected in rows]
+
+    @staticmethod
+    def pool_stats() -> Dict[str, Any]:
+        """HTTP connection pool statistics (connections opened vs reused)."""
+        return get_pool().stats()
+
+    @staticmethod
+    def coalescing_stats() -> Dict[str, int]:
+        """Upstream calls made vs. concurrent identical calls that shared one."""
+        return _flights.stats()
 
     @staticmethod
     def _parse_structure(data: Dict[str, Any]) -> Dict[str, Any]:
@@ -128,49 +737,53 @@ class SDMXService:
 
     @staticmethod
     def search_datasets(keyword: str, limit: int = 10) -> List[Dict[str, Any]]:
-        """Search available ABS datasets."""
+        """Search available ABS datasets in the local catalog index.
+
+        Results are ranked by BM25 relevance (prefix matches allowed) and
+        carry a `score`. No network call is made once the index is built.
+        """
         try:
-             # We need to implement search here. Reusing logic from old server.py
-             ABS_DATAFLOWS_URL = f"{ABS_API_BASE}/dataflow"
-             response = requests.get(
-                ABS_DATAFLOWS_URL, 
-                headers={"Accept": "application/vnd.sdmx.structure+json"},
-                timeout=30
-            )
-             response.raise_for_status()
-             
-             data = response.json()
-             dataflows_container = data.get("data", {})
-             if isinstance(dataflows_container, dict):
-                 datasets = dataflows_container.get("dataflows", [])
-             else:
-                 datasets = []
-
-             if keyword:
-                keyword_lower = keyword.lower()
-                datasets = [
-                    ds for ds in datasets
-                    if keyword_lower in ds.get("name", "").lower()
-                    or keyword_lower in ds.get("description", "").lower()
-                ]
+            index = get_catalog_index(loader=SDMXService.fetch_dataflows)
             
-             datasets = datasets[:limit]
-             
-             result = []
-             for ds in datasets:
+            result = []
+            for ds, score in index.search(keyword, limit):
                 result.append({
                     "id": ds.get("id"),
                     "name": ds.get("name"),
                     "description": ds.get("description"),
                     "version": ds.get("version"),
-                    "agency_id": ds.get("agencyID"),
+                    "agency_id": ds.get("agencyID", "ABS"),
+                    "score": round(score, 3),
                 })
-             return result
+            return result
 
         except Exception as e:
             logger.error(f"Search failed: {e}")
             return []
 
+    @staticmethod
+    def fetch_dataflows() -> List[Dict[str, Any]]:
+        """Download the live `/dataflow` listing (revalidated through the response cache)."""
+        ABS_DATAFLOWS_URL = f"{ABS_API_BASE}/dataflow"
+        _, body, _ = SDMXService._conditional_get(ABS_DATAFLOWS_URL, None, STRUCTURE_ACCEPT)
+        
+        data = json.loads(body)
+        dataflows_container = data.get("data", {})
+        if isinstance(dataflows_container, dict):
+            return dataflows_container.get("dataflows", [])
+        return []
+
+    @staticmethod
+    def refresh_catalog() -> int:
+        """Rebuild the search index from the live `/dataflow` listing.
+
+        Returns:
+            int: Number of datasets indexed
+        """
+        index = CatalogIndex.from_dataflows(SDMXService.fetch_dataflows())
+        set_catalog_index(index)
+        return len(index)
+
     @staticmethod
     def parse_dimensions(structure: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Extract user-friendly dimension list from structure object."""
@@ -200,73 +813,12 @@ class SDMXService:
             })
         return formatted_dims
 
+    @staticmethod
+    def parse_observation_table(data: Dict[str, Any], dimensions: List[Dict[str, Any]]) -> ObservationTable:
+        """Parse observations into a columnar `ObservationTable` (values + code indices)."""
+        return parse_observation_table(data, dimensions)
+
     @staticmethod
     def parse_observations(data: Dict[str, Any], dimensions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Parse observations into a flat list of dicts with dimension names."""
-        # Handle standard SDMX-JSON 2.0 (root -> data -> dataSets)
-        # and other variants (root -> dataSets)
-        data_sets = []
-        if "data" in data and isinstance(data["data"], dict) and "dataSets" in data["data"]:
-            data_sets = data["data"]["dataSets"]
-        else:
-            data_sets = data.get("dataSets", [])
-            
-        observations = []
-        
-        if not data_sets:
-            return observations
-
-        ds = data_sets[0]
-        
-        # Case 1: Series (Time Series usually)
-        if "series" in ds:
-            series = ds["series"]
-            for series_key, series_data in series.items():
-                series_indices = [int(i) for i in series_key.split(":")]
-                
-                obs_map = series_data.get("observations", {})
-                for obs_key, obs_val in obs_map.items():
-                    # obs_key usually matches the Observation Dimension
-                    obs_dict = {"value": obs_val[0]}
-                    
-                    # Iterate dimensions to map series indices and obs indices
-                    current_dim_idx = 0
-                    
-                    # Map Series Dimensions
-                    for s_idx in series_indices:
-                        if current_dim_idx < len(dimensions):
-                            dim = dimensions[current_dim_idx]
-                            if s_idx < len(dim["values"]):
-                                obs_dict[dim["name"]] = dim["values"][s_idx]["name"]
-                            current_dim_idx += 1
-                            
-                    # Map Observation Dimensions (usually just Time)
-                    obs_indices = [int(i) for i in obs_key.split(":")]
-                    for o_idx in obs_indices:
-                         if current_dim_idx < len(dimensions):
-                            dim = dimensions[current_dim_idx]
-                            if o_idx < len(dim["values"]):
-                                obs_dict[dim["name"]] = dim["values"][o_idx]["name"]
-                            current_dim_idx += 1
-                            
-                    observations.append(obs_dict)
-                    
-        # Case 2: Flat Observations
-        elif "observations" in ds:
-            raw_obs = ds["observations"]
-            for key, value in raw_obs.items():
-                indices = [int(i) for i in key.split(":")]
-                obs_dict = {"value": value[0]} 
-                
-                for i, idx in enumerate(indices):
-                    if i < len(dimensions):
-                         dim = dimensions[i]
-                         if idx < len(dim["values"]):
-                             val_obj = dim["values"][idx]
-                             obs_dict[dim["name"]] = val_obj["name"]
-                         else:
-                             obs_dict[dim["name"]] = "Unknown"
-                
-                observations.append(obs_dict)
-
-        return observations
+        return parse_observation_table(data, dimensions).to_records()
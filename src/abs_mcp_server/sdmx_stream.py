@@ -0,0 +1,287 @@
+"""Incremental parsing of SDMX-JSON data messages.
+
+`StreamingDataParser` is fed the HTTP body chunk by chunk and keeps at most
+`max_observations` observations (the first ones in document order, or the
+ones with the latest periods), so memory stays bounded however large the
+response is. In "first" mode it reports when it has enough and the caller
+can stop reading.
+
+The result is a reduced SDMX-JSON message (`data.dataSets` with only the
+retained observations, plus the response structure) that the existing
+parsing helpers accept unchanged. Series attributes are dropped.
+
+Incremental parsing needs the optional `ijson` package; without it the body
+is buffered and parsed with `json` at the end (same result, no memory bound).
+"""
+import heapq
+import json
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+try:
+    import ijson
+except ImportError:  # pragma: no cover - exercised when ijson is not installed
+    ijson = None
+
+from .periods import UNKNOWN_PERIOD, PeriodIndex, period_index
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 64 * 1024
+
+# ijson dotted paths of the maps and values the parser collects
+_OBSERVATIONS_RE = re.compile(r"^(?:data\.)?dataSets\.item\.(?:series\.([^.]+)\.)?observations$")
+_NOT_OBSERVATIONS = object()
+_STRUCTURE_PREFIXES = {"structure", "data.structure", "data.structures", "data.structures.item"}
+_DATA_SET_PREFIXES = {"dataSets.item", "data.dataSets.item"}
+
+
+def streaming_available() -> bool:
+    """True if incremental parsing is possible (ijson installed)."""
+    return ijson is not None
+
+
+def _time_index(structure: Any) -> Optional[PeriodIndex]:
+    """`PeriodIndex` of the time (last observation) dimension's values, if any."""
+    if isinstance(structure, list):
+        structure = structure[0] if structure else None
+    if not isinstance(structure, dict):
+        return None
+    observation = structure.get("dimensions", {}).get("observation") or []
+    if not observation:
+        return None
+    return period_index([value.get("id", "") for value in observation[-1].get("values", [])])
+
+
+class StreamingDataParser:
+    """Push parser for SDMX-JSON data messages with bounded retention.
+
+    Args:
+        max_observations: Observations to keep (None keeps all).
+        keep: "last" keeps the observations with the latest periods (the
+            later in document order on ties or unsupported period formats),
+            "first" keeps the earliest in document order and allows
+            stopping early.
+
+    With "last", observations that arrive before the structure are held
+    until their periods are known, so the memory bound only applies once
+    the structure has been read.
+    """
+
+    def __init__(self, max_observations: Optional[int] = None, keep: str = "last"):
+        if keep not in ("first", "last"):
+            raise ValueError(f"keep must be 'first' or 'last', not {keep!r}")
+        self.max_observations = max_observations
+        self.keep = keep
+
+        self.bytes_read = 0
+        self.observations_seen = 0
+        self.series_counts: Dict[str, int] = {}
+        self.structure: Optional[Any] = None
+        self.complete = False
+
+        self._kept = 0
+        self._times: Optional[PeriodIndex] = None  # Periods of the time dimension, once known
+        self._heap: List[Tuple[int, int, Optional[str], str]] = []  # (period start, arrival, series, obs) kept
+        self._pending: List[Tuple[int, Optional[str], str]] = []  # Kept before the periods were known
+        self._series: Dict[Optional[str], Dict[str, Any]] = {}
+        self._data_set_index = -1
+        self._builder = None  # ObjectBuilder for the structure, while it is being read
+        self._observation_parents: Dict[str, Any] = {}  # prefix -> series key
+        self._obs_series: Optional[str] = None
+        self._obs_key: Optional[str] = None
+        self._obs_value: Any = None
+        self._depth = 0
+
+        if ijson is not None:
+            self._events = ijson.sendable_list()
+            self._coro = ijson.parse_coro(self._events, use_float=True)
+        else:
+            self._buffer: List[bytes] = []
+
+    @property
+    def enough(self) -> bool:
+        """True once nothing more is needed from the body ("first" mode only)."""
+        return (
+            self.keep == "first"
+            and self.max_observations is not None
+            and self.observations_seen >= self.max_observations
+            and self.structure is not None
+        )
+
+    def feed(self, chunk: bytes) -> bool:
+        """Parse the next body chunk; returns True when the caller may stop reading."""
+        self.bytes_read += len(chunk)
+        if ijson is None:
+            self._buffer.append(chunk)
+            return False
+        self._coro.send(chunk)
+        for prefix, event, value in self._events:
+            self._event(prefix, event, value)
+        del self._events[:]
+        return self.enough
+
+    def close(self) -> Dict[str, Any]:
+        """Finish parsing and return the reduced SDMX-JSON message."""
+        if ijson is None:
+            self._walk(json.loads(b"".join(self._buffer)) if self._buffer else {})
+            self._buffer = []
+            self.complete = True
+        elif not self.enough:
+            self._coro.close()
+            for prefix, event, value in self._events:
+                self._event(prefix, event, value)
+            del self._events[:]
+            self.complete = True
+        self._rank_pending()
+        return self.result()
+
+    def result(self) -> Dict[str, Any]:
+        if self.structure is None and not self._series:
+            return {}
+        if None in self._series:
+            data_set = {"observations": self._series[None]["observations"]}
+        else:
+            data_set = {"series": self._series}
+        structures = self.structure if isinstance(self.structure, list) else [self.structure or {}]
+        return {"data": {"dataSets": [data_set], "structures": structures}}
+
+    def meta(self) -> Dict[str, Any]:
+        """Parse statistics merged into the transfer metadata."""
+        return {
+            "bytes": self.bytes_read,
+            "observations": self.observations_seen,
+            "observations_kept": self._kept,
+            "series_lengths": list(self.series_counts.values()),
+            "series_totals": dict(self.series_counts),  # Series key ("" if flat) -> observations seen
+            "complete": self.complete,
+        }
+
+    # -- retention ---------------------------------------------------------
+
+    def _add_observation(self, series_key: Optional[str], obs_key: str, value: Any) -> None:
+        self.observations_seen += 1
+        self.series_counts[series_key or ""] = self.series_counts.get(series_key or "", 0) + 1
+
+        limit = self.max_observations
+        if limit is not None and self.keep == "first" and self._kept >= limit:
+            return
+        if limit is not None and self.keep == "last":
+            if self._times is None and self.structure is None:
+                self._pending.append((self.observations_seen, series_key, obs_key))
+            elif not self._rank(self.observations_seen, series_key, obs_key):
+                return
+        self._series.setdefault(series_key, {"observations": {}})["observations"][obs_key] = value
+        self._kept += 1
+
+    def _rank(self, arrival: int, series_key: Optional[str], obs_key: str) -> bool:
+        """Rank an observation by period; False if it is older than the `max_observations` kept."""
+        if self._times is None:
+            self._times = _time_index(self.structure) or PeriodIndex(())
+        try:
+            start = self._times.start(int(obs_key.rsplit(":", 1)[-1]))
+        except ValueError:
+            start = UNKNOWN_PERIOD
+        item = (start, arrival, series_key, obs_key)
+        if len(self._heap) < self.max_observations:
+            heapq.heappush(self._heap, item)
+            return True
+        if item < self._heap[0]:
+            return False
+        _, _, old_series, old_obs = heapq.heapreplace(self._heap, item)
+        self._discard(old_series, old_obs)
+        return True
+
+    def _discard(self, series_key: Optional[str], obs_key: str) -> None:
+        observations = self._series[series_key]["observations"]
+        del observations[obs_key]
+        if not observations:
+            del self._series[series_key]
+        self._kept -= 1
+
+    def _rank_pending(self) -> None:
+        """Rank observations that arrived before the structure (or all, if it never came)."""
+        pending, self._pending = self._pending, []
+        for arrival, series_key, obs_key in pending:
+            if not self._rank(arrival, series_key, obs_key):
+                self._discard(series_key, obs_key)
+
+    # -- ijson events ------------------------------------------------------
+
+    def _event(self, prefix: str, event: str, value: Any) -> None:
+        if self._builder is not None:
+            self._structure_event(event, value)
+        elif self._obs_key is not None:
+            self._observation_event(event, value)
+        elif event == "map_key":
+            # The next value is an observation if this map is an `observations` map
+            if prefix.endswith("observations") and self._data_set_index == 0:
+                series_key = self._observation_parents.get(prefix, _NOT_OBSERVATIONS)
+                if series_key is _NOT_OBSERVATIONS:
+                    match = _OBSERVATIONS_RE.match(prefix)
+                    series_key = match.group(1) if match else _NOT_OBSERVATIONS
+                    self._observation_parents[prefix] = series_key
+                if series_key is not _NOT_OBSERVATIONS:
+                    self._obs_series, self._obs_key = series_key, value
+                    self._obs_value, self._depth = None, 0
+        elif event == "start_map" and prefix in _DATA_SET_PREFIXES:
+            self._data_set_index += 1
+        elif prefix in _STRUCTURE_PREFIXES and self.structure is None and event in ("start_map", "start_array"):
+            if not (prefix.endswith("structures") and event == "start_array"):
+                self._builder = ijson.ObjectBuilder()
+                self._depth = 0
+                self._structure_event(event, value)
+
+    def _structure_event(self, event: str, value: Any) -> None:
+        self._builder.event(event, value)
+        if event in ("start_map", "start_array"):
+            self._depth += 1
+        elif event in ("end_map", "end_array"):
+            self._depth -= 1
+            if self._depth == 0:
+                self.structure = self._builder.value
+                self._builder = None
+                self._rank_pending()
+
+    def _observation_event(self, event: str, value: Any) -> None:
+        """Build `[value, attribute, ...]`; nested attribute values become None."""
+        if event in ("start_array", "start_map"):
+            self._depth += 1
+            if self._depth == 1:
+                self._obs_value = [] if event == "start_array" else [None]
+            elif self._depth == 2:
+                self._obs_value.append(None)
+            return
+        if event in ("end_array", "end_map"):
+            self._depth -= 1
+        elif event == "map_key":
+            return
+        elif self._depth == 0:
+            self._obs_value = [value]
+        elif self._depth == 1:
+            self._obs_value.append(value)
+
+        if self._depth == 0:
+            series_key, obs_key, obs_value = self._obs_series, self._obs_key, self._obs_value
+            self._obs_key = None
+            self._add_observation(series_key, obs_key, obs_value)
+
+    # -- fallback without ijson ----------------------------------------------
+
+    def _walk(self, data: Dict[str, Any]) -> None:
+        """Feed an already-parsed message through the same retention rules."""
+        container = data.get("data") if isinstance(data.get("data"), dict) else data
+        structure = data.get("structure") or container.get("structures") or container.get("structure")
+        self.structure = structure or None
+        data_sets = container.get("dataSets") or []
+        if not data_sets:
+            return
+        ds = data_sets[0]
+        if "series" in ds:
+            for series_key, series_data in ds["series"].items():
+                for obs_key, obs_val in series_data.get("observations", {}).items():
+                    self._add_observation(series_key, obs_key, obs_val)
+        else:
+            for obs_key, obs_val in ds.get("observations", {}).items():
+                self._add_observation(None, obs_key, obs_val)
@@ -0,0 +1,290 @@
+"""Incremental store of time-series observations per (dataset, key).
+
+Trend questions on one series tend to repeat with overlapping ranges
+("inflation last 5 years", then "inflation this year"). A `SeriesEntry`
+keeps the observations already fetched for a dataset/key together with the
+calendar-day ranges they cover; a new request only fetches the uncovered
+gaps (`gaps`) and is answered from the merged observations (`message`).
+
+Coverage that reaches the present ("open" coverage) stays valid until the
+dataflow's next scheduled release (see `release_calendar`); after that, or
+without a calendar entry, the latest period held is refetched together with
+anything newer. Entries live in the process memory cache and are dropped
+after `SERIES_STORE_TTL` so revisions to older periods are eventually seen.
+"""
+import copy
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from .memory_cache import get_memory_cache
+from .observations import MISSING, parse_observation_table
+from .periods import PeriodIndex, format_end, format_start, period_days, period_index
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        ENABLE_CACHING = True
+        SERIES_STORE_ENABLED = True
+        SERIES_STORE_MAX_OBSERVATIONS = 50000
+        SERIES_STORE_TTL = 7 * 86400
+
+logger = logging.getLogger(__name__)
+
+TIME_DIMENSION = "TIME_PERIOD"
+
+# Day ordinals for unbounded ranges; OPEN means "through whatever is latest"
+EARLIEST = date.min.toordinal()
+OPEN = date.max.toordinal()
+
+Gap = Tuple[int, int]
+
+
+def series_store_enabled() -> bool:
+    return Config.ENABLE_CACHING and Config.SERIES_STORE_ENABLED and get_memory_cache() is not None
+
+
+def request_days(start_period: Optional[str], end_period: Optional[str],
+                 today: Optional[date] = None) -> Gap:
+    """Day range of a request; an end at or after today is open.
+
+    Raises:
+        ValueError: If a period is not in a supported format
+    """
+    start = period_days(start_period)[0] if start_period else EARLIEST
+    end = period_days(end_period)[1] if end_period else OPEN
+    if end >= (today or date.today()).toordinal():
+        end = OPEN
+    return start, end
+
+
+def gap_periods(gap: Gap, start_period: Optional[str] = None,
+                end_period: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """`startPeriod`/`endPeriod` values fetching exactly one gap (None = unbounded).
+
+    Where the gap starts or ends with the request, the request's own period
+    strings are kept.
+    """
+    start, end = gap
+    if start == EARLIEST:
+        gap_start = None
+    elif start_period and period_days(start_period)[0] == start:
+        gap_start = start_period
+    else:
+        gap_start = format_start(date.fromordinal(start))
+    if end == OPEN:
+        gap_end = None
+    elif end_period and period_days(end_period)[1] == end:
+        gap_end = end_period
+    else:
+        gap_end = format_end(date.fromordinal(end))
+    return gap_start, gap_end
+
+
+class SeriesEntry:
+    """Observations held for one dataset/key and the day ranges they cover.
+
+    The state is a plain JSON-able dict, so it can live in the memory cache
+    (and be compressed there when cold).
+    """
+
+    def __init__(self, state: Optional[Dict[str, Any]] = None):
+        self.state = state if state is not None else {
+            "name": None,
+            "dimensions": [],  # Non-time dimensions: {"id", "name", "values": [{"id", "name"}]}
+            "time": None,  # {"id", "name"} of the time dimension
+            "series": {},  # "code.code..." -> {period: value}
+            "coverage": [],  # Sorted, disjoint [first day, last day] ordinals
+            "open_until": None,  # Timestamp until which OPEN coverage is trusted
+            "created": time.time(),
+        }
+
+    @property
+    def coverage(self) -> List[List[int]]:
+        return self.state["coverage"]
+
+    def gaps(self, start: int, end: int, now: Optional[float] = None) -> List[Gap]:
+        """Day ranges within [start, end] that still have to be fetched."""
+        self._expire_open(time.time() if now is None else now)
+        gaps = []
+        cursor = start
+        for first, last in self.coverage:
+            if last < cursor:
+                continue
+            if first > end:
+                break
+            if first > cursor:
+                gaps.append((cursor, first - 1))
+            cursor = max(cursor, last + 1)
+            if cursor > end:
+                break
+        if cursor <= end:
+            gaps.append((cursor, end))
+        return gaps
+
+    def merge(self, data: Dict[str, Any], dimensions: List[Dict[str, Any]], name: Optional[str],
+              gap: Gap, open_until: Optional[float] = None) -> None:
+        """Add the observations fetched for `gap` and mark the gap covered.
+
+        `dimensions` is `SDMXService.parse_dimensions` of the response structure.
+
+        Raises:
+            ValueError: If a time period is not in a supported format
+        """
+        if dimensions:
+            self._merge_observations(data, dimensions, name)
+        self._cover(*gap)
+        if gap[1] == OPEN:
+            self.state["open_until"] = open_until
+
+    def message(self, start: int, end: int, max_observations: Optional[int] = None,
+                keep: str = "last") -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """SDMX-JSON data message for [start, end], plus observation counts.
+
+        Like the streaming parser, at most `max_observations` are included,
+        ranked by period across all series: the latest periods for "last",
+        the earliest for "first" (document order breaks ties). Every series
+        is trimmed to its most recent (or oldest) periods rather than whole
+        series being dropped.
+        """
+        labels, index = self._period_index()
+        rank = {}
+        for i in index.order():
+            if index.starts[i] <= end and index.ends[i] >= start:
+                rank[labels[i]] = len(rank)
+
+        dimensions = self.state["dimensions"]
+        positions = [{v["id"]: i for i, v in enumerate(dim["values"])} for dim in dimensions]
+        index_keys = {}  # Stored "code.code" key -> SDMX-JSON "position:position" key
+        rows = []
+        totals = {}
+        for series_key, observations in self.state["series"].items():
+            periods = sorted((p for p in observations if p in rank), key=rank.__getitem__)
+            if periods:
+                codes = series_key.split(".") if dimensions else []
+                index_keys[series_key] = ":".join(str(positions[d][code]) for d, code in enumerate(codes))
+                totals[index_keys[series_key]] = len(periods)
+                rows.extend((series_key, period) for period in periods)
+        total = len(rows)
+        if max_observations is not None and total > max_observations:
+            ranked = sorted(range(total), key=lambda i: rank[rows[i][1]])
+            chosen = ranked[total - max_observations:] if keep == "last" else ranked[:max_observations]
+            rows = [rows[i] for i in sorted(chosen)]
+        counts = {
+            "observations": total,
+            "observations_kept": len(rows),
+            "series_lengths": list(totals.values()),
+            "series_totals": totals,
+        }
+        if not rows:
+            return {}, counts
+
+        periods = sorted({period for _, period in rows}, key=rank.__getitem__)
+        time_positions = {period: i for i, period in enumerate(periods)}
+
+        series: Dict[str, Dict[str, Any]] = {}
+        for series_key, period in rows:
+            value = self.state["series"][series_key][period]
+            series.setdefault(index_keys[series_key], {"observations": {}})["observations"][
+                str(time_positions[period])
+            ] = [value]
+
+        structure = {
+            "name": self.state["name"],
+            "dimensions": {
+                "series": dimensions,
+                "observation": [dict(self.state["time"], values=[{"id": p, "name": p} for p in periods])],
+            },
+        }
+        return {"data": {"dataSets": [{"series": series}], "structures": [structure]}}, counts
+
+    # -- internals -----------------------------------------------------------
+
+    def _period_index(self) -> Tuple[List[str], PeriodIndex]:
+        """Every period held (in any series) and their ordinals, parsed once per set of periods."""
+        labels = sorted({period for observations in self.state["series"].values() for period in observations})
+        return labels, period_index(labels)
+
+    def _expire_open(self, now: float) -> None:
+        """Once open coverage is stale, refetch from the latest period held onwards."""
+        open_until = self.state["open_until"]
+        if open_until is not None and open_until > now:
+            return
+        if not self.coverage or self.coverage[-1][1] != OPEN:
+            return
+        first = self.coverage[-1][0]
+        latest = max((day for day in self._period_index()[1].starts if day >= first), default=None)
+        if latest is None or latest <= first:
+            self.coverage.pop()
+        else:
+            self.coverage[-1][1] = latest - 1
+        self.state["open_until"] = None
+
+    def _cover(self, start: int, end: int) -> None:
+        merged = []
+        for first, last in sorted(self.coverage + [[start, end]]):
+            if merged and first <= merged[-1][1] + 1:
+                merged[-1][1] = max(merged[-1][1], last)
+            else:
+                merged.append([first, last])
+        self.state["coverage"] = merged
+
+    def _merge_observations(self, data: Dict[str, Any], dimensions: List[Dict[str, Any]],
+                            name: Optional[str]) -> None:
+        time_pos = next(
+            (d for d, dim in enumerate(dimensions) if dim["id"] == TIME_DIMENSION), len(dimensions) - 1
+        )
+        other = [d for d in range(len(dimensions)) if d != time_pos]
+        if not self.state["dimensions"]:
+            self.state["dimensions"] = [
+                {"id": dimensions[d]["id"], "name": dimensions[d]["name"], "values": []} for d in other
+            ]
+            self.state["time"] = {"id": dimensions[time_pos]["id"], "name": dimensions[time_pos]["name"]}
+        self.state["name"] = name or self.state["name"]
+
+        # Codes of this response, added to the stored dimension values on first use
+        stored = self.state["dimensions"]
+        known = [{v["id"] for v in dim["values"]} for dim in stored]
+        table = parse_observation_table(data, dimensions)
+        time_values = dimensions[time_pos]["values"]
+        frequencies = period_index([v["id"] for v in time_values]).frequencies
+        for row in range(len(table)):
+            t = table.codes[time_pos][row]
+            if t == MISSING or t >= len(time_values):
+                continue
+            period = time_values[t]["id"]
+            if frequencies[t] is None:  # Unsupported formats cannot be range-filtered
+                raise ValueError(f"Unsupported time period: {period!r}")
+
+            codes = []
+            for j, d in enumerate(other):
+                idx = table.codes[d][row]
+                values = dimensions[d]["values"]
+                code = values[idx] if idx != MISSING and idx < len(values) else {"id": "", "name": ""}
+                if code["id"] not in known[j]:
+                    known[j].add(code["id"])
+                    stored[j]["values"].append({"id": code["id"], "name": code["name"]})
+                codes.append(code["id"])
+            self.state["series"].setdefault(".".join(codes), {})[period] = table.values[row]
+
+
+def load_series(dataset_id: str, key: str) -> SeriesEntry:
+    """Stored entry for a dataset/key (a new, empty one if none is cached).
+
+    The entry holds a copy of the cached state: concurrent requests for the
+    same key each merge into their own, and only `save_series` publishes one.
+    """
+    memory = get_memory_cache()
+    state = memory.get(("series", dataset_id, key)) if memory is not None else None
+    return SeriesEntry(copy.deepcopy(state))
+
+
+def save_series(dataset_id: str, key: str, entry: SeriesEntry, cost: float) -> None:
+    """Keep an entry in the memory cache; `cost` is the seconds spent fetching it."""
+    memory = get_memory_cache()
+    if memory is not None:
+        expires = entry.state["created"] + Config.SERIES_STORE_TTL
+        memory.set(("series", dataset_id, key), entry.state, cost=cost, expires=expires)
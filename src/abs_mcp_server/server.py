@@ -1,9 +1,33 @@
 """ABS Dataset MCP Server implementation."""
 
+import asyncio
 import logging
-from typing import List, Dict, Any, Optional
+import time
+from typing import List, Dict, Any, Optional, Tuple, Union
 from mcp.server.fastmcp import FastMCP
+from .analytics import METRICS, table_statistics
+from .join import JOIN_TYPES, TRANSFORMS, align_series, coarsest_frequency, points_frequency, table_points, transform_points
+from .observations import ObservationTable
+from .resample import TARGET_FREQUENCIES, downsample_table, resample_table
 from .sdmx_service import SDMXService
+from .async_sdmx_service import AsyncSDMXService
+from .disk_cache import get_disk_cache
+from .memory_cache import get_memory_cache
+from .release_calendar import get_release_calendar
+from .response_cache import get_response_cache
+from .response_shaping import response_budget, response_size, shape_rows
+
+try:
+    from .config import Config
+except ImportError:
+    # Fallback if config not available
+    class Config:
+        BATCH_MAX_ITEMS = 20
+        BATCH_MAX_PARALLEL = 4
+        BATCH_ITEM_TIMEOUT = 30.0
+        OUTPUT_FORMAT = "records"
+        MAX_OBSERVATIONS = 200
+        ANALYTICS_MAX_OBSERVATIONS = 5000
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -12,16 +36,20 @@ logger = logging.getLogger(__name__)
 # Initialize FastMCP server
 mcp = FastMCP("abs-data")
 
+MAX_OBS = Config.MAX_OBSERVATIONS  # Rows parsed per request (e.g. ~16 years of monthly data)
+OUTPUT_FORMATS = ("records", "compact")
+
 @mcp.tool()
-def search_datasets(keyword: str = "", limit: int = 10) -> List[Dict[str, Any]]:
+async def search_datasets(keyword: str = "", limit: int = 10) -> List[Dict[str, Any]]:
     """
     Step 1: Search for ABS datasets by keyword.
     Use this to find the `dataset_id` (e.g. "CPI").
+    Results are ranked by relevance (`score`, higher is better); partial words match.
     """
-    return SDMXService.search_datasets(keyword, limit)
+    return await AsyncSDMXService.search_datasets(keyword, limit)
 
 @mcp.tool()
-def get_dataset_structure(dataset_id: str) -> Dict[str, Any]:
+async def get_dataset_structure(dataset_id: str) -> Dict[str, Any]:
     """
     Step 2: Get the "Grammar" (Dimensions and Codes) for a dataset.
     CRITICAL: You MUST call this before `get_dataset_data`.
@@ -34,7 +62,7 @@ def get_dataset_structure(dataset_id: str) -> Dict[str, Any]:
     try:
         logger.info(f"Getting structure for dataset: {dataset_id}")
         
-        structure = SDMXService.get_structure(dataset_id)
+        structure = await AsyncSDMXService.get_structure(dataset_id)
         dimensions = SDMXService.parse_dimensions(structure)
         
         # Flatten values for display
@@ -57,11 +85,19 @@ def get_dataset_structure(dataset_id: str) -> Dict[str, Any]:
         return {"error": str(e)}
 
 @mcp.tool()
-def get_dataset_data(
+async def get_dataset_data(
     dataset_id: str,
     start_period: Optional[str] = None,
     end_period: Optional[str] = None,
-    filters: Optional[Dict[str, str]] = None
+    filters: Optional[Dict[str, str]] = None,
+    last_n_observations: Optional[int] = None,
+    first_n_observations: Optional[int] = None,
+    output_format: Optional[str] = None,
+    max_response_bytes: Optional[int] = None,
+    max_response_tokens: Optional[int] = None,
+    frequency: Optional[str] = None,
+    aggregation: str = "mean",
+    max_points: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Step 3: Fetch data using the specific codes from `get_dataset_structure`.
@@ -71,36 +107,50 @@ def get_dataset_data(
     2. `filters` values MUST match the Codes (e.g. "1", "M13"), NOT names.
     3. You usually need to provide a filter for EVERY dimension, or result might be too large.
     4. Time Period (YYYY-MM) is handled by `start_period`/`end_period`, NOT `filters`.
+    5. `last_n_observations=N` / `first_n_observations=N` return only the last/first N
+       periods of each series (e.g. "last 12 months" -> `last_n_observations=12`).
+       With no periods or N given, only the latest observations are fetched;
+       pass `last_n_observations=0` for the full history.
+    6. `output_format="compact"` returns `table` instead of `data_sample`: labels that are
+       the same on every row in `constant`, then `columns` and one list per row in `rows`.
+    7. Results are kept within a response budget (`max_response_bytes` / `max_response_tokens`,
+       default `RESPONSE_MAX_BYTES`): larger results come back as a compact table, then as the
+       latest periods of each series, then as a per-series `summary`. `shaping` says what was dropped.
+    8. `frequency="A"` / `"Q"` / `"S"` / `"M"` converts monthly or quarterly data to a coarser
+       frequency, with `aggregation` "mean" (default), "sum", "last", "end" (value closing the
+       period, e.g. December), "min" or "max" (e.g. "annual average CPI" -> frequency="A").
+    9. `max_points=N` keeps at most N points per series, preserving the shape (for charts).
     
     Example:
     `filters={"MEASURE": "3", "REGION": "50", "INDEX": "10001", "FREQ": "M"}`
     """
+    output_format = output_format or Config.OUTPUT_FORMAT
+    if output_format not in OUTPUT_FORMATS:
+        return {"error": f"`output_format` must be one of: {', '.join(OUTPUT_FORMATS)}"}
     try:
         logger.info(f"Getting data for dataset: {dataset_id} with filters: {filters}")
 
         # Step 1: Get structure
-        structure_obj = SDMXService.get_structure(dataset_id)
+        structure_obj = await AsyncSDMXService.get_structure(dataset_id)
         dimensions = SDMXService.parse_dimensions(structure_obj)
         
         # Construct SDMX Key
-        path_key = "all"
-        if filters:
-             key_parts = []
-             for dim in dimensions:
-                 dim_id = dim.get("id")
-                 if dim_id in filters:
-                     key_parts.append(filters[dim_id])
-                 else:
-                     key_parts.append("") # Empty means "all"
-             
-             if any(part for part in key_parts):
-                 path_key = ".".join(key_parts)
-                 # Strip trailing empty parts (dots) which can cause API errors
-                 if path_key.endswith("."):
-                     path_key = path_key.rstrip(".")
-
-        # Step 2: Fetch data
-        data = SDMXService.get_data(dataset_id, path_key, start_period, end_period)
+        path_key = SDMXService.build_key(dimensions, filters)
+
+        # Default "latest" path: let the API drop old history instead of parse-then-slice
+        unbounded = not (start_period or end_period or last_n_observations or first_n_observations)
+        if last_n_observations is None and first_n_observations is None and not (start_period or end_period):
+            last_n_observations = MAX_OBS
+            unbounded = False
+
+        # Step 2: Fetch data, parsing the stream and keeping at most MAX_OBS observations
+        # (more when they are aggregated or downsampled before being returned)
+        keep = "first" if first_n_observations and not last_n_observations else "last"
+        reduced = bool(frequency or max_points)
+        data, meta = await _fetch_data(
+            dataset_id, path_key, start_period, end_period, last_n_observations, first_n_observations,
+            Config.ANALYTICS_MAX_OBSERVATIONS if reduced else MAX_OBS, keep
+        )
         
         if not data:
              return {"error": f"No data found for dataset {dataset_id} with path {path_key}. Check filters."}
@@ -109,31 +159,545 @@ def get_dataset_data(
         response_structure = SDMXService._parse_structure(data)
         response_dims = SDMXService.parse_dimensions(response_structure)
         
-        observations = SDMXService.parse_observations(data, response_dims)
+        table = SDMXService.parse_observation_table(data, response_dims)
 
-        MAX_OBS = 200  # Increased to allow for longer trend analysis (e.g. ~16 years of monthly data)
-        total_obs = len(observations)
-        truncated = False
-        if total_obs > MAX_OBS:
-            # Return the LATEST observations (end of list) as they are most relevant
-            observations = observations[-MAX_OBS:]
-            truncated = True
+        # Observations beyond the limit were dropped while parsing
+        total_obs = meta.get("observations", len(table))
+        truncated = total_obs > len(table)
+
+        # Shrink the rows before anything is serialized
+        reduction = {}
+        if frequency:
+            table, reduction["resampling"] = resample_table(table, frequency.upper(), aggregation)
+        if max_points:
+            table, reduction["downsampling"] = downsample_table(table, max_points)
+
+        if not truncated:
+            note = ""
+        elif keep == "last":
+            note = "Data contains a subset of observations (showing latest)."
+        else:
+            note = "Data contains a subset of observations (showing earliest)."
+        if not meta.get("complete", True):
+            note += " Reading stopped early, so the total is a lower bound."
 
         result = {
             "dataset_id": dataset_id,
             "title": response_structure.get("name", "Unknown Dataset"),
             "truncated": truncated,
             "total_observations_found": total_obs,
-            "data_sample": observations,
-            "note": "Data contains a subset of observations (showing latest)." if truncated else ""
+            "note": note,
+            "transfer": await _transfer_report(
+                dataset_id, path_key, data, meta, last_n_observations, first_n_observations, unbounded
+            )
         }
-        
+
+        result.update(reduction)
+
+        # Fit the rows into the response budget (the rest of the result counts too)
+        rows, shaping = shape_rows(
+            table, output_format, response_budget(max_response_bytes, max_response_tokens),
+            keep, overhead=response_size(result)
+        )
+        if shaping["strategy"] != "full":
+            result["truncated"] = result["truncated"] or shaping["rows_dropped"] > 0
+            result["note"] = (note + " " + _shaping_note(shaping, keep)).strip()
+        result.update(rows)
+        result["shaping"] = shaping
         return result
 
     except Exception as e:
         logger.error(f"Error fetching data: {e}")
         return {"error": str(e)}
 
+@mcp.tool()
+async def get_multi_series_data(
+    dataset_id: str,
+    filters: Optional[Dict[str, Union[str, List[str]]]] = None,
+    filter_sets: Optional[List[Dict[str, str]]] = None,
+    start_period: Optional[str] = None,
+    end_period: Optional[str] = None,
+    last_n_observations: Optional[int] = None,
+    first_n_observations: Optional[int] = None,
+    output_format: Optional[str] = None,
+    max_response_bytes: Optional[int] = None,
+    max_response_tokens: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Fetch several series of ONE dataset at once, for comparisons
+    (e.g. "unemployment NSW vs Victoria"). Same rules as `get_dataset_data`, but:
+    - `filters` values may be lists of codes: one series per combination, e.g.
+      `{"MEASURE": "3", "REGION": ["1", "2"]}` -> one series per region.
+    - Or pass `filter_sets`, a list of complete `filters` dicts.
+    Each requested series comes back separately under `series`, in request order.
+    Prefer this over several `get_dataset_data` calls: it costs one upstream request.
+    The response budget is shared equally between the series.
+    """
+    output_format = output_format or Config.OUTPUT_FORMAT
+    if output_format not in OUTPUT_FORMATS:
+        return {"error": f"`output_format` must be one of: {', '.join(OUTPUT_FORMATS)}"}
+    try:
+        requested = (SDMXService.expand_filters(filters) if filters else []) + list(filter_sets or [])
+        if not requested:
+            return {"error": "Provide `filters` with several codes for a dimension, or `filter_sets`."}
+        logger.info(f"Getting {len(requested)} series for dataset: {dataset_id}")
+
+        structure_obj = await AsyncSDMXService.get_structure(dataset_id)
+        dimensions = SDMXService.parse_dimensions(structure_obj)
+        groups = SDMXService.build_or_keys(dimensions, requested)
+
+        if last_n_observations is None and first_n_observations is None and not (start_period or end_period):
+            last_n_observations = MAX_OBS
+        keep = "first" if first_n_observations and not last_n_observations else "last"
+
+        # One upstream request per OR-key (a single one whenever the sets combine). An
+        # OR-key selects every combination of its codes, so it is budgeted per series it selects
+        responses = await asyncio.gather(*(
+            _fetch_data(
+                dataset_id, key, start_period, end_period, last_n_observations, first_n_observations,
+                MAX_OBS * max(len(members), SDMXService.key_series_count(key)), keep
+            )
+            for key, members in groups
+        ))
+
+        budget = response_budget(max_response_bytes, max_response_tokens)
+        series_budget = budget // len(requested) if budget is not None else None
+        series: List[Optional[Dict[str, Any]]] = [None] * len(requested)
+        title = None
+        for (key, members), (data, meta) in zip(groups, responses):
+            if data:
+                response_structure = SDMXService._parse_structure(data)
+                response_dims = SDMXService.parse_dimensions(response_structure)
+                title = title or response_structure.get("name")
+                table = SDMXService.parse_observation_table(data, response_dims)
+                member_filters = [requested[i] for i in members]
+                parts = SDMXService.split_by_filters(table, response_dims, member_filters)
+                # Totals counted while parsing, before the observation limit
+                found = SDMXService.totals_by_filters(meta.get("series_totals", {}), response_dims, member_filters)
+            else:
+                parts = found = [None] * len(members)
+            for i, part, total in zip(members, parts, found):
+                series[i] = _series_result(requested[i], part, keep, output_format, series_budget, total)
+
+        return {
+            "dataset_id": dataset_id,
+            "title": title or structure_obj.get("name", "Unknown Dataset"),
+            "series": series,
+            "transfer": {
+                "upstream_requests": len(groups),
+                "keys": [key for key, _ in groups],
+                "bytes_transferred": sum(meta.get("bytes", 0) for _, meta in responses),
+                "cache": [meta.get("cache") for _, meta in responses],
+            }
+        }
+
+    except Exception as e:
+        logger.error(f"Error fetching multi-series data: {e}")
+        return {"error": str(e)}
+
+@mcp.tool()
+async def get_series_statistics(
+    dataset_id: str,
+    filters: Optional[Dict[str, Union[str, List[str]]]] = None,
+    start_period: Optional[str] = None,
+    end_period: Optional[str] = None,
+    last_n_observations: Optional[int] = None,
+    metrics: Optional[List[str]] = None,
+    window: Optional[int] = None,
+    rows: int = 12
+) -> Dict[str, Any]:
+    """
+    Trend statistics per series, computed on the server instead of returning raw observations.
+    Use for "change over the last 5 years", "growth rate", "year-on-year", "average", "highest".
+    Same `dataset_id`/`filters`/period arguments as `get_dataset_data` (filter values may be lists).
+    `metrics` (default all): "pop" (change on previous period), "yoy" (change on a year earlier),
+    "rolling" (trailing mean over `window` periods, default one year), "minmax", "cagr"
+    (compound annual growth rate, %). Each series returns first/last values, overall change,
+    the requested figures for the latest period, and a `table` of the last `rows` periods.
+    YoY needs the year before the first period: widen `start_period` to get it for early periods.
+    """
+    metrics = list(metrics or METRICS)
+    unknown = set(metrics) - set(METRICS)
+    if unknown:
+        return {"error": f"Unknown metrics: {', '.join(sorted(unknown))}. Use: {', '.join(METRICS)}"}
+    try:
+        logger.info(f"Getting statistics for dataset: {dataset_id} with filters: {filters}")
+        table, title, total_obs, transfer = await _fetch_table(
+            dataset_id, filters, start_period, end_period, last_n_observations
+        )
+        series = table_statistics(table, metrics, window, rows)
+
+        # Labels shared by every series are given once
+        constant = table.take([0]).to_compact()["constant"] if len(table) else {}
+        for entry in series:
+            for name in entry["series"]:
+                constant.pop(name, None)
+        constant.pop(table.dimension_names[-1], None)
+
+        return {
+            "dataset_id": dataset_id,
+            "title": title,
+            "constant": constant,
+            "series": series,
+            "truncated": total_obs > len(table),
+            "total_observations_found": total_obs,
+            "transfer": transfer
+        }
+
+    except Exception as e:
+        logger.error(f"Error computing statistics: {e}")
+        return {"error": str(e)}
+
+JOIN_ITEM_FIELDS = {"dataset_id", "filters", "label", "aggregation"}
+
+@mcp.tool()
+async def join_series(
+    series: List[Dict[str, Any]],
+    start_period: Optional[str] = None,
+    end_period: Optional[str] = None,
+    last_n_observations: Optional[int] = None,
+    frequency: Optional[str] = None,
+    aggregation: str = "mean",
+    transform: str = "level",
+    how: str = "inner",
+    derived: Optional[List[str]] = None
+) -> Dict[str, Any]:
+    """
+    Compare series from DIFFERENT datasets on one time axis (e.g. "CPI vs wage growth",
+    "exports vs imports"). Each item of `series` is one series:
+    `{"dataset_id": "CPI_M", "filters": {...}, "label": "CPI", "aggregation": "mean"}`
+    with a code for every dimension (`label` and `aggregation` are optional).
+    Series are fetched concurrently, converted to a common `frequency` (default: the
+    coarsest one, e.g. monthly CPI + quarterly WPI -> quarterly) with `aggregation`
+    ("mean", "sum" for flows, "end" for end-of-period levels, ...), and aligned on period.
+    Periods not fully covered by the source data (e.g. a quarter with one month) are left out.
+    - `transform`: "level" (default), "pop_pct" or "yoy_pct" (% change, per series, after conversion)
+    - `how`: "inner" (periods every series has, default) or "outer" (any period, None where missing)
+    - `derived`: extra columns over the labels, e.g. `["Exports - Imports", "CPI / WPI"]`
+    - `last_n_observations=N`: only the latest N aligned periods
+    Returns one compact `table`: `columns` ("period", one per label, derived) and `rows`.
+    """
+    if not series:
+        return {"error": "Provide a list of series, each with a `dataset_id` and `filters`."}
+    if frequency and frequency.upper() not in TARGET_FREQUENCIES:
+        return {"error": f"`frequency` must be one of: {', '.join(TARGET_FREQUENCIES)}"}
+    if transform not in TRANSFORMS:
+        return {"error": f"`transform` must be one of: {', '.join(TRANSFORMS)}"}
+    if how not in JOIN_TYPES:
+        return {"error": f"`how` must be one of: {', '.join(JOIN_TYPES)}"}
+    if len(series) > Config.BATCH_MAX_ITEMS:
+        return {"error": f"At most {Config.BATCH_MAX_ITEMS} series per join."}
+    for item in series:
+        if not isinstance(item, dict) or "dataset_id" not in item:
+            return {"error": "Each series needs a `dataset_id`."}
+        unknown = set(item) - JOIN_ITEM_FIELDS
+        if unknown:
+            return {"error": f"Unknown series arguments: {', '.join(sorted(unknown))}"}
+
+    labels: List[str] = []
+    for item in series:
+        label = str(item.get("label") or item["dataset_id"])
+        while label in labels:
+            label = f"{label} ({labels.count(label) + 1})"
+        labels.append(label)
+
+    semaphore = asyncio.Semaphore(Config.BATCH_MAX_PARALLEL)
+
+    async def fetch(item: Dict[str, Any]):
+        async with semaphore:
+            return await _fetch_table(item["dataset_id"], item.get("filters"), start_period, end_period, None)
+
+    try:
+        logger.info(f"Joining {len(series)} series: {', '.join(labels)}")
+        fetched = await asyncio.gather(*(fetch(item) for item in series), return_exceptions=True)
+        errors = [
+            f"{label}: {outcome}" for label, outcome in zip(labels, fetched) if isinstance(outcome, Exception)
+        ]
+        if errors:
+            return {"error": "Could not fetch every series. " + " ".join(errors)}
+
+        points = []
+        for label, (table, _, _, _) in zip(labels, fetched):
+            series_points = table_points(table)
+            if not series_points:
+                return {"error": f"{label}: no observations in the requested periods."}
+            points.append(series_points)
+        sources = [points_frequency(p) for p in points]
+        target = frequency.upper() if frequency else coarsest_frequency(sources)
+
+        members = []
+        aligned = {}
+        for item, label, source, series_points, (table, title, _, _) in zip(series, labels, sources, points, fetched):
+            member = {
+                "label": label,
+                "dataset_id": item["dataset_id"],
+                "title": title,
+                "filters": item.get("filters") or {},
+                "source_frequency": source,
+            }
+            if source != target:
+                member["aggregation"] = item.get("aggregation") or aggregation
+                table, meta = resample_table(table, target, member["aggregation"])
+                series_points = table_points(table)
+                partial = {entry["period"] for entry in meta["partial"]}
+                series_points = {p: v for p, v in series_points.items() if p not in partial}
+                member["partial_periods_dropped"] = len(partial) + meta.get("partial_not_listed", 0)
+            member["observations"] = sum(1 for v in series_points.values() if v is not None)
+            aligned[label] = transform_points(series_points, transform)
+            members.append(member)
+
+        joined = align_series(aligned, how, derived or [])
+        limit = min(last_n_observations or MAX_OBS, MAX_OBS)
+        rows = joined["rows"][-limit:]
+        return {
+            "frequency": target,
+            "transform": transform,
+            "how": how,
+            "series": members,
+            "table": {"columns": joined["columns"], "rows": rows},
+            "truncated": len(rows) < len(joined["rows"]),
+            "unmatched_periods": joined["unmatched"],
+            "transfer": {
+                "upstream_requests": len(fetched),
+                "bytes_transferred": sum(transfer["bytes_transferred"] for _, _, _, transfer in fetched),
+                "cache": [transfer["cache"] for _, _, _, transfer in fetched],
+            }
+        }
+
+    except Exception as e:
+        logger.error(f"Error joining series: {e}")
+        return {"error": str(e)}
+
+BATCH_ITEM_FIELDS = {
+    "dataset_id", "filters", "start_period", "end_period", "last_n_observations", "first_n_observations",
+    "output_format", "max_response_bytes", "max_response_tokens", "frequency", "aggregation", "max_points"
+}
+
+@mcp.tool()
+async def batch_get_dataset_data(
+    requests: List[Dict[str, Any]],
+    timeout_seconds: Optional[float] = None
+) -> Dict[str, Any]:
+    """
+    Run several `get_dataset_data` requests at once, e.g. CPI and WPI, or exports and imports.
+    Each item takes the same arguments as `get_dataset_data`:
+    `{"dataset_id": "CPI_M", "filters": {...}, "start_period": "2024-01", ...}`.
+    Items run concurrently. Results come back in request order, each with `ok` and
+    either `result` or `error`. One failing or slow item does not fail the others.
+    For several series of the SAME dataset, prefer `get_multi_series_data`.
+    Items without their own `max_response_bytes`/`max_response_tokens` share the response budget equally.
+    """
+    if not requests:
+        return {"error": "Provide a list of get_dataset_data requests."}
+    if len(requests) > Config.BATCH_MAX_ITEMS:
+        return {"error": f"At most {Config.BATCH_MAX_ITEMS} requests per batch."}
+
+    timeout = timeout_seconds or Config.BATCH_ITEM_TIMEOUT
+    budget = response_budget()
+    item_budget = max(1, budget // len(requests)) if budget is not None else None
+    semaphore = asyncio.Semaphore(Config.BATCH_MAX_PARALLEL)
+    started = time.perf_counter()
+
+    async def run(index: int, item: Dict[str, Any]) -> Dict[str, Any]:
+        item_started = time.perf_counter()
+        if not isinstance(item, dict):
+            item = {}
+        outcome: Dict[str, Any] = {"index": index, "dataset_id": item.get("dataset_id")}
+        unknown = set(item) - BATCH_ITEM_FIELDS
+        if "dataset_id" not in item:
+            outcome.update(ok=False, error="Each request needs a `dataset_id`.")
+        elif unknown:
+            outcome.update(ok=False, error=f"Unknown arguments: {', '.join(sorted(unknown))}")
+        else:
+            if item_budget is not None and not {"max_response_bytes", "max_response_tokens"} & set(item):
+                item = {**item, "max_response_bytes": item_budget}
+            async with semaphore:
+                try:
+                    result = await asyncio.wait_for(get_dataset_data(**item), timeout)
+                except asyncio.TimeoutError:
+                    outcome.update(ok=False, error=f"Timed out after {timeout:g}s")
+                else:
+                    if "error" in result:
+                        outcome.update(ok=False, error=result["error"])
+                    else:
+                        outcome.update(ok=True, result=result)
+        outcome["elapsed_ms"] = round((time.perf_counter() - item_started) * 1000, 1)
+        return outcome
+
+    results = await asyncio.gather(*(run(i, item) for i, item in enumerate(requests)))
+    return {
+        "results": results,
+        "succeeded": sum(1 for r in results if r["ok"]),
+        "failed": sum(1 for r in results if not r["ok"]),
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+
+def _shaping_note(shaping: Dict[str, Any], keep: str) -> str:
+    """Human-readable account of how rows were fitted into the response budget."""
+    budget = f"the {shaping['budget_bytes']:,}-byte response budget"
+    if shaping["strategy"] == "compact":
+        return f"Rows returned as a compact table to fit {budget}."
+    if shaping["strategy"] == "series_tail":
+        which = "latest" if keep == "last" else "earliest"
+        return (f"To fit {budget}, only the {which} {shaping['periods_per_series']} periods of each series "
+                f"are shown ({shaping['rows_dropped']} rows dropped, see `shaping`).")
+    return f"Too large for {budget}: a per-series `summary` is returned instead of rows."
+
+def _series_result(filters: Dict[str, str], table, keep: str, output_format: str = "records",
+                   budget: Optional[int] = None, found: Optional[int] = None) -> Dict[str, Any]:
+    """One requested series of a multi-series response, limited to MAX_OBS observations and `budget` bytes.
+
+    `found` is the series' observation count before any limit (default: the rows in `table`).
+    """
+    if table is None or not len(table):
+        return {"filters": filters, "error": "No data found for these filters."}
+    total = max(found or 0, len(table))
+    if len(table) > MAX_OBS:
+        table = table[-MAX_OBS:] if keep == "last" else table[:MAX_OBS]
+    result = {
+        "filters": filters,
+        "truncated": total > len(table),
+        "total_observations_found": total,
+    }
+    rows, shaping = shape_rows(table, output_format, budget, keep, overhead=response_size(result))
+    result.update(rows)
+    if shaping["strategy"] != "full":
+        result["truncated"] = result["truncated"] or shaping["rows_dropped"] > 0
+        result["shaping"] = shaping
+    return result
+
+async def _fetch_data(
+    dataset_id: str,
+    path_key: str,
+    start_period: Optional[str],
+    end_period: Optional[str],
+    last_n: Optional[int],
+    first_n: Optional[int],
+    max_observations: int,
+    keep: str
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Streamed data fetch keeping at most `max_observations`.
+
+    Period ranges go through the series store, which only fetches periods it lacks.
+    """
+    if (start_period or end_period) and not (last_n or first_n):
+        return await AsyncSDMXService.get_series_data(
+            dataset_id, path_key, start_period, end_period, max_observations=max_observations, keep=keep
+        )
+    return await AsyncSDMXService.stream_data_with_meta(
+        dataset_id, path_key, start_period, end_period,
+        last_n or None, first_n or None,
+        max_observations=max_observations, keep=keep
+    )
+
+async def _fetch_table(
+    dataset_id: str,
+    filters: Optional[Dict[str, Union[str, List[str]]]],
+    start_period: Optional[str],
+    end_period: Optional[str],
+    last_n_observations: Optional[int]
+) -> Tuple[ObservationTable, str, int, Dict[str, Any]]:
+    """Parsed table of a request the server computes on, reading up to ANALYTICS_MAX_OBSERVATIONS rows.
+
+    `filters` values may be lists of codes. Without periods or N, the latest
+    MAX_OBS observations of each series are fetched.
+
+    Returns:
+        (table, dataset title, total observations found, transfer report)
+
+    Raises:
+        LookupError: If no data is found
+    """
+    structure_obj = await AsyncSDMXService.get_structure(dataset_id)
+    dimensions = SDMXService.parse_dimensions(structure_obj)
+    codes = {k: "+".join(v) if isinstance(v, list) else v for k, v in (filters or {}).items()}
+    path_key = SDMXService.build_key(dimensions, codes)
+
+    unbounded = not (start_period or end_period or last_n_observations)
+    if last_n_observations is None and not (start_period or end_period):
+        last_n_observations = MAX_OBS
+        unbounded = False
+    data, meta = await _fetch_data(
+        dataset_id, path_key, start_period, end_period,
+        last_n_observations, None, Config.ANALYTICS_MAX_OBSERVATIONS, "last"
+    )
+    if not data:
+        raise LookupError(f"No data found for dataset {dataset_id} with path {path_key}. Check filters.")
+
+    response_structure = SDMXService._parse_structure(data)
+    response_dims = SDMXService.parse_dimensions(response_structure)
+    table = SDMXService.parse_observation_table(data, response_dims)
+    return (
+        table,
+        response_structure.get("name", "Unknown Dataset"),
+        meta.get("observations", len(table)),
+        await _transfer_report(dataset_id, path_key, data, meta, last_n_observations, None, unbounded)
+    )
+
+async def _transfer_report(
+    dataset_id: str,
+    path_key: str,
+    data: Dict[str, Any],
+    meta: Dict[str, Any],
+    last_n: Optional[int],
+    first_n: Optional[int],
+    unbounded: bool
+) -> Dict[str, Any]:
+    """Bytes transferred for a data call and, when known, bytes saved by lastN/firstN.
+
+    The full-history size of a key is only known once it has been fetched
+    unbounded; it is remembered in the disk cache for later comparisons
+    (read and written in a worker thread, off the event loop).
+    """
+    limit = last_n or first_n
+    report = {
+        "bytes_transferred": meta.get("bytes", 0),
+        "last_n_observations": last_n or None,
+        "first_n_observations": first_n or None,
+        # A series reached the limit, so older/newer history was left upstream
+        "upstream_truncated": bool(limit) and any(
+            n >= limit for n in meta.get("series_lengths", SDMXService.series_lengths(data))
+        ),
+        "bytes_saved": None,
+        "cache": meta.get("cache"),
+    }
+
+    cache = get_disk_cache()
+    if cache is not None and meta.get("complete", True):
+        size_key = f"{dataset_id}/{path_key}"
+        if unbounded:
+            await asyncio.to_thread(
+                cache.set, "data_size", size_key, meta.get("body_bytes", report["bytes_transferred"])
+            )
+        elif limit:
+            full_bytes = await asyncio.to_thread(cache.get, "data_size", size_key)
+            if full_bytes is not None:
+                # Both sides decoded: wire bytes may be compressed, the stored size is not
+                report["bytes_saved"] = max(full_bytes - meta.get("body_bytes", report["bytes_transferred"]), 0)
+    return report
+
+@mcp.tool()
+async def get_service_stats() -> Dict[str, Any]:
+    """
+    Diagnostics only: HTTP connection pool statistics (connections opened vs
+    reused), coalesced duplicate requests, memory cache residency and
+    evictions, ETag revalidation counts, the release calendar and persistent
+    cache usage. Not needed to answer data
+    questions.
+    """
+    disk_cache = get_disk_cache()
+    memory_cache = get_memory_cache()
+    response_cache = get_response_cache()
+    release_calendar = get_release_calendar()
+    return {
+        "http_pool": AsyncSDMXService.pool_stats(),
+        "coalescing": AsyncSDMXService.coalescing_stats(),
+        "memory_cache": memory_cache.stats() if memory_cache else None,
+        "response_cache": response_cache.stats() if response_cache else None,
+        "release_calendar": release_calendar.stats() if release_calendar else None,
+        "disk_cache": await asyncio.to_thread(disk_cache.stats) if disk_cache else None,
+    }
+
 def main() -> None:
     """Run the MCP server."""
     logger.info("Starting ABS Dataset MCP Server")
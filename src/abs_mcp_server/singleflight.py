@@ -0,0 +1,96 @@
+"""Coalescing of identical concurrent upstream calls ("single-flight").
+
+Caches only help once the first call has returned; until then every
+concurrent caller asking for the same structure or data key would hit the
+ABS API separately. A single-flight group keeps a table of in-flight calls
+by key: the first caller runs the call, later callers with the same key
+wait for it and share its result (or exception).
+
+`SingleFlight` is for threads (the synchronous `SDMXService`);
+`AsyncSingleFlight` is for coroutines on an event loop (`AsyncSDMXService`).
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+
+class _Call:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException = None
+
+
+class SingleFlight:
+    """Thread-safe in-flight call table."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.calls = 0
+        self.coalesced = 0
+
+    def do(self, key: Hashable, fn: Callable[..., Any], *args: Any) -> Any:
+        """Run `fn(*args)`, or wait for an identical in-flight call and share its result."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self.calls += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": len(self._calls)}
+
+
+class AsyncSingleFlight:
+    """In-flight call table for coroutines, one per event loop.
+
+    The shared call runs as its own task, so a caller that is cancelled
+    does not cancel the fetch for the others.
+    """
+
+    def __init__(self):
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[Hashable, asyncio.Task]]" = \
+            weakref.WeakKeyDictionary()
+        self.calls = 0
+        self.coalesced = 0
+
+    async def do(self, key: Hashable, fn: Callable[..., Awaitable[Any]], *args: Any) -> Any:
+        """Await `fn(*args)`, or an identical in-flight call, and return its result."""
+        loop = asyncio.get_running_loop()
+        tasks = self._tasks.setdefault(loop, {})
+        task = tasks.get(key)
+        if task is None:
+            self.calls += 1
+            task = tasks[key] = loop.create_task(fn(*args))
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, int]:
+        in_flight = sum(len(tasks) for tasks in list(self._tasks.values()))
+        return {"calls": self.calls, "coalesced": self.coalesced, "in_flight": in_flight}
@@ -1,6 +1,7 @@
 import streamlit as st
 import asyncio
 import os
+import threading
 from dotenv import load_dotenv
 from mcp_agent import MCPAgent
 
@@ -13,6 +14,14 @@ st.set_page_config(
     layout="centered"
 )
 
+@st.cache_resource
+def get_event_loop():
+    """Background event loop that outlives reruns, so the agent's MCP server
+    session (bound to this loop) is reused across queries."""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
 # Initialize session state
 if "messages" not in st.session_state:
     st.session_state.messages = []
@@ -202,7 +211,9 @@ if st.session_state.processing and len(st.session_state.messages) > 0:
                     timeout=30.0
                 )
             
-            response, logs = asyncio.run(run_with_timeout())
+            response, logs = asyncio.run_coroutine_threadsafe(
+                run_with_timeout(), get_event_loop()
+            ).result()
             
             if not response:
                 response = "⚠️ I couldn't generate a response. Please try rephrasing your question."
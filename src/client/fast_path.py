@@ -0,0 +1,246 @@
+"""
+Deterministic fast path for topic-mapped questions.
+
+Questions such as "current inflation" or "population of Perth in 2023" map
+straight onto a `TOPIC_TO_DATASET` entry: the dataset, default dimension
+codes, the region code and the period range all follow from the text. For
+those, `plan_query` builds the tool calls without asking Gemini, and
+`execute_plan` runs them against the MCP server (structure and data in
+parallel unless a region code still has to be placed). The agent then
+needs a single LLM call to phrase the answer.
+
+Anything the planner cannot pin down (several datasets, comparisons,
+unmapped dimensions, invalid codes, empty results) returns None, and the
+agent falls back to the normal tool-calling loop.
+"""
+import asyncio
+import math
+import re
+import sys
+from dataclasses import dataclass, field
+from datetime import date
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# Add src/client to path for imports
+sys.path.insert(0, str(Path(__file__).parent))
+import topic_mapping
+
+# call_tool(name, arguments) -> parsed JSON result of the tool
+ToolCaller = Callable[[str, Dict[str, Any]], Awaitable[Any]]
+
+TIME_DIMENSION = "TIME_PERIOD"
+PERIODS_PER_YEAR = {"A": 1, "S": 2, "Q": 4, "M": 12}
+UNIT_PER_YEAR = {"year": 1, "quarter": 4, "month": 12}
+
+# Questions the fixed structure -> data plan cannot answer faithfully
+_UNPLANNED = re.compile(
+    r"\b(compare|comparison|versus|vs|breakdown|each|every|which|rank|ranking|highest|lowest|"
+    r"why|forecast|predict|trend|trends|history|historical|decade|over time|by state|by region|by age|by sex)\b"
+)
+_LAST_N = re.compile(r"\b(?:last|past|previous)\s+(\d{1,3})\s+(month|quarter|year)s?\b")
+_RANGE = re.compile(r"\b(?:from|between)\s+((?:19|20)\d{2})\s+(?:to|and|until|-)\s+((?:19|20)\d{2})\b")
+_SINCE = re.compile(r"\bsince\s+((?:19|20)\d{2})\b")
+_YEAR = re.compile(r"\b((?:19|20)\d{2})\b")
+_REGION_DIMENSION = re.compile(r"REGION|ASGS|STATE|GCCSA")
+
+
+@dataclass
+class FastPathPlan:
+    """Tool calls that answer a topic-mapped question."""
+    topic: str
+    dataset_id: str
+    filters: Dict[str, str]
+    regions: List[str] = field(default_factory=list)  # Region codes asked for, in question order
+    region_dimension: Optional[str] = None  # Known up front when a default dimension holds a region code
+    start_period: Optional[str] = None
+    end_period: Optional[str] = None
+    last_n_observations: Optional[int] = None
+
+    def period_arguments(self) -> Dict[str, Any]:
+        args = {
+            "start_period": self.start_period,
+            "end_period": self.end_period,
+            "last_n_observations": self.last_n_observations,
+        }
+        return {k: v for k, v in args.items() if v is not None}
+
+
+def _match_topic(query_lower: str, topics: Dict[str, Dict[str, Any]]) -> Optional[Tuple[str, Dict[str, Any]]]:
+    """The mapped topic of a question; None if it mentions several datasets.
+
+    Among topics of the same dataset the longest match wins, so
+    "unemployment" is not read as "employment".
+    """
+    matches = [(topic, info) for topic, info in topics.items() if topic in query_lower]
+    if not matches or len({info["dataset_id"] for _, info in matches}) > 1:
+        return None
+    return max(matches, key=lambda match: len(match[0]))
+
+
+def _periods(query_lower: str, freq: Optional[str],
+             today: date) -> Optional[Tuple[Optional[str], Optional[str], Optional[int]]]:
+    """(start_period, end_period, last_n_observations) for a question; None if ambiguous."""
+    last_n = _LAST_N.search(query_lower)
+    if last_n:
+        per_year = PERIODS_PER_YEAR.get(freq or "")
+        if not per_year:
+            return None
+        count = int(last_n.group(1)) * per_year / UNIT_PER_YEAR[last_n.group(2)]
+        return None, None, max(1, math.ceil(count))
+
+    range_match = _RANGE.search(query_lower)
+    if range_match:
+        first, last = sorted(range_match.groups())
+        return first, last, None
+    since = _SINCE.search(query_lower)
+    if since:
+        return since.group(1), None, None
+    if "this year" in query_lower:
+        return str(today.year), None, None
+    if "last year" in query_lower:
+        return str(today.year - 1), str(today.year - 1), None
+
+    years = set(_YEAR.findall(query_lower))
+    if len(years) > 1:
+        return None
+    if years:
+        year = years.pop()
+        return year, year, None
+    return None, None, None  # Latest available data
+
+
+def plan_query(query: str, today: Optional[date] = None,
+               topics: Optional[Dict[str, Dict[str, Any]]] = None) -> Optional[FastPathPlan]:
+    """Fast-path plan for a question, or None if it needs the LLM to plan."""
+    query_lower = " ".join(query.lower().split())
+    if _UNPLANNED.search(query_lower):
+        return None
+    match = _match_topic(query_lower, topics if topics is not None else topic_mapping.TOPIC_TO_DATASET)
+    if match is None:
+        return None
+    topic, info = match
+    filters = dict(info.get("common_dimensions", {}))
+    if not filters:
+        return None
+
+    periods = _periods(query_lower, filters.get("FREQ"), today or date.today())
+    if periods is None:
+        return None
+
+    regional_codes = info.get("regional_codes", {})
+    mentioned = sorted(
+        (found.start(), code) for name, code in regional_codes.items()
+        for found in [re.search(rf"\b{re.escape(name)}\b", query_lower)] if found
+    )
+    regions = list(dict.fromkeys(code for _, code in mentioned))
+    # A regional default dimension already holding a region code is where requested regions go
+    defaults = [
+        dim for dim, code in filters.items()
+        if _REGION_DIMENSION.search(dim) and code in regional_codes.values()
+    ]
+    region_dimension = defaults[0] if regions and len(defaults) == 1 else None
+
+    return FastPathPlan(
+        topic=topic,
+        dataset_id=info["dataset_id"],
+        filters=filters,
+        regions=regions,
+        region_dimension=region_dimension,
+        start_period=periods[0],
+        end_period=periods[1],
+        last_n_observations=periods[2],
+    )
+
+
+def _complete_filters(plan: FastPathPlan, dimensions: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Filters naming a valid code for every dimension (region codes as a list); None otherwise."""
+    dims = {d["id"]: d["values"] for d in dimensions if d["id"] != TIME_DIMENSION}
+    filters: Dict[str, Any] = dict(plan.filters)
+    if plan.regions:
+        region_dim = plan.region_dimension
+        if region_dim is None:
+            # The one unfiltered dimension that has all the requested codes
+            candidates = [
+                dim for dim, values in dims.items()
+                if dim not in filters and all(code in values for code in plan.regions)
+            ]
+            if len(candidates) != 1:
+                return None
+            region_dim = candidates[0]
+        filters[region_dim] = plan.regions if len(plan.regions) > 1 else plan.regions[0]
+
+    if set(filters) != set(dims):
+        return None
+    for dim, codes in filters.items():
+        if any(code not in dims[dim] for code in (codes if isinstance(codes, list) else [codes])):
+            return None
+    return filters
+
+
+def _has_rows(result: Dict[str, Any]) -> bool:
+    """Rows in any output format (`data_sample` records, a compact `table` or a budget `summary`)."""
+    return bool(result.get("data_sample") or result.get("table", {}).get("rows") or result.get("summary"))
+
+
+def _has_data(result: Any) -> bool:
+    if not isinstance(result, dict) or "error" in result:
+        return False
+    if "series" in result:
+        return bool(result["series"]) and all("error" not in s and _has_rows(s) for s in result["series"])
+    return _has_rows(result)
+
+
+def _data_call(plan: FastPathPlan, filters: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+    tool = "get_multi_series_data" if any(isinstance(v, list) for v in filters.values()) else "get_dataset_data"
+    return tool, {"dataset_id": plan.dataset_id, "filters": filters, **plan.period_arguments()}
+
+
+async def execute_plan(plan: FastPathPlan, call_tool: ToolCaller,
+                       known_dimensions: Optional[List[Dict[str, Any]]] = None) -> Optional[Dict[str, Any]]:
+    """Run a plan; returns the calls made and the data, or None to fall back.
+
+    With `known_dimensions` (from an earlier structure call) only the data
+    call is made. Without, structure and data are fetched in parallel when
+    the filters cannot depend on the structure (no region to place), and
+    the data is kept only if the structure confirms every code.
+
+    Returns:
+        {"dimensions": [...], "calls": [{"name", "args"}], "result": data tool result}
+    """
+    calls = []
+    dimensions = known_dimensions
+    if dimensions is None and plan.regions and plan.region_dimension is None:
+        structure = await call_tool("get_dataset_structure", {"dataset_id": plan.dataset_id})
+        calls.append({"name": "get_dataset_structure", "args": {"dataset_id": plan.dataset_id}})
+        if not isinstance(structure, dict) or "error" in structure:
+            return None
+        dimensions = structure["dimensions"]
+
+    if dimensions is not None:
+        filters = _complete_filters(plan, dimensions)
+        if filters is None:
+            return None
+        name, args = _data_call(plan, filters)
+        result = await call_tool(name, args)
+    else:
+        # Region placement (if any) is known up front, so the data call need not wait
+        optimistic = dict(plan.filters)
+        if plan.regions:
+            optimistic[plan.region_dimension] = plan.regions if len(plan.regions) > 1 else plan.regions[0]
+        name, args = _data_call(plan, optimistic)
+        structure, result = await asyncio.gather(
+            call_tool("get_dataset_structure", {"dataset_id": plan.dataset_id}),
+            call_tool(name, args),
+        )
+        calls.append({"name": "get_dataset_structure", "args": {"dataset_id": plan.dataset_id}})
+        if not isinstance(structure, dict) or "error" in structure:
+            return None
+        dimensions = structure["dimensions"]
+        if _complete_filters(plan, dimensions) != optimistic:
+            return None
+
+    calls.append({"name": name, "args": args})
+    if not _has_data(result):
+        return None
+    return {"dimensions": dimensions, "calls": calls, "result": result}
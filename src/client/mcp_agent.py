@@ -2,20 +2,26 @@ import os
 import sys
 import json
 import asyncio
+import time
 from typing import List, Dict, Any, Optional
 from pathlib import Path
-from mcp.client.stdio import stdio_client, StdioServerParameters
-from mcp.client.session import ClientSession
+from mcp.client.stdio import StdioServerParameters
 from google import genai
 from google.genai import types
 
 # Add src/client to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 import topic_mapping
+import fast_path
+from prefetch import SpeculativePrefetcher
+from server_connection import MCPServerConnection
 TOPIC_TO_DATASET = topic_mapping.TOPIC_TO_DATASET
 
 # Configuration
 MAX_TURNS = int(os.getenv("MAX_TURNS", "10"))  # Max LLM invocations per query
+MAX_PARALLEL_TOOL_CALLS = int(os.getenv("MAX_PARALLEL_TOOL_CALLS", "4"))  # Tool calls of one turn run at once
+FAST_PATH_ENABLED = os.getenv("FAST_PATH_ENABLED", "true").lower() == "true"  # Plan topic-mapped questions without Gemini
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() == "true"  # Speculative tool calls during the first turn
 
 class MCPAgent:
     def __init__(self, api_key: str):
@@ -49,6 +55,14 @@ CRITICAL WORKFLOW - ALWAYS FOLLOW THIS ORDER:
 2. Use get_dataset_structure FIRST to see all valid dimension codes
 3. Construct filters using ONLY the codes from step 2
 4. Use get_dataset_data with proper filters
+5. To compare several regions/series of ONE dataset, use get_multi_series_data with a list of codes
+   (e.g. filters={{"REGION": ["1", "2"], ...}}) instead of several get_dataset_data calls
+6. To fetch data from several DIFFERENT datasets (e.g. CPI and WPI), use batch_get_dataset_data
+   with one get_dataset_data argument dict per dataset
+7. For trends, growth rates, year-on-year change, averages or highs/lows, use get_series_statistics
+   (same filters as get_dataset_data) instead of fetching raw observations and calculating yourself
+8. To compare series of DIFFERENT datasets over time (e.g. CPI vs wage growth, exports vs imports), use join_series:
+   one aligned table at a common frequency, with derived=["A - B"] or ["A / B"] columns and transform="yoy_pct" for growth
 
 {kb_str}
 
@@ -58,7 +72,9 @@ TEMPORAL HANDLING (CRITICAL):
 - **"This year"**: Set start_period="{current_year}-01", end_period="{current_month}"
 - **"Last year"**: Set start_period="{current_year-1}-01", end_period="{current_year-1}-12"
 - **Specific years** (e.g., "2023"): Set start_period="2023-01", end_period="2023-12"
-- **"Last 12 months"**: Calculate from current month backwards
+- **"Last 12 months"** / **"last N quarters"**: Set last_n_observations=N and NO start/end (only those periods are downloaded)
+- **Annual / quarterly figures from monthly data** (e.g. "annual average CPI since 2010"): pass frequency="A" (or "Q")
+  with aggregation="mean" (or "sum" for flows, "end" for end-of-period levels) instead of fetching every month
 
 SDMX RULES FROM ABS DOCUMENTATION:
 - All dimensions usually required (use defaults above or search if unknown)
@@ -92,6 +108,41 @@ ANSWER FORMAT:
         self.server_script = os.path.abspath(self.server_script)
         self.root_dir = os.path.abspath(os.path.join(current_dir, "..", ".."))
 
+        # One server process/session reused across queries
+        self.connection = MCPServerConnection(self._server_params())
+        # Dimensions seen by the fast path, per dataset (lets it skip the structure call)
+        self._known_dimensions: Dict[str, List[Dict[str, Any]]] = {}
+        # Speculative prefetch totals across queries
+        self.prefetch_stats = {"started": 0, "hits": 0, "hit_rate": None}
+
+    def _server_params(self) -> StdioServerParameters:
+        """Parameters for spawning the MCP server subprocess."""
+        # Try to locate .venv python
+        venv_python = os.path.join(self.root_dir, ".venv", "bin", "python")
+        if os.path.exists(venv_python):
+            server_python = venv_python
+            # log it for debugging
+            self._log_event("server_startup", {"executable_used": "venv", "path": venv_python})
+        else:
+            server_python = sys.executable
+            self._log_event("server_startup", {"executable_used": "sys.executable", "path": server_python})
+
+        return StdioServerParameters(
+            command=server_python, 
+            args=["-m", "abs_mcp_server.server"],
+            # Compact tables (constant labels factored out) keep tool results small in the prompt
+            env={
+                **os.environ.copy(),
+                "OUTPUT_FORMAT": os.getenv("OUTPUT_FORMAT", "compact"),
+                "PYTHONPATH": os.path.join(self.root_dir, "src")
+            },
+            cwd=self.root_dir
+        )
+
+    async def close(self):
+        """Shut down the MCP server process."""
+        await self.connection.close()
+
     def _log_event(self, event_type: str, data: Any):
         """Logs events to a JSONL file for debugging."""
         import datetime
@@ -108,6 +159,95 @@ ANSWER FORMAT:
             print(f"Failed to write log: {e}")
 
 
+    async def _run_tool_call(self, fc: Any, semaphore: asyncio.Semaphore,
+                             prefetcher: Optional[SpeculativePrefetcher] = None):
+        """Call one MCP tool, returning (content text, error message or None, seconds).
+
+        A successful prefetched result of the same call is served instead.
+        """
+        if prefetcher is not None:
+            served = await prefetcher.take(fc.name, fc.args)
+            if served is not None:
+                self._log_event("prefetch_hit", {"name": fc.name, "args": fc.args, "seconds": served[2]})
+                return served
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                result = await self.connection.call_tool(fc.name, arguments=fc.args)
+            except Exception as e:
+                return "", str(e), round(time.perf_counter() - start, 3)
+
+        content_text = ""
+        if isinstance(result.content, list):
+            for c in result.content:
+                if hasattr(c, 'text'):
+                    content_text += c.text
+                else:
+                    content_text += str(c)
+        else:
+            content_text = str(result.content)
+        return content_text, None, round(time.perf_counter() - start, 3)
+
+    async def _call_tool_json(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call one MCP tool and parse its JSON result ({"error": ...} on failure)."""
+        fc = types.FunctionCall(name=name, args=arguments)
+        content_text, error, seconds = await self._run_tool_call(fc, asyncio.Semaphore(1))
+        self._log_event("fast_path_tool_call", {"name": name, "args": arguments, "seconds": seconds, "error": error})
+        if error is not None:
+            return {"error": error}
+        try:
+            return json.loads(content_text)
+        except ValueError:
+            return {"error": content_text}
+
+    def _start_prefetch(self, user_query: str, semaphore: asyncio.Semaphore) -> Optional[SpeculativePrefetcher]:
+        """Start the calls the model will most likely make first for a topic-mapped question.
+
+        The calls take permits from `semaphore`, the query's tool-call limit.
+        """
+        guess = topic_mapping.get_dataset_for_topic(user_query)
+        if guess is None:
+            return None
+        dataset_id = guess[0]
+        prefetcher = SpeculativePrefetcher(
+            lambda name, args: self._run_tool_call(types.FunctionCall(name=name, args=args), semaphore)
+        )
+        prefetcher.start("get_dataset_structure", {"dataset_id": dataset_id})
+        # The data call is only guessable when the default dimensions are the whole answer
+        plan = fast_path.plan_query(user_query)
+        if plan is not None and plan.dataset_id == dataset_id and not plan.regions:
+            prefetcher.start("get_dataset_data", {
+                "dataset_id": dataset_id, "filters": plan.filters, **plan.period_arguments()
+            })
+        self._log_event("prefetch_start", {"dataset_id": dataset_id, "started": prefetcher.started})
+        return prefetcher
+
+    def _finish_prefetch(self, prefetcher: SpeculativePrefetcher) -> None:
+        """Discard unused prefetched calls and record the hit rate."""
+        unused = prefetcher.discard()
+        self.prefetch_stats["started"] += prefetcher.started
+        self.prefetch_stats["hits"] += prefetcher.hits
+        self.prefetch_stats["hit_rate"] = round(self.prefetch_stats["hits"] / self.prefetch_stats["started"], 3)
+        self._log_event("prefetch_summary", {**prefetcher.stats(), "unused": unused, "total": dict(self.prefetch_stats)})
+
+    async def _fast_path_answer(self, client: Any, user_query: str,
+                                plan: "fast_path.FastPathPlan", fetched: Dict[str, Any]) -> str:
+        """Phrase the answer to a fast-path question in one Gemini call (no tools)."""
+        prompt = (
+            f"Question: {user_query}\n\n"
+            f"The ABS data below was already fetched for this question "
+            f"(dataset {plan.dataset_id}, calls {json.dumps(fetched['calls'])}). "
+            f"Do not call any tools; answer from this data only.\n"
+            f"```json\n{json.dumps(fetched['result'])}\n```"
+        )
+        self._log_event("gemini_request", {"message": prompt[:2000], "fast_path": True})
+        response = await client.aio.models.generate_content(
+            model=self.model_id,
+            contents=prompt,
+            config=types.GenerateContentConfig(system_instruction=self.system_instruction)
+        )
+        return response.text or "⚠️ No text generated."
+
     def _clean_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
         """
         Recursively cleans JSON schema to be compatible with Gemini.
@@ -162,198 +302,220 @@ ANSWER FORMAT:
         
         yield ("log", f"Drafting plan for query: '{user_query}'")
 
-        # Server parameters
-        # Try to locate .venv python
-        venv_python = os.path.join(self.root_dir, ".venv", "bin", "python")
-        if os.path.exists(venv_python):
-            server_python = venv_python
-            # log it for debugging
-            self._log_event("server_startup", {"executable_used": "venv", "path": venv_python})
-        else:
-            server_python = sys.executable
-            self._log_event("server_startup", {"executable_used": "sys.executable", "path": server_python})
-
-        server_params = StdioServerParameters(
-            command=server_python, 
-            args=["-m", "abs_mcp_server.server"],
-            env={**os.environ.copy(), "PYTHONPATH": os.path.join(self.root_dir, "src")},
-            cwd=self.root_dir
-        )
+        query_start = time.perf_counter()
+        prefetcher = None
+        # One limit for the whole query: speculative and model-issued calls share it
+        semaphore = asyncio.Semaphore(MAX_PARALLEL_TOOL_CALLS)
 
         try:
-            # Create a client session
-            async with stdio_client(server_params) as (read, write):
-                async with ClientSession(read, write) as session:
-                    await session.initialize()
-                    yield ("log", "Connected to MCP Server.")
-                    
-                    # Get available tools
-                    tools_list = await session.list_tools()
-                    tool_names = [t.name for t in tools_list.tools]
-                    yield ("log", f"Discovered Tools: {tool_names}")
-                    self._log_event("tools_discovered", {"tools": tool_names})
-                    
-                    # Convert MCP tools to Gemini tools format
-                    gemini_funcs = []
-                    for tool in tools_list.tools:
-                        # Clean the schema
-                        cleaned_schema = self._clean_schema(tool.inputSchema)
-                        
-                        gemini_funcs.append(types.FunctionDeclaration(
-                            name=tool.name,
-                            description=tool.description,
-                            parameters=cleaned_schema
-                        ))
+            connect_start = time.perf_counter()
+            reused = self.connection.connected
+            await self.connection.get_session()
+            connect_seconds = time.perf_counter() - connect_start
+            yield ("log", "Reusing MCP Server session." if reused else "Connected to MCP Server.")
+            self._log_event("server_session", {
+                "reused": reused,
+                "connect_ms": round(connect_seconds * 1000, 1),
+                "connect_count": self.connection.connect_count
+            })
+            
+            # Get available tools (listed once per connection)
+            tools_list = self.connection.tools
+            tool_names = [t.name for t in tools_list]
+            yield ("log", f"Discovered Tools: {tool_names}")
+            self._log_event("tools_discovered", {"tools": tool_names})
+            
+            # Convert MCP tools to Gemini tools format
+            gemini_funcs = []
+            for tool in tools_list:
+                # Clean the schema
+                cleaned_schema = self._clean_schema(tool.inputSchema)
+                
+                gemini_funcs.append(types.FunctionDeclaration(
+                    name=tool.name,
+                    description=tool.description,
+                    parameters=cleaned_schema
+                ))
+            
+            tool_config = types.Tool(function_declarations=gemini_funcs)
+
+            # Create a fresh client for this async context to avoid "Event loop is closed" errors
+            client = genai.Client(api_key=self.api_key)
+
+            # Fast path: topic-mapped questions are planned here, Gemini only phrases the answer
+            plan = fast_path.plan_query(user_query) if FAST_PATH_ENABLED else None
+            if plan is not None:
+                yield ("log", f"⚡ **Fast Path**: topic `{plan.topic}` → `{plan.dataset_id}`")
+                self._log_event("fast_path_plan", {
+                    "topic": plan.topic, "dataset_id": plan.dataset_id, "filters": plan.filters,
+                    "regions": plan.regions, "periods": plan.period_arguments()
+                })
+                fetch_start = time.perf_counter()
+                fetched = await fast_path.execute_plan(
+                    plan, self._call_tool_json, self._known_dimensions.get(plan.dataset_id)
+                )
+                if fetched is not None:
+                    self._known_dimensions[plan.dataset_id] = fetched["dimensions"]
+                    for call in fetched["calls"]:
+                        yield ("log", f"🛠️ **Invoked Tool**: `{call['name']}`")
+                        yield ("log", f"**Arguments**:\n```json\n{json.dumps(call['args'], indent=2)}\n```")
+                    self._log_event("fast_path_data", {
+                        "calls": fetched["calls"],
+                        "fetch_ms": round((time.perf_counter() - fetch_start) * 1000, 1)
+                    })
+                    answer = await self._fast_path_answer(client, user_query, plan, fetched)
+                    yield ("answer", answer)
+                    self._log_event("final_answer", {"text": answer, "fast_path": True})
+                    return
+                yield ("log", "Fast path not applicable; asking Gemini to plan.")
+                self._log_event("fast_path_fallback", {"topic": plan.topic, "dataset_id": plan.dataset_id})
+
+            # Speculative calls run while Gemini plans the first turn
+            if PREFETCH_ENABLED:
+                prefetcher = self._start_prefetch(user_query, semaphore)
+                if prefetcher is not None:
+                    yield ("log", f"Prefetching {prefetcher.started} likely tool call(s) in the background.")
+
+            # Initialize Chat
+            chat = client.aio.chats.create(
+                model=self.model_id,
+                config=types.GenerateContentConfig(
+                    system_instruction=self.system_instruction,
+                    tools=[tool_config]
+                )
+            )
+
+            # Send User Message
+            yield ("log", "Asking Gemini for next step...")
+            self._log_event("gemini_request", {"message": user_query})
+            response = await chat.send_message(user_query)
+            self._log_event("gemini_response", {"text": response.text, "function_calls": [{"name": fc.name, "args": fc.args} for part in response.candidates[0].content.parts for fc in [part.function_call] if fc] if response.candidates else []})
+
+            # Loop to handle tool calls with turn limit
+            turn_count = 0
+            max_turns = MAX_TURNS
+            
+            while turn_count < max_turns:
+                function_calls = []
+                # Check if response has text part to yield immediately?
+                # Gemini often returns text thinking + function call in one turn (gemini-2.0).
+                if response.text:
+                     # We can yield it as a log or partial answer?
+                     # Let's yield it as log for now to show "Thinking"
+                     yield ("log", f"💭 **Model Thought**: {response.text}")
+
+                if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+                    for part in response.candidates[0].content.parts:
+                        if part.function_call:
+                            function_calls.append(part.function_call)
                     
-                    tool_config = types.Tool(function_declarations=gemini_funcs)
-
-                    # Initialize Chat
-                    # Create a fresh client for this async context to avoid "Event loop is closed" errors
-                    client = genai.Client(api_key=self.api_key)
-                    chat = client.aio.chats.create(
-                        model=self.model_id,
-                        config=types.GenerateContentConfig(
-                            system_instruction=self.system_instruction,
-                            tools=[tool_config]
-                        )
-                    )
-
-                    # Send User Message
-                    yield ("log", "Asking Gemini for next step...")
-                    self._log_event("gemini_request", {"message": user_query})
-                    response = await chat.send_message(user_query)
-                    self._log_event("gemini_response", {"text": response.text, "function_calls": [{"name": fc.name, "args": fc.args} for part in response.candidates[0].content.parts for fc in [part.function_call] if fc] if response.candidates else []})
-
-                    # Loop to handle tool calls with turn limit
-                    turn_count = 0
-                    max_turns = MAX_TURNS
+                if not function_calls:
+                    # If no function calls, this is the final answer
+                    break
+                
+                # Increment turn count
+                turn_count += 1
+                yield ("log", f"🔄 Turn {turn_count}/{max_turns}")
+                
+                if turn_count >= max_turns:
+                    yield ("log", f"⚠️ **Max turns reached ({max_turns}). Stopping to prevent runaway.**")
+                    final_text = response.text or "Query stopped: Maximum iteration limit reached. Try simplifying your question."
+                    yield ("answer", final_text)
+                    self._log_event("max_turns_exceeded", {"turns": turn_count})
+                    return
                     
-                    while turn_count < max_turns:
-                        function_calls = []
-                        # Check if response has text part to yield immediately?
-                        # Gemini often returns text thinking + function call in one turn (gemini-2.0).
-                        if response.text:
-                             # We can yield it as a log or partial answer?
-                             # Let's yield it as log for now to show "Thinking"
-                             yield ("log", f"💭 **Model Thought**: {response.text}")
-
-                        if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                            for part in response.candidates[0].content.parts:
-                                if part.function_call:
-                                    function_calls.append(part.function_call)
-                            
-                        if not function_calls:
-                            # If no function calls, this is the final answer
-                            break
-                        
-                        # Increment turn count
-                        turn_count += 1
-                        yield ("log", f"🔄 Turn {turn_count}/{max_turns}")
-                        
-                        if turn_count >= max_turns:
-                            yield ("log", f"⚠️ **Max turns reached ({max_turns}). Stopping to prevent runaway.**")
-                            final_text = response.text or "Query stopped: Maximum iteration limit reached. Try simplifying your question."
-                            yield ("answer", final_text)
-                            self._log_event("max_turns_exceeded", {"turns": turn_count})
-                            return
-                            
-                        # Execute all function calls
-                        parts_to_send_back = []
-                        
-                        for fc in function_calls:
-                            func_name = fc.name
-                            func_args = fc.args
-                            
-                            yield ("log", f"🛠️ **Invoking Tool**: `{func_name}`")
-                            yield ("log", f"**Arguments**:\n```json\n{json.dumps(dict(fc.args), indent=2)}\n```")
-                            
-                            try:
-                                 # MCP call
-                                 self._log_event("tool_call_start", {"name": func_name, "args": func_args})
-                                 result = await session.call_tool(func_name, arguments=func_args)
-                                 
-                                 content_text = ""
-                                 if isinstance(result.content, list):
-                                     for c in result.content:
-                                         if hasattr(c, 'text'):
-                                             content_text += c.text
-                                         else:
-                                             content_text += str(c)
-                                 else:
-                                     content_text = str(result.content)
-                                 
-                                 display_output = content_text[:500] + "..." if len(content_text) > 500 else content_text
-                                 if display_output and display_output != "undefined":
-                                     yield ("log", f"**Tool Output**:\n```\n{display_output}\n```")
-                                 self._log_event("tool_call_result", {"name": func_name, "output_preview": display_output, "full_output": content_text})
-                                 
-                                 parts_to_send_back.append(
-                                     types.Part(
-                                         function_response=types.FunctionResponse(
-                                             name=func_name,
-                                             response={"result": content_text}
-                                        )
-                                     )
-                                 )
+                # Execute all function calls of this turn concurrently (results kept in call order)
+                parts_to_send_back = []
+                
+                for index, fc in enumerate(function_calls):
+                    yield ("log", f"🛠️ **Invoking Tool**: `{fc.name}`")
+                    yield ("log", f"**Arguments**:\n```json\n{json.dumps(dict(fc.args), indent=2)}\n```")
+                    self._log_event("tool_call_start", {"name": fc.name, "args": fc.args, "call_index": index})
 
-                            except Exception as e:
-                                 error_msg = f"Error: {e}"
-                                 yield ("log", f"❌ **Tool Error**: {error_msg}")
-                                 self._log_event("tool_call_error", {"name": func_name, "error": str(e)})
-                                 parts_to_send_back.append(
-                                     types.Part(
-                                         function_response=types.FunctionResponse(
-                                             name=func_name,
-                                             response={"error": error_msg}
-                                         )
-                                     )
+                batch_start = time.perf_counter()
+                outcomes = await asyncio.gather(*(self._run_tool_call(fc, semaphore, prefetcher) for fc in function_calls))
+                if len(function_calls) > 1:
+                    self._log_event("tool_calls_concurrent", {
+                        "count": len(function_calls),
+                        "max_parallel": MAX_PARALLEL_TOOL_CALLS,
+                        "wall_seconds": round(time.perf_counter() - batch_start, 3),
+                        "sum_seconds": round(sum(seconds for _, _, seconds in outcomes), 3),
+                    })
+
+                for index, (fc, (content_text, error, seconds)) in enumerate(zip(function_calls, outcomes)):
+                    func_name = fc.name
+                    if error is None:
+                         display_output = content_text[:500] + "..." if len(content_text) > 500 else content_text
+                         if display_output and display_output != "undefined":
+                             yield ("log", f"**Tool Output**:\n```\n{display_output}\n```")
+                         self._log_event("tool_call_result", {"name": func_name, "call_index": index, "seconds": seconds, "output_preview": display_output, "full_output": content_text})
+                         
+                         parts_to_send_back.append(
+                             types.Part(
+                                 function_response=types.FunctionResponse(
+                                     name=func_name,
+                                     response={"result": content_text}
+                                )
+                             )
+                         )
+                    else:
+                         error_msg = f"Error: {error}"
+                         yield ("log", f"❌ **Tool Error**: {error_msg}")
+                         self._log_event("tool_call_error", {"name": func_name, "call_index": index, "seconds": seconds, "error": error})
+                         parts_to_send_back.append(
+                             types.Part(
+                                 function_response=types.FunctionResponse(
+                                     name=func_name,
+                                     response={"error": error_msg}
                                  )
-                        
-                        # Feed back to Gemini
-                        yield ("log", "Feeding tool results back to Gemini...")
-                        self._log_event("gemini_tool_feedback", {"parts_count": len(parts_to_send_back)})
-                        response = await chat.send_message(parts_to_send_back)
-                        
-                        # Log the subsequent response
-                        fcs_log = []
-                        if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
-                            for part in response.candidates[0].content.parts:
-                                if part.function_call:
-                                    fcs_log.append({"name": part.function_call.name, "args": part.function_call.args})
-                        
-                        self._log_event("gemini_response_after_tool", {
-                            "text": response.text if response.candidates else "", 
-                            "function_calls": fcs_log
-                        })
-
-                    # Final response
-                    try:
-                        if response.text:
-                            yield ("answer", response.text)
-                            self._log_event("final_answer", {"text": response.text})
-                        else:
-                             # Check finish reason again
-                             reason = "Unknown"
-                             if response.candidates and response.candidates[0].finish_reason:
-                                 reason = str(response.candidates[0].finish_reason)
+                             )
+                         )
+                
+                # Feed back to Gemini
+                yield ("log", "Feeding tool results back to Gemini...")
+                self._log_event("gemini_tool_feedback", {"parts_count": len(parts_to_send_back)})
+                response = await chat.send_message(parts_to_send_back)
+                
+                # Log the subsequent response
+                fcs_log = []
+                if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
+                    for part in response.candidates[0].content.parts:
+                        if part.function_call:
+                            fcs_log.append({"name": part.function_call.name, "args": part.function_call.args})
+                
+                self._log_event("gemini_response_after_tool", {
+                    "text": response.text if response.candidates else "", 
+                    "function_calls": fcs_log
+                })
+
+            # Final response
+            try:
+                if response.text:
+                    yield ("answer", response.text)
+                    self._log_event("final_answer", {"text": response.text})
+                else:
+                     # Check finish reason again
+                     reason = "Unknown"
+                     if response.candidates and response.candidates[0].finish_reason:
+                         reason = str(response.candidates[0].finish_reason)
+                     
+                     if "MALFORMED_FUNCTION_CALL" in reason:
+                         yield ("log", "⚠️ Model made a malformed call. Asking it to summarize what it has so far...")
+                         # Self-correction: ask the model to stop trying to use tools and just answer
+                         correction_prompt = "You made a malformed tool call. Please STOP calling tools. Just summarize the data you have collected so far into a final answer."
+                         response = await chat.send_message(correction_prompt)
+                         if response.text:
+                             yield ("answer", response.text)
+                             self._log_event("final_answer_recovered", {"text": response.text})
+                             return
                              
-                             if "MALFORMED_FUNCTION_CALL" in reason:
-                                 yield ("log", "⚠️ Model made a malformed call. Asking it to summarize what it has so far...")
-                                 # Self-correction: ask the model to stop trying to use tools and just answer
-                                 correction_prompt = "You made a malformed tool call. Please STOP calling tools. Just summarize the data you have collected so far into a final answer."
-                                 response = await chat.send_message(correction_prompt)
-                                 if response.text:
-                                     yield ("answer", response.text)
-                                     self._log_event("final_answer_recovered", {"text": response.text})
-                                     return
-                                     
-                             yield ("answer", f"⚠️ No text generated. (Finish Reason: {reason})")
-                    except Exception as e:
-                        reason = "Unknown"
-                        if response.candidates and response.candidates[0].finish_reason:
-                            reason = str(response.candidates[0].finish_reason)
-                        yield ("answer", f"⚠️ Response content inaccessible. Finish Reason: {reason}")
-                        
+                     yield ("answer", f"⚠️ No text generated. (Finish Reason: {reason})")
+            except Exception as e:
+                reason = "Unknown"
+                if response.candidates and response.candidates[0].finish_reason:
+                    reason = str(response.candidates[0].finish_reason)
+                yield ("answer", f"⚠️ Response content inaccessible. Finish Reason: {reason}")
+                
         except Exception as e:
             # Log the full error to help debug
             import traceback
@@ -363,3 +525,10 @@ ANSWER FORMAT:
             self._log_event("execution_error", {"error": str(e), "traceback": traceback.format_exc()})
             # IMPORTANT: Yield an answer so the UI doesn't say "No response"
             yield ("answer", f"I encountered an error while processing your request:\n\n{error_msg}")
+        finally:
+            if prefetcher is not None:
+                self._finish_prefetch(prefetcher)
+            self._log_event("query_timing", {
+                "total_ms": round((time.perf_counter() - query_start) * 1000, 1),
+                "connect_count": self.connection.connect_count
+            })
@@ -0,0 +1,80 @@
+"""
+Speculative tool calls started while Gemini plans the first turn.
+
+For a topic-mapped question the model's first call is nearly always
+`get_dataset_structure` for the mapped dataset, often followed by
+`get_dataset_data` with the default dimensions. `SpeculativePrefetcher`
+starts those calls in the background before the first Gemini request; when
+the model then asks for exactly the same call (same name and arguments)
+the prefetched result is served instead of calling the server again.
+
+Unused calls are discarded at the end of the query. They are left to finish
+rather than cancelled, so an in-flight MCP request is never interrupted;
+the server caches what they fetched.
+"""
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+# run(name, arguments) -> (content text, error message or None, seconds)
+ToolRunner = Callable[[str, Dict[str, Any]], Awaitable[Tuple[str, Optional[str], float]]]
+
+
+def call_key(name: str, arguments: Optional[Dict[str, Any]]) -> str:
+    """Identity of a tool call; arguments left as None count as not given."""
+    args = {k: v for k, v in (arguments or {}).items() if v is not None}
+    return json.dumps([name, args], sort_keys=True, default=str)
+
+
+class SpeculativePrefetcher:
+    """Background tool calls of one query, served when the model asks for them."""
+
+    def __init__(self, run: ToolRunner):
+        self._run = run
+        self._pending: Dict[str, asyncio.Task] = {}
+        self._discarded: Set[asyncio.Task] = set()
+        self.started = 0
+        self.hits = 0
+
+    def start(self, name: str, arguments: Dict[str, Any]) -> None:
+        key = call_key(name, arguments)
+        if key not in self._pending:
+            self._pending[key] = asyncio.ensure_future(self._run(name, arguments))
+            self.started += 1
+
+    async def take(self, name: str, arguments: Optional[Dict[str, Any]]) -> Optional[Tuple[str, Optional[str], float]]:
+        """Result of a matching prefetched call (waiting for it if needed), else None.
+
+        Each prefetched result is served once; a failed call is not served,
+        so the caller retries it for real.
+        """
+        task = self._pending.pop(call_key(name, arguments), None)
+        if task is None:
+            return None
+        result = await asyncio.shield(task)
+        if result[1] is not None:
+            return None
+        self.hits += 1
+        return result
+
+    def discard(self) -> int:
+        """Drop unused calls, letting in-flight ones finish; returns how many were unused."""
+        unused = list(self._pending.values())
+        self._pending.clear()
+        for task in unused:
+            if not task.done():
+                self._discarded.add(task)
+                task.add_done_callback(self._forget)
+        return len(unused)
+
+    def _forget(self, task: asyncio.Task) -> None:
+        self._discarded.discard(task)
+        if not task.cancelled():
+            task.exception()  # Retrieved, so an unused failure is not reported as unhandled
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "started": self.started,
+            "hits": self.hits,
+            "hit_rate": round(self.hits / self.started, 3) if self.started else None,
+        }
@@ -0,0 +1,181 @@
+"""
+Long-lived connection to the ABS MCP server.
+
+Spawning the server (Python interpreter + imports), `initialize()` and
+`list_tools()` used to happen for every question. `MCPServerConnection` keeps
+one server process and `ClientSession` alive across queries, health-checks it
+with a ping when it has been idle, reconnects if the process died, and shuts
+it down cleanly on `close()`.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import anyio
+from mcp.client.session import ClientSession
+from mcp.client.stdio import StdioServerParameters, stdio_client
+
+# Errors that mean the transport (server process / pipes) is gone
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError,
+    anyio.BrokenResourceError,
+    anyio.EndOfStream,
+    ConnectionError,
+    EOFError,
+)
+
+
+class MCPServerConnection:
+    """Owns one stdio MCP server process and session for many queries.
+
+    The stdio/session context managers are entered and exited inside a single
+    background task (anyio requires this), which waits until `close()` or
+    until the transport fails.
+    """
+
+    def __init__(
+        self,
+        server_params: StdioServerParameters,
+        health_check_interval: float = 30.0,
+        health_check_timeout: float = 5.0,
+        connect_timeout: float = 30.0,
+    ):
+        self.server_params = server_params
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self.connect_timeout = connect_timeout
+
+        self.session: Optional[ClientSession] = None
+        self.tools: List[Any] = []
+        self.connect_count = 0
+        self.last_connect_seconds: Optional[float] = None
+
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._ready: Optional[asyncio.Event] = None
+        self._closing: Optional[asyncio.Event] = None
+        self._error: Optional[BaseException] = None
+        self._last_used = 0.0
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def connected(self) -> bool:
+        return (
+            self.session is not None
+            and self._task is not None
+            and not self._task.done()
+            and self._loop is asyncio.get_running_loop()
+        )
+
+    async def _run(self) -> None:
+        """Background task: hold the server process and session open."""
+        try:
+            async with stdio_client(self.server_params) as (read, write):
+                async with ClientSession(read, write) as session:
+                    await session.initialize()
+                    tools_list = await session.list_tools()
+                    self.tools = list(tools_list.tools)
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self._error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def connect(self) -> ClientSession:
+        """Start the server process and initialize a session."""
+        start = time.perf_counter()
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._error = None
+        self._task = asyncio.create_task(self._run())
+
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout=self.connect_timeout)
+        except asyncio.TimeoutError:
+            await self._stop()
+            raise ConnectionError(f"MCP server did not start within {self.connect_timeout}s")
+
+        if self.session is None:
+            error = self._error
+            await self._stop()
+            raise ConnectionError(f"Failed to start MCP server: {error}")
+
+        self.connect_count += 1
+        self.last_connect_seconds = time.perf_counter() - start
+        self._last_used = time.monotonic()
+        return self.session
+
+    async def health_check(self) -> bool:
+        """Ping the server; False if it does not answer in time."""
+        if not self.connected:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), timeout=self.health_check_timeout)
+            return True
+        except Exception:
+            return False
+
+    async def get_session(self) -> ClientSession:
+        """Return a live session, (re)connecting if needed.
+
+        A session idle for longer than `health_check_interval` is pinged first
+        and replaced if the ping fails.
+        """
+        if self._lock is None or self._loop is not asyncio.get_running_loop():
+            self._lock = asyncio.Lock()
+
+        async with self._lock:
+            if self.connected and time.monotonic() - self._last_used > self.health_check_interval:
+                if not await self.health_check():
+                    await self._stop()
+
+            if not self.connected:
+                if self._task is not None:
+                    await self._stop()
+                await self.connect()
+
+            self._last_used = time.monotonic()
+            return self.session
+
+    async def call_tool(self, name: str, arguments: Optional[Dict[str, Any]] = None) -> Any:
+        """Call a tool, reconnecting once if the server process has died."""
+        session = await self.get_session()
+        try:
+            return await session.call_tool(name, arguments=arguments)
+        except Exception as e:
+            await asyncio.sleep(0)  # let the background task notice a dead transport
+            if not isinstance(e, CONNECTION_ERRORS) and self.connected:
+                raise
+            # Concurrent calls may fail together; only the first one stops the old session
+            if self.session is session:
+                await self._stop()
+            session = await self.get_session()
+            return await session.call_tool(name, arguments=arguments)
+
+    async def _stop(self) -> None:
+        """End the background task, which closes the session and server process."""
+        task, self._task = self._task, None
+        self.session = None
+        if task is None:
+            return
+        if self._loop is not asyncio.get_running_loop():
+            # Created on a loop that no longer runs (e.g. a previous asyncio.run)
+            task.cancel()
+            return
+        if self._closing is not None:
+            self._closing.set()
+        try:
+            await asyncio.wait_for(task, timeout=self.connect_timeout)
+        except (asyncio.TimeoutError, asyncio.CancelledError):
+            task.cancel()
+        except Exception:
+            pass
+
+    async def close(self) -> None:
+        """Shut down the server process cleanly."""
+        await self._stop()
@@ -0,0 +1,85 @@
+"""Shared pytest fixtures."""
+
+import pytest
+
+from abs_mcp_server.disk_cache import DiskCache, set_disk_cache
+from abs_mcp_server.memory_cache import set_memory_cache
+from abs_mcp_server.release_calendar import ReleaseCalendar, set_release_calendar
+from abs_mcp_server.response_cache import set_response_cache
+
+
+@pytest.fixture(autouse=True)
+def isolated_disk_cache(tmp_path):
+    """Point the persistent cache (and the response cache on it) at a per-test temp file.
+
+    Tests start with an empty memory cache and release calendar, so nothing
+    is fresh by schedule.
+    """
+    cache = DiskCache(tmp_path / "cache.sqlite3", max_bytes=16 * 1024 * 1024, default_ttl=3600)
+    set_disk_cache(cache)
+    set_memory_cache(None)
+    set_response_cache(None)
+    set_release_calendar(ReleaseCalendar({}))
+    yield cache
+    set_release_calendar(None)
+    set_response_cache(None)
+    set_memory_cache(None)
+    set_disk_cache(None)
+    cache.close()
+
+
+class MockABSAPI:
+    """In-process stand-in for the ABS API used by `AsyncSDMXService`.
+
+    Serves the structure messages and `data` for `/data/...` requests, and
+    records every request in `requests`.
+    """
+
+    def __init__(self, data=None, delay=0.0):
+        from test_sdmx_service import DATA_MESSAGE
+
+        self.data = data if data is not None else DATA_MESSAGE
+        self.delay = delay
+        self.etag = None  # When set, responses carry it and matching requests get 304
+        self.requests = []
+
+    async def handler(self, request):
+        import asyncio
+        import httpx
+        from test_sdmx_service import DATAFLOW_MESSAGE, DSD_MESSAGE
+
+        self.requests.append(request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        path = request.url.path
+        if self.etag is not None and request.headers.get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag})
+        headers = {"ETag": self.etag} if self.etag is not None else {}
+        if path.startswith("/dataflow/"):
+            return httpx.Response(200, json=DATAFLOW_MESSAGE, headers=headers)
+        if path.startswith("/datastructure/"):
+            return httpx.Response(200, json=DSD_MESSAGE, headers=headers)
+        if path.startswith("/data/"):
+            payload = self.data(request) if callable(self.data) else self.data
+            if payload is None:
+                return httpx.Response(404)
+            return httpx.Response(200, json=payload, headers=headers)
+        return httpx.Response(404)
+
+    def data_requests(self):
+        return [r for r in self.requests if r.url.path.startswith("/data/")]
+
+
+@pytest.fixture
+def mock_abs_api():
+    """Route `AsyncSDMXService` HTTP calls to a `MockABSAPI`."""
+    import httpx
+    from unittest.mock import patch
+    from abs_mcp_server import async_sdmx_service
+
+    api = MockABSAPI()
+    with patch.object(
+        async_sdmx_service, "_get_client",
+        side_effect=lambda: httpx.AsyncClient(transport=httpx.MockTransport(api.handler))
+    ):
+        yield api
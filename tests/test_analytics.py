@@ -0,0 +1,89 @@
+"""Tests for server-side series statistics."""
+
+import pytest
+
+from abs_mcp_server.analytics import cagr, rolling_mean, series_statistics, table_statistics
+from abs_mcp_server.observations import ObservationTable
+from abs_mcp_server.periods import period_frequency, shift_years
+
+MONTHS = [f"{2022 + m // 12}-{m % 12 + 1:02d}" for m in range(24)]
+
+
+class TestPeriodHelpers:
+    def test_frequency(self):
+        assert [period_frequency(p) for p in ("2024", "2024-S1", "2024-Q3", "2024-07", "2024-W05", "2024-07-15")] \
+            == ["A", "S", "Q", "M", "W", "D"]
+
+    def test_shift_years(self):
+        assert shift_years("2024-Q3", -1) == "2023-Q3"
+        assert shift_years("2024", 2) == "2026"
+
+
+class TestSeriesStatistics:
+    def test_period_over_period_and_yoy(self):
+        values = [100 + m for m in range(24)]
+        stats = series_statistics(MONTHS, values, rows=2)
+
+        assert stats["frequency"] == "M"
+        assert stats["count"] == 24
+        assert stats["first"] == ["2022-01", 100.0]
+        assert stats["last"] == ["2023-12", 123.0]
+        assert stats["latest_pop_change"] == 1.0
+        assert stats["latest_yoy_change"] == 12.0
+        assert stats["latest_yoy_pct"] == pytest.approx(12 / 111 * 100, abs=1e-4)
+        assert stats["window"] == 12
+        assert stats["latest_rolling_mean_12"] == 117.5
+        assert stats["table"]["columns"] == [
+            "period", "value", "pop_change", "pop_pct", "yoy_change", "yoy_pct", "rolling_mean_12"
+        ]
+        assert [row[0] for row in stats["table"]["rows"]] == ["2023-11", "2023-12"]
+
+    def test_unordered_input_is_sorted(self):
+        stats = series_statistics(["2023-Q2", "2023-Q1", "2022-Q2"], [3.0, 2.0, 1.0], metrics=["yoy", "minmax"])
+
+        assert stats["first"] == ["2022-Q2", 1.0]
+        assert stats["latest_yoy_change"] == 2.0
+        assert stats["min"] == ["2022-Q2", 1.0]
+        assert stats["max"] == ["2023-Q2", 3.0]
+        assert "latest_pop_change" not in stats
+
+    def test_yoy_without_prior_year_is_none(self):
+        stats = series_statistics(MONTHS[:6], [1.0] * 6, metrics=["yoy"])
+        assert stats["latest_yoy_pct"] is None
+
+    def test_non_numeric_values_skipped(self):
+        stats = series_statistics(["2020", "2021", "2022"], [1.0, None, "NaN"], metrics=["pop"])
+        assert stats["count"] == 1
+
+    def test_unknown_metric(self):
+        with pytest.raises(ValueError):
+            series_statistics(["2020"], [1.0], metrics=["median"])
+
+    def test_cagr(self):
+        assert cagr("2020", 100.0, "2022", 121.0) == pytest.approx(10.0, abs=0.01)
+        assert cagr("2020", 0.0, "2022", 121.0) is None
+        assert series_statistics(["2020"], [1.0])["cagr_pct"] is None
+
+    def test_rolling_mean(self):
+        assert rolling_mean([1.0, 2.0, 3.0, 4.0], 2) == [None, 1.5, 2.5, 3.5]
+
+
+class TestTableStatistics:
+    def test_one_entry_per_series(self):
+        table = ObservationTable(["Region", "Time Period"], [["Sydney", "Perth"], ["2020", "2021", "2022"]])
+        for r in range(2):
+            for p in range(3):
+                table.append(float(10 * (r + 1) + p), [r, p])
+
+        sydney, perth = table_statistics(table, metrics=["pop"], rows=0)
+
+        assert sydney["series"] == {"Region": "Sydney"}
+        assert sydney["last"] == ["2022", 12.0]
+        assert perth["latest_pop_change"] == 1.0
+        assert "table" not in perth
+
+    def test_unreadable_periods_reported(self):
+        table = ObservationTable(["Time Period"], [["FY2020"]])
+        table.append(1.0, [0])
+
+        assert "error" in table_statistics(table)[0]
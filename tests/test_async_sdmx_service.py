@@ -0,0 +1,192 @@
+"""Offline tests for AsyncSDMXService and the async MCP tools."""
+
+import asyncio
+import time
+
+import httpx
+from unittest.mock import patch
+
+from abs_mcp_server import async_sdmx_service
+from abs_mcp_server.async_sdmx_service import AsyncSDMXService
+from abs_mcp_server.config import Config
+from test_sdmx_service import DATA_MESSAGE, DATAFLOW_MESSAGE, DSD_MESSAGE
+
+
+def _mock_client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _abs_handler(delay=0.0, calls=None):
+    """Mock ABS API: structure endpoints plus one data message."""
+
+    async def handler(request):
+        if calls is not None:
+            calls.append(request.url.path)
+        if delay:
+            await asyncio.sleep(delay)
+        path = request.url.path
+        if path.startswith("/dataflow/"):
+            return httpx.Response(200, json=DATAFLOW_MESSAGE)
+        if path.startswith("/datastructure/"):
+            return httpx.Response(200, json=DSD_MESSAGE)
+        if path.startswith("/data/"):
+            return httpx.Response(200, json=DATA_MESSAGE)
+        return httpx.Response(404)
+
+    return handler
+
+
+class TestAsyncSDMXService:
+    """Test the asyncio-native client."""
+
+    def test_get_structure_matches_sync_shape(self):
+        calls = []
+        client = _mock_client(_abs_handler(calls=calls))
+        with patch.object(async_sdmx_service, "_get_client", return_value=client):
+            structure = asyncio.run(AsyncSDMXService.get_structure("CPI_M"))
+            asyncio.run(AsyncSDMXService.get_structure("CPI_M"))  # cached
+
+        assert calls == ["/dataflow/ABS/CPI_M", "/datastructure/ABS/CPI_M/1.0.0"]
+        assert [d["id"] for d in structure["dimensions"]["observation"]] == ["MEASURE", "REGION", "TIME_PERIOD"]
+
+    def test_get_data_404_returns_empty(self):
+        client = _mock_client(lambda request: httpx.Response(404))
+        with patch.object(async_sdmx_service, "_get_client", return_value=client):
+            assert asyncio.run(AsyncSDMXService.get_data("CPI_M", "9.9")) == {}
+
+    def test_retries_on_server_error(self):
+        responses = iter([httpx.Response(503), httpx.Response(200, json=DATA_MESSAGE)])
+        client = _mock_client(lambda request: next(responses))
+        with patch.object(async_sdmx_service, "_get_client", return_value=client), \
+                patch.object(Config, "HTTP_BACKOFF", 0):
+            assert asyncio.run(AsyncSDMXService.get_data("CPI_M")) == DATA_MESSAGE
+
+    def test_concurrency_is_bounded(self):
+        in_flight = {"now": 0, "max": 0}
+
+        async def handler(request):
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            await asyncio.sleep(0.01)
+            in_flight["now"] -= 1
+            return httpx.Response(200, json=DATA_MESSAGE)
+
+        async def fan_out():
+            with patch.object(async_sdmx_service, "_get_client", return_value=_mock_client(handler)):
+                return await AsyncSDMXService.gather(
+                    AsyncSDMXService.get_data("CPI_M", str(i)) for i in range(6)
+                )
+
+        with patch.object(Config, "MAX_CONCURRENT_REQUESTS", 2):
+            results = asyncio.run(fan_out())
+
+        assert results == [DATA_MESSAGE] * 6
+        assert in_flight["max"] == 2
+
+    def test_streamed_body_holds_permit(self):
+        client = _mock_client(_abs_handler())
+
+        async def run():
+            with patch.object(async_sdmx_service, "_get_client", return_value=client):
+                semaphore = async_sdmx_service._get_semaphore()
+                async with async_sdmx_service._stream("https://abs.test/data/CPI_M") as response:
+                    held = semaphore.locked()
+                    await response.aread()
+                return held, semaphore.locked()
+
+        with patch.object(Config, "MAX_CONCURRENT_REQUESTS", 1):
+            held, after = asyncio.run(run())
+
+        assert held is True
+        assert after is False
+
+    def test_backoff_does_not_hold_permit(self):
+        finished = []
+        attempts = {"CPI_M": 0}
+
+        def handler(request):
+            if request.url.path.endswith("CPI_M") and attempts["CPI_M"] == 0:
+                attempts["CPI_M"] += 1
+                return httpx.Response(503)
+            return httpx.Response(200, json=DATA_MESSAGE)
+
+        async def fetch(dataset_id):
+            await AsyncSDMXService.get_data(dataset_id)
+            finished.append(dataset_id)
+
+        async def run():
+            with patch.object(async_sdmx_service, "_get_client", return_value=_mock_client(handler)):
+                await asyncio.gather(fetch("CPI_M"), fetch("WPI"))
+
+        with patch.object(Config, "MAX_CONCURRENT_REQUESTS", 1), patch.object(Config, "HTTP_BACKOFF", 0.1):
+            asyncio.run(run())
+
+        # WPI went ahead while CPI_M waited to retry
+        assert finished == ["WPI", "CPI_M"]
+
+
+class TestAsyncTools:
+    """The MCP tools are coroutines and overlap instead of serializing."""
+
+    def test_tools_are_async(self):
+        from abs_mcp_server import server
+
+        for tool in (server.search_datasets, server.get_dataset_structure, server.get_dataset_data):
+            assert asyncio.iscoroutinefunction(tool)
+
+    def test_concurrent_tool_calls_overlap(self):
+        from abs_mcp_server import server
+
+        async def run():
+            client = _mock_client(_abs_handler(delay=0.2))
+            with patch.object(async_sdmx_service, "_get_client", return_value=client):
+                await server.get_dataset_structure("CPI_M")  # warm the structure cache
+                start = time.perf_counter()
+                results = await asyncio.gather(
+                    server.get_dataset_data("CPI_M", filters={"MEASURE": "3"}),
+                    server.get_dataset_data("CPI_M", filters={"MEASURE": "3", "REGION": "50"}),
+                )
+                return results, time.perf_counter() - start
+
+        results, elapsed = asyncio.run(run())
+
+        assert all(r["total_observations_found"] == 2 for r in results)
+        assert elapsed < 0.35
+
+
+def test_pool_stats_count_reused_connections():
+    """Connections to a real (local) server are kept alive and reused."""
+    import threading
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            body = b'{"data": {"dataSets": []}}'
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+
+    async def run():
+        before = AsyncSDMXService.pool_stats()
+        for _ in range(3):
+            await async_sdmx_service._request(f"{base}/data/CPI_M")
+        await AsyncSDMXService.aclose()
+        return before, AsyncSDMXService.pool_stats()
+
+    try:
+        before, after = asyncio.run(run())
+    finally:
+        server.shutdown()
+
+    assert after["requests"] - before["requests"] == 3
+    assert after["connections_opened"] - before["connections_opened"] == 1
@@ -0,0 +1,87 @@
+"""Tests for the local dataflow catalog search index."""
+
+from unittest.mock import patch
+from abs_mcp_server.catalog_search import CatalogIndex, tokenize
+from abs_mcp_server.sdmx_service import SDMXService
+
+
+ENTRIES = [
+    {"id": "CPI", "version": "1.0", "name": "Consumer Price Index (CPI) 17th Series"},
+    {"id": "CPI_M", "version": "1.0", "name": "Monthly Consumer Price Index indicator"},
+    {"id": "LF", "version": "1.0", "name": "Labour Force"},
+    {"id": "WPI", "version": "1.0", "name": "Wage Price Index"},
+    {"id": "RT", "version": "1.0", "name": "Retail Trade"},
+]
+
+
+class TestCatalogIndex:
+    """Test tokenization, ranking and prefix matching."""
+
+    def test_tokenize_drops_stopwords(self):
+        assert tokenize("Value of the Exports, by State") == ["value", "exports", "state"]
+
+    def test_ranks_matching_documents(self):
+        index = CatalogIndex(ENTRIES)
+        results = index.search("consumer price", limit=10)
+
+        ids = [entry["id"] for entry, _ in results]
+        assert set(ids[:2]) == {"CPI", "CPI_M"}
+        assert "WPI" in ids  # "price" only
+        assert "LF" not in ids
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+
+    def test_prefix_matching(self):
+        index = CatalogIndex(ENTRIES)
+        results = index.search("lab", limit=5)
+
+        assert [entry["id"] for entry, _ in results] == ["LF"]
+
+    def test_short_tokens_match_exactly(self):
+        index = CatalogIndex(ENTRIES)
+
+        assert [entry["id"] for entry, _ in index.search("rt", limit=5)] == ["RT"]
+
+    def test_exact_id_ranks_first(self):
+        index = CatalogIndex(ENTRIES)
+
+        assert index.search("cpi_m", limit=1)[0][0]["id"] == "CPI_M"
+        assert index.search("CPI", limit=1)[0][0]["id"] == "CPI"
+
+    def test_empty_query_returns_catalog_head(self):
+        index = CatalogIndex(ENTRIES)
+
+        assert [(e["id"], s) for e, s in index.search("", limit=2)] == [("CPI", 0.0), ("CPI_M", 0.0)]
+
+    def test_loads_sdmx_xml(self, tmp_path):
+        xml_file = tmp_path / "dataflows.xml"
+        xml_file.write_text(
+            '<?xml version="1.0" encoding="utf-8"?>'
+            '<message:Structure xmlns:message="http://www.sdmx.org/resources/sdmxml/schemas/v2_1/message" '
+            'xmlns:structure="http://www.sdmx.org/resources/sdmxml/schemas/v2_1/structure" '
+            'xmlns:common="http://www.sdmx.org/resources/sdmxml/schemas/v2_1/common">'
+            '<message:Structures><structure:Dataflows>'
+            '<structure:Dataflow id="LF" agencyID="ABS" version="1.0.0">'
+            '<common:Name xml:lang="en">Labour Force</common:Name>'
+            '</structure:Dataflow>'
+            '</structure:Dataflows></message:Structures></message:Structure>'
+        )
+        index = CatalogIndex.from_file(xml_file)
+
+        assert index.entries == [{
+            "id": "LF", "name": "Labour Force", "description": None,
+            "version": "1.0.0", "agencyID": "ABS",
+        }]
+
+
+class TestSearchDatasets:
+    """Test SDMXService.search_datasets against the bundled snapshot."""
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_search_is_local(self, mock_session):
+        result = SDMXService.search_datasets("consumer price index", limit=3)
+
+        assert not mock_session.called
+        assert "CPI" in [r["id"] for r in result]
+        assert set(result[0]) == {"id", "name", "description", "version", "agency_id", "score"}
+        assert result[0]["score"] >= result[-1]["score"] > 0
@@ -0,0 +1,97 @@
+"""Tests for the persistent SQLite cache."""
+
+import asyncio
+import multiprocessing
+import time
+
+from unittest.mock import patch
+
+from abs_mcp_server import async_sdmx_service
+from abs_mcp_server.async_sdmx_service import AsyncSDMXService
+from abs_mcp_server.disk_cache import DiskCache
+from abs_mcp_server.memory_cache import get_memory_cache
+from abs_mcp_server.sdmx_service import SDMXService
+
+
+def _writer(path, worker):
+    cache = DiskCache(path, max_bytes=1024 * 1024)
+    for i in range(50):
+        cache.set("structure", f"{worker}-{i}", {"worker": worker, "i": i})
+    cache.close()
+
+
+class TestDiskCache:
+    """Test TTL, size limits and persistence."""
+
+    def test_roundtrip_and_restart(self, tmp_path):
+        path = tmp_path / "c.sqlite3"
+        cache = DiskCache(path, max_bytes=1024 * 1024)
+        cache.set("structure", "CPI_M", {"name": "CPI", "dimensions": {"observation": []}})
+        cache.close()
+
+        # A new process opening the same file starts warm
+        reopened = DiskCache(path, max_bytes=1024 * 1024)
+        assert reopened.get("structure", "CPI_M") == {"name": "CPI", "dimensions": {"observation": []}}
+        assert reopened.get("structure", "LF") is None
+        assert reopened.stats()["hits"] == 1
+
+    def test_entries_expire(self, tmp_path):
+        cache = DiskCache(tmp_path / "c.sqlite3", max_bytes=1024 * 1024)
+        cache.set("structure", "CPI_M", {"a": 1}, ttl=0.05)
+        cache.set("structure", "LF", {"b": 2}, ttl=None)
+
+        time.sleep(0.1)
+        assert cache.get("structure", "CPI_M") is None
+        assert cache.get("structure", "LF") == {"b": 2}
+
+    def test_size_limit_evicts_least_recently_used(self, tmp_path):
+        cache = DiskCache(tmp_path / "c.sqlite3", max_bytes=1500)
+        payload = {"values": [f"{i:04d}-{i * 7919 % 10007}" for i in range(120)]}
+        cache.set("structure", "old", payload)
+        time.sleep(0.01)
+        cache.set("structure", "recent", payload)
+        time.sleep(0.01)
+        cache.get("structure", "old")  # touch
+        time.sleep(0.01)
+        cache.set("structure", "new", payload)
+
+        assert cache.stats()["bytes"] <= 1500
+        assert cache.get("structure", "recent") is None
+        assert cache.get("structure", "new") == payload
+
+    def test_oversized_value_is_skipped(self, tmp_path):
+        cache = DiskCache(tmp_path / "c.sqlite3", max_bytes=64)
+        cache.set("structure", "big", {"values": list(range(1000))})
+
+        assert cache.get("structure", "big") is None
+
+    def test_concurrent_processes(self, tmp_path):
+        path = tmp_path / "c.sqlite3"
+        DiskCache(path, max_bytes=1024 * 1024).close()
+        workers = [multiprocessing.Process(target=_writer, args=(str(path), w)) for w in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join(timeout=30)
+
+        assert all(p.exitcode == 0 for p in workers)
+        cache = DiskCache(path, max_bytes=1024 * 1024)
+        assert cache.stats()["entries"] == 200
+        assert cache.get("structure", "3-49") == {"worker": 3, "i": 49}
+
+
+class TestStructureWarmStart:
+    """Structures fetched once are served from disk by a fresh process."""
+
+    def test_sync_and_async_paths_read_disk(self, isolated_disk_cache):
+        structure = {"name": "Monthly CPI", "dimensions": {"series": [], "observation": []}}
+        isolated_disk_cache.set("structure", "CPI_M", structure)
+
+        with patch("abs_mcp_server.sdmx_service._get_session") as mock_session, \
+                patch.object(async_sdmx_service, "_get_client") as mock_client:
+            assert SDMXService.get_structure("CPI_M") == structure
+            get_memory_cache().clear()  # Async path reads disk too, not the sync path's memory entry
+            assert asyncio.run(AsyncSDMXService.get_structure("CPI_M")) == structure
+
+        assert not mock_session.called
+        assert not mock_client.called
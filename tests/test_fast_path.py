@@ -0,0 +1,137 @@
+"""Tests for the deterministic fast path of topic-mapped questions."""
+
+import asyncio
+from datetime import date
+
+from client.fast_path import FastPathPlan, execute_plan, plan_query
+
+TODAY = date(2026, 10, 17)
+
+CPI_DIMENSIONS = [
+    {"id": "MEASURE", "values": {"3": "Percentage change", "1": "Index"}},
+    {"id": "INDEX", "values": {"10001": "All groups CPI"}},
+    {"id": "TSEST", "values": {"10": "Original"}},
+    {"id": "REGION", "values": {"50": "Eight capitals"}},
+    {"id": "FREQ", "values": {"M": "Monthly"}},
+]
+ERP_DIMENSIONS = [
+    {"id": "MEASURE", "values": {"ERP": "Estimated Resident Population"}},
+    {"id": "REGION", "values": {"5GPER": "Greater Perth", "1GSYD": "Greater Sydney"}},
+    {"id": "REGION_TYPE", "values": {"GCCSA": "GCCSA"}},
+    {"id": "FREQ", "values": {"A": "Annual"}},
+]
+
+
+class FakeServer:
+    """Answers structure/data calls and records them."""
+
+    def __init__(self, dimensions, data=None):
+        self.dimensions = dimensions
+        self.data = data if data is not None else {"data_sample": [{"TIME_PERIOD": "2026-08", "value": 3.1}]}
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def call_tool(self, name, arguments):
+        self.calls.append((name, arguments))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        if name == "get_dataset_structure":
+            return {"dataset_id": arguments["dataset_id"], "dimensions": self.dimensions}
+        if name == "get_multi_series_data":
+            return {"series": [{"filters": {}, "data_sample": [{"value": 1}]}]}
+        return self.data
+
+
+class TestPlanQuery:
+    """Questions that can and cannot be planned without the LLM."""
+
+    def test_latest_mapped_topic(self):
+        plan = plan_query("What is the current inflation rate?", TODAY)
+        assert plan.dataset_id == "CPI_M"
+        assert plan.filters["INDEX"] == "10001"
+        assert plan.period_arguments() == {}
+
+    def test_longest_topic_of_a_dataset_wins(self):
+        plan = plan_query("unemployment rate in 2023", TODAY)
+        assert plan.topic == "unemployment"
+        assert plan.filters["MEASURE"] == "M13"
+        assert plan.period_arguments() == {"start_period": "2023", "end_period": "2023"}
+
+    def test_periods(self):
+        assert plan_query("inflation last 2 years", TODAY).last_n_observations == 24
+        assert plan_query("inflation last 3 quarters", TODAY).last_n_observations == 9
+        assert plan_query("inflation from 2019 to 2021", TODAY).period_arguments() == {
+            "start_period": "2019", "end_period": "2021"
+        }
+        assert plan_query("inflation since 2020", TODAY).period_arguments() == {"start_period": "2020"}
+        assert plan_query("inflation last year", TODAY).period_arguments() == {
+            "start_period": "2025", "end_period": "2025"
+        }
+
+    def test_regions_in_question_order(self):
+        plan = plan_query("population of Sydney and Perth", TODAY)
+        assert plan.regions == ["1GSYD", "5GPER"]
+        assert plan.region_dimension is None
+
+    def test_region_goes_into_regional_default(self):
+        plan = plan_query("births in NSW", TODAY)
+        assert plan.regions == ["1"]
+        assert plan.region_dimension == "ASGS_2011"
+
+    def test_unplannable_questions(self):
+        assert plan_query("inflation vs wages", TODAY) is None  # Two datasets, comparison
+        assert plan_query("Compare inflation across cities", TODAY) is None
+        assert plan_query("inflation in 2019 and 2023", TODAY) is None  # Ambiguous years
+        assert plan_query("What were the latest ABS census results?", TODAY) is None  # Unmapped
+
+
+class TestExecutePlan:
+    """Running plans against a (fake) MCP server."""
+
+    def test_structure_and_data_run_in_parallel(self):
+        server = FakeServer(CPI_DIMENSIONS)
+        fetched = asyncio.run(execute_plan(plan_query("current inflation", TODAY), server.call_tool))
+
+        assert server.max_in_flight == 2
+        assert [c["name"] for c in fetched["calls"]] == ["get_dataset_structure", "get_dataset_data"]
+        assert fetched["result"]["data_sample"]
+
+    def test_known_dimensions_skip_structure(self):
+        server = FakeServer(CPI_DIMENSIONS)
+        fetched = asyncio.run(execute_plan(plan_query("current inflation", TODAY), server.call_tool, CPI_DIMENSIONS))
+
+        assert [name for name, _ in server.calls] == ["get_dataset_data"]
+        assert fetched["calls"][0]["args"]["filters"]["REGION"] == "50"
+
+    def test_region_dimension_found_from_structure(self):
+        server = FakeServer(ERP_DIMENSIONS)
+        fetched = asyncio.run(execute_plan(plan_query("population of Perth and Sydney", TODAY), server.call_tool))
+
+        name, args = server.calls[-1]
+        assert name == "get_multi_series_data"
+        assert args["filters"]["REGION"] == ["5GPER", "1GSYD"]
+        assert fetched is not None
+
+    def test_compact_table_counts_as_data(self):
+        server = FakeServer(CPI_DIMENSIONS, data={"table": {"constant": {}, "columns": ["value"], "rows": [[3.1]]}})
+        assert asyncio.run(execute_plan(plan_query("current inflation", TODAY), server.call_tool)) is not None
+
+    def test_falls_back_when_dimensions_are_not_covered(self):
+        dimensions = CPI_DIMENSIONS + [{"id": "ADJUSTMENT", "values": {"1": "x"}}]
+        server = FakeServer(dimensions)
+        assert asyncio.run(execute_plan(plan_query("current inflation", TODAY), server.call_tool)) is None
+
+    def test_falls_back_without_data(self):
+        server = FakeServer(CPI_DIMENSIONS, data={"error": "No data found"})
+        assert asyncio.run(execute_plan(plan_query("current inflation", TODAY), server.call_tool)) is None
+
+    def test_invalid_code_falls_back(self):
+        plan = FastPathPlan(topic="t", dataset_id="CPI_M", filters={
+            "MEASURE": "99", "INDEX": "10001", "TSEST": "10", "REGION": "50", "FREQ": "M"
+        })
+        server = FakeServer(CPI_DIMENSIONS)
+        assert asyncio.run(execute_plan(plan, server.call_tool, CPI_DIMENSIONS)) is None
+        assert server.calls == []
@@ -0,0 +1,77 @@
+"""Tests for aligning series from different datasets."""
+
+import pytest
+
+from abs_mcp_server.join import (
+    align_series, coarsest_frequency, parse_derived, points_frequency, table_points, transform_points
+)
+from abs_mcp_server.observations import ObservationTable
+
+
+class TestTablePoints:
+    def test_single_series(self):
+        table = ObservationTable(["Region", "Time Period"], [["Sydney"], ["2024-01", "2024-02"]])
+        table.append(1.5, [0, 0])
+        table.append("n/a", [0, 1])
+
+        assert table_points(table) == {"2024-01": 1.5, "2024-02": None}
+
+    def test_several_series_rejected(self):
+        table = ObservationTable(["Region", "Time Period"], [["Sydney", "Perth"], ["2024-01"]])
+        table.append(1.0, [0, 0])
+        table.append(2.0, [1, 0])
+
+        with pytest.raises(ValueError, match="2 series"):
+            table_points(table)
+
+
+class TestTransforms:
+    def test_coarsest_frequency(self):
+        assert coarsest_frequency(["M", "Q"]) == "Q"
+        assert points_frequency({"2024-Q1": 1.0, "2024": 2.0}) == "A"
+
+    def test_percent_changes(self):
+        points = {"2023-Q1": 100.0, "2023-Q2": 110.0, "2024-Q1": 104.0, "2024-Q2": None}
+
+        pop = transform_points(points, "pop_pct")
+        assert pop["2023-Q1"] is None
+        assert pop["2023-Q2"] == pytest.approx(10.0)
+        assert pop["2024-Q2"] is None
+
+        yoy = transform_points(points, "yoy_pct")
+        assert yoy["2024-Q1"] == pytest.approx(4.0)
+        assert yoy["2023-Q2"] is None
+
+    def test_unknown_transform(self):
+        with pytest.raises(ValueError):
+            transform_points({}, "log")
+
+
+class TestAlignSeries:
+    SERIES = {
+        "Exports": {"2024-01": 40.0, "2024-02": 42.0, "2024-03": 41.0},
+        "Imports": {"2024-02": 35.0, "2024-03": 38.0, "2024-04": 36.0},
+    }
+
+    def test_inner_join_with_derived(self):
+        joined = align_series(self.SERIES, derived=["Exports - Imports", "Exports / Imports"])
+
+        assert joined["columns"] == ["period", "Exports", "Imports", "Exports - Imports", "Exports / Imports"]
+        assert joined["rows"] == [
+            ["2024-02", 42.0, 35.0, 7.0, 1.2],
+            ["2024-03", 41.0, 38.0, 3.0, 1.0789],
+        ]
+        assert joined["unmatched"] == {"Exports": 1, "Imports": 1}
+
+    def test_outer_join(self):
+        joined = align_series(self.SERIES, how="outer", derived=["Exports - Imports"])
+
+        assert [row[0] for row in joined["rows"]] == ["2024-01", "2024-02", "2024-03", "2024-04"]
+        assert joined["rows"][0] == ["2024-01", 40.0, None, None]
+
+    def test_labels_containing_operators(self):
+        assert parse_derived("CPI - all groups - WPI", ["CPI - all groups", "WPI"]) == (
+            "CPI - all groups", "-", "WPI"
+        )
+        with pytest.raises(ValueError, match="Cannot read"):
+            parse_derived("Exports + Imports", ["Exports", "Imports"])
@@ -0,0 +1,85 @@
+"""Tests for the persistent MCP server connection (spawns the real server)."""
+
+import asyncio
+import os
+import sys
+
+from mcp.client.stdio import StdioServerParameters
+from client.server_connection import MCPServerConnection
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _connection(**kwargs):
+    params = StdioServerParameters(
+        command=sys.executable,
+        args=["-m", "abs_mcp_server.server"],
+        env={**os.environ, "PYTHONPATH": os.path.join(ROOT, "src"), "LOG_LEVEL": "WARNING"},
+        cwd=ROOT
+    )
+    return MCPServerConnection(params, **kwargs)
+
+
+def test_session_is_reused_across_calls():
+    async def run():
+        connection = _connection()
+        first = await connection.call_tool("search_datasets", {"keyword": "labour force", "limit": 2})
+        second = await connection.call_tool("search_datasets", {"keyword": "retail", "limit": 2})
+        healthy = await connection.health_check()
+        tool_names = {t.name for t in connection.tools}
+        await connection.close()
+        return first, second, healthy, tool_names, connection
+
+    first, second, healthy, tool_names, connection = asyncio.run(run())
+
+    assert not first.isError and not second.isError
+    assert connection.connect_count == 1
+    assert healthy
+    assert {"search_datasets", "get_dataset_structure", "get_dataset_data"} <= tool_names
+    assert connection.session is None
+
+
+def test_reconnects_after_server_dies():
+    async def run():
+        connection = _connection()
+        await connection.call_tool("search_datasets", {"keyword": "cpi", "limit": 1})
+        connection._task.cancel()  # tears down the transport and server process
+        await asyncio.sleep(0.1)
+        alive = await connection.health_check()
+        result = await connection.call_tool("search_datasets", {"keyword": "cpi", "limit": 1})
+        await connection.close()
+        return alive, result, connection.connect_count
+
+    alive, result, connect_count = asyncio.run(run())
+
+    assert not alive
+    assert not result.isError
+    assert connect_count == 2
+
+
+def test_idle_session_is_health_checked():
+    async def run():
+        connection = _connection(health_check_interval=0)
+        await connection.get_session()
+        await connection.get_session()  # pings, stays on the same process
+        count = connection.connect_count
+        await connection.close()
+        return count
+
+    assert asyncio.run(run()) == 1
+
+
+def test_concurrent_calls_share_one_session():
+    async def run():
+        connection = _connection()
+        results = await asyncio.gather(*(
+            connection.call_tool("search_datasets", {"keyword": keyword, "limit": 1})
+            for keyword in ("cpi", "labour force", "retail", "population")
+        ))
+        await connection.close()
+        return results, connection.connect_count
+
+    results, connect_count = asyncio.run(run())
+
+    assert not any(result.isError for result in results)
+    assert connect_count == 1
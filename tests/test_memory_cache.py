@@ -0,0 +1,90 @@
+"""Tests for the byte-budgeted GDSF memory cache."""
+
+import time
+
+from abs_mcp_server.memory_cache import ByteBudgetCache, get_memory_cache, set_memory_cache
+
+
+class TestByteBudgetCache:
+    """Test size accounting, cost-aware eviction and compression."""
+
+    def test_round_trips_value_types(self):
+        cache = ByteBudgetCache(1024, compression="none")
+        cache.set("bytes", b"abc")
+        cache.set("text", "abc")
+        cache.set("json", {"a": [1, 2]})
+
+        assert cache.get("bytes") == b"abc"
+        assert cache.get("text") == "abc"
+        assert cache.get("json") == {"a": [1, 2]}
+        assert cache.stats()["resident_bytes"] == 3 + 3 + len('{"a":[1,2]}')
+
+    def test_evicts_large_cheap_entries_first(self):
+        cache = ByteBudgetCache(1000, compression="none")
+        cache.set("small", b"x" * 100)
+        cache.set("large", b"y" * 600)
+        cache.set("other", b"z" * 200)
+        cache.set("new", b"w" * 300)
+
+        assert cache.get("large") is None
+        assert cache.get("small") is not None and cache.get("new") is not None
+        stats = cache.stats()
+        assert stats["evictions"] == 1 and stats["evicted_bytes"] == 600
+        assert stats["resident_bytes"] <= 1000
+
+    def test_cost_and_frequency_protect_entries(self):
+        cache = ByteBudgetCache(1000, compression="none")
+        cache.set("costly", b"a" * 500, cost=10.0)
+        cache.set("popular", b"b" * 400)
+        for _ in range(5):
+            cache.get("popular")
+        cache.set("cold", b"c" * 100)
+        cache.set("new", b"d" * 100)
+
+        assert cache.get("costly") is not None
+        assert cache.get("popular") is not None
+        assert cache.get("cold") is None
+
+    def test_compresses_cold_entries_before_evicting(self):
+        cache = ByteBudgetCache(8000, compression="zlib")
+        cache.set("cold", {"values": ["same"] * 1000})  # ~7 KB JSON, compresses well
+        cache.set("hot", b"h" * 2000)
+
+        stats = cache.stats()
+        assert stats["evictions"] == 0 and stats["compressed_entries"] == 1
+        assert cache.get("cold") == {"values": ["same"] * 1000}  # Decompressed on access
+
+    def test_expired_and_oversized_entries(self):
+        cache = ByteBudgetCache(100, compression="none")
+        cache.set("old", b"x", expires=time.time() - 1)
+        cache.set("huge", b"x" * 101)
+
+        assert cache.get("old") is None
+        assert cache.get("huge") is None
+        assert len(cache) == 0
+
+    def test_clear_namespace(self):
+        cache = ByteBudgetCache(1024)
+        cache.set(("structure", "CPI_M"), {"name": "CPI"})
+        cache.set(("http", "key"), {"body": "{}"})
+        cache.clear("structure")
+
+        assert cache.get(("structure", "CPI_M")) is None
+        assert cache.get(("http", "key")) == {"body": "{}"}
+
+
+class TestProcessCache:
+    """Test the process-wide instance."""
+
+    def test_disabled_with_zero_budget(self, monkeypatch):
+        from abs_mcp_server.memory_cache import Config
+
+        monkeypatch.setattr(Config, "MEMORY_CACHE_MAX_MB", 0)
+        assert get_memory_cache() is None
+
+    def test_set_and_recreate(self):
+        custom = ByteBudgetCache(10)
+        set_memory_cache(custom)
+        assert get_memory_cache() is custom
+        set_memory_cache(None)
+        assert get_memory_cache() is not custom
@@ -0,0 +1,144 @@
+"""Tests for the columnar ObservationTable."""
+
+from abs_mcp_server.observations import MISSING, ObservationTable, parse_observation_table
+from abs_mcp_server.sdmx_service import SDMXService
+
+from test_sdmx_service import DATA_MESSAGE
+
+
+def _dims(data):
+    return SDMXService.parse_dimensions(SDMXService._parse_structure(data))
+
+
+FLAT_MESSAGE = {
+    "dataSets": [{"observations": {"0:0": [10], "1:0": [20], "5:0": [30]}}],
+    "structure": {
+        "dimensions": {
+            "observation": [
+                {"id": "REGION", "name": "Region", "values": [{"id": "1", "name": "NSW"}, {"id": "2", "name": "VIC"}]},
+                {"id": "TIME_PERIOD", "name": "Time Period", "values": [{"id": "2021", "name": "2021"}]},
+            ]
+        }
+    },
+}
+
+
+class TestParseObservationTable:
+    """Test parsing SDMX-JSON into columns."""
+
+    def test_series_records(self):
+        table = parse_observation_table(DATA_MESSAGE, _dims(DATA_MESSAGE))
+
+        assert len(table) == 2
+        assert table.values == [1.5, 2.0]
+        assert table.to_records() == [
+            {"value": 1.5, "Measure": "Percentage Change", "Region": "Weighted average", "Time Period": "2025-01"},
+            {"value": 2.0, "Measure": "Percentage Change", "Region": "Weighted average", "Time Period": "2025-02"},
+        ]
+
+    def test_labels_are_shared_not_copied(self):
+        table = parse_observation_table(DATA_MESSAGE, _dims(DATA_MESSAGE))
+
+        assert list(table.codes[0]) == [0, 0]
+        assert list(table.codes[2]) == [0, 1]
+        assert table.labels[2] == ["2025-01", "2025-02"]
+
+    def test_flat_observations_unknown_code(self):
+        table = parse_observation_table(FLAT_MESSAGE, _dims(FLAT_MESSAGE))
+
+        assert table.column("Region") == ["NSW", "VIC", "Unknown"]
+        assert table.to_records()[2] == {"value": 30, "Region": "Unknown", "Time Period": "2021"}
+
+    def test_series_out_of_range_code_is_omitted(self):
+        data = {
+            "dataSets": [{"series": {"0:9": {"observations": {"0": [1.0]}}}}],
+            "structure": DATA_MESSAGE["data"]["structures"][0],
+        }
+        table = parse_observation_table(data, _dims(data))
+
+        assert table.codes[1][0] == MISSING
+        assert table.to_records() == [{"value": 1.0, "Measure": "Percentage Change", "Time Period": "2025-01"}]
+
+    def test_empty_message(self):
+        table = parse_observation_table({}, [])
+
+        assert len(table) == 0
+        assert table.to_records() == []
+
+    def test_parse_observations_matches_table(self):
+        dims = _dims(DATA_MESSAGE)
+
+        assert SDMXService.parse_observations(DATA_MESSAGE, dims) == \
+            SDMXService.parse_observation_table(DATA_MESSAGE, dims).to_records()
+
+    def test_series_sorted_by_period(self):
+        import copy
+
+        data = copy.deepcopy(DATA_MESSAGE)
+        # Upstream lists the newer observation first
+        data["data"]["dataSets"][0]["series"]["0:0"]["observations"] = {"1": [2.0], "0": [1.5]}
+        table = parse_observation_table(data, _dims(data))
+
+        assert table.column("Time Period") == ["2025-01", "2025-02"]
+        assert table.values == [1.5, 2.0]
+        assert table[-1]["value"] == 2.0
+
+    def test_flat_observations_sorted_per_series(self):
+        data = {
+            "dataSets": [{"observations": {"0:2": [3], "1:0": [10], "0:0": [1], "0:1": [2]}}],
+            "structure": {"dimensions": {"observation": [
+                FLAT_MESSAGE["structure"]["dimensions"]["observation"][0],
+                {"id": "TIME_PERIOD", "name": "Time Period",
+                 "values": [{"id": p, "name": p} for p in ("2021-Q1", "2021-Q2", "2021-Q3")]},
+            ]}},
+        }
+        table = parse_observation_table(data, _dims(data))
+
+        assert table.values == [1, 2, 3, 10]
+        assert table.column("Region") == ["NSW", "NSW", "NSW", "VIC"]
+
+    def test_in_period_order_keeps_ordered_table(self):
+        table = parse_observation_table(DATA_MESSAGE, _dims(DATA_MESSAGE))
+
+        assert table.in_period_order() is table
+        assert table[::-1].in_period_order().values == [1.5, 2.0]
+        assert table[::-1].periods is table.period_index()
+
+
+class TestObservationTableSlicing:
+    """Test row selection without materializing records."""
+
+    def test_tail_slice(self):
+        table = parse_observation_table(DATA_MESSAGE, _dims(DATA_MESSAGE))
+        tail = table[-1:]
+
+        assert isinstance(tail, ObservationTable)
+        assert tail.labels is table.labels
+        assert tail.to_records() == [table[1]]
+        assert table[-1]["Time Period"] == "2025-02"
+
+
+class TestCompactTable:
+    """Test the header-plus-rows layout."""
+
+    def test_constant_dimensions_factored_out(self):
+        table = parse_observation_table(DATA_MESSAGE, _dims(DATA_MESSAGE))
+
+        assert table.to_compact() == {
+            "constant": {"Measure": "Percentage Change", "Region": "Weighted average"},
+            "columns": ["Time Period", "value"],
+            "rows": [["2025-01", 1.5], ["2025-02", 2.0]],
+        }
+
+    def test_absent_codes_are_none(self):
+        data = {
+            "dataSets": [{"series": {"0:0": {"observations": {"0": [1.0]}}, "0:9": {"observations": {"0": [2.0]}}}}],
+            "structure": DATA_MESSAGE["data"]["structures"][0],
+        }
+        compact = parse_observation_table(data, _dims(data)).to_compact()
+
+        assert compact["columns"] == ["Region", "value"]
+        assert compact["rows"] == [["Weighted average", 1.0], [None, 2.0]]
+
+    def test_empty_table(self):
+        assert parse_observation_table({}, []).to_compact() == {"constant": {}, "columns": ["value"], "rows": []}
@@ -0,0 +1,128 @@
+"""Tests for speculative tool calls served to the agent."""
+
+import asyncio
+
+from client.prefetch import SpeculativePrefetcher, call_key
+
+
+class FakeRunner:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.calls = []
+        self.finished = 0
+
+    async def __call__(self, name, arguments):
+        self.calls.append((name, arguments))
+        await asyncio.sleep(self.delay)
+        self.finished += 1
+        return f"{name} result", None, self.delay
+
+
+class TestCallKey:
+    def test_argument_order_and_none_values_do_not_matter(self):
+        assert call_key("t", {"a": 1, "b": None, "c": {"x": "1", "y": "2"}}) == \
+            call_key("t", {"c": {"y": "2", "x": "1"}, "a": 1})
+        assert call_key("t", {"a": 1}) != call_key("u", {"a": 1})
+
+
+class TestSpeculativePrefetcher:
+    def test_matching_call_is_served_once(self):
+        async def run():
+            runner = FakeRunner()
+            prefetcher = SpeculativePrefetcher(runner)
+            prefetcher.start("get_dataset_structure", {"dataset_id": "CPI_M"})
+            prefetcher.start("get_dataset_structure", {"dataset_id": "CPI_M"})  # Deduplicated
+            first = await prefetcher.take("get_dataset_structure", {"dataset_id": "CPI_M"})
+            second = await prefetcher.take("get_dataset_structure", {"dataset_id": "CPI_M"})
+            return runner, prefetcher, first, second
+
+        runner, prefetcher, first, second = asyncio.run(run())
+
+        assert len(runner.calls) == 1
+        assert first == ("get_dataset_structure result", None, 0.01)
+        assert second is None
+        assert prefetcher.stats() == {"started": 1, "hits": 1, "hit_rate": 1.0}
+
+    def test_other_calls_miss(self):
+        async def run():
+            prefetcher = SpeculativePrefetcher(FakeRunner())
+            prefetcher.start("get_dataset_structure", {"dataset_id": "CPI_M"})
+            result = await prefetcher.take("get_dataset_structure", {"dataset_id": "LF"})
+            prefetcher.discard()
+            return prefetcher, result
+
+        prefetcher, result = asyncio.run(run())
+
+        assert result is None
+        assert prefetcher.stats()["hit_rate"] == 0.0
+
+    def test_failed_call_is_not_served(self):
+        async def failing(name, arguments):
+            return "", "connection lost", 0.0
+
+        async def run():
+            prefetcher = SpeculativePrefetcher(failing)
+            prefetcher.start("get_dataset_structure", {"dataset_id": "CPI_M"})
+            return prefetcher, await prefetcher.take("get_dataset_structure", {"dataset_id": "CPI_M"})
+
+        prefetcher, result = asyncio.run(run())
+
+        assert result is None
+        assert prefetcher.hits == 0
+
+    def test_discarded_calls_finish_in_background(self):
+        async def run():
+            runner = FakeRunner(delay=0.05)
+            prefetcher = SpeculativePrefetcher(runner)
+            prefetcher.start("get_dataset_structure", {"dataset_id": "CPI_M"})
+            prefetcher.start("get_dataset_data", {"dataset_id": "CPI_M", "filters": {"FREQ": "M"}})
+            await prefetcher.take("get_dataset_structure", {"dataset_id": "CPI_M"})
+            unused = prefetcher.discard()
+            await asyncio.sleep(0.1)
+            return runner, prefetcher, unused
+
+        runner, prefetcher, unused = asyncio.run(run())
+
+        assert unused == 1
+        assert runner.finished == 2  # Not cancelled mid-request
+        assert prefetcher.stats() == {"started": 2, "hits": 1, "hit_rate": 0.5}
+
+
+class TestAgentPrefetchLimit:
+    """Speculative and model-issued calls share the query's concurrency limit."""
+
+    def test_one_semaphore_per_query(self):
+        from types import SimpleNamespace
+        from unittest.mock import patch
+
+        from google.genai import types
+
+        from client.mcp_agent import MCPAgent
+
+        in_flight = {"now": 0, "max": 0}
+
+        class FakeConnection:
+            async def call_tool(self, name, arguments=None):
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+                await asyncio.sleep(0.02)
+                in_flight["now"] -= 1
+                return SimpleNamespace(content=[SimpleNamespace(text="{}")])
+
+        agent = MCPAgent(api_key="test")
+        agent.connection = FakeConnection()
+
+        async def run():
+            semaphore = asyncio.Semaphore(2)
+            prefetcher = agent._start_prefetch("What is the latest CPI inflation rate?", semaphore)
+            calls = [types.FunctionCall(name="search_datasets", args={"keyword": str(i)}) for i in range(3)]
+            await asyncio.gather(*(agent._run_tool_call(fc, semaphore, prefetcher) for fc in calls))
+            prefetcher.discard()
+            await asyncio.sleep(0.05)
+            return prefetcher
+
+        with patch.object(agent, "_log_event"):
+            prefetcher = asyncio.run(run())
+
+        assert prefetcher.started >= 1
+        assert in_flight["max"] == 2
@@ -0,0 +1,128 @@
+"""Tests for release-calendar cache freshness."""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+
+from abs_mcp_server import response_cache
+from abs_mcp_server.async_sdmx_service import AsyncSDMXService
+from abs_mcp_server.memory_cache import get_memory_cache
+from abs_mcp_server.release_calendar import (
+    DEFAULT_CALENDAR_FILE,
+    ReleaseCalendar,
+    dataflow_from_url,
+    set_release_calendar,
+)
+
+
+def _calendar(*offsets_hours):
+    """Calendar with CPI_M releases at the given offsets from now."""
+    now = datetime.now(timezone.utc)
+    return ReleaseCalendar({"CPI_M": [now + timedelta(hours=h) for h in offsets_hours]})
+
+
+class TestReleaseCalendar:
+    """Test loading and release lookups."""
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "calendar.json"
+        path.write_text(json.dumps({
+            "timezone": "Australia/Sydney",
+            "release_time": "11:30",
+            "dataflows": {"CPI_M": ["2026-11-25", "2026-10-28T09:00:00+00:00"]},
+        }))
+        calendar = ReleaseCalendar.from_file(path)
+
+        first, second = calendar.releases["CPI_M"]
+        assert first == datetime(2026, 10, 28, 9, 0, tzinfo=timezone.utc)
+        assert second.hour == 11 and second.minute == 30 and second.utcoffset() == timedelta(hours=11)
+
+        between = datetime(2026, 11, 1, tzinfo=timezone.utc)
+        assert calendar.last_release("CPI_M", between) == first
+        assert calendar.next_release("CPI_M", between) == second
+        assert calendar.next_release("CPI_M", second) is None
+        assert calendar.fresh_until("LF", between.timestamp()) is None
+
+    def test_only_verified_dataflows_are_used(self, tmp_path):
+        path = tmp_path / "calendar.json"
+        path.write_text(json.dumps({
+            "verified": ["CPI_M"],
+            "dataflows": {"CPI_M": ["2026-11-25"], "LF": ["2026-11-19"]},
+        }))
+        calendar = ReleaseCalendar.from_file(path)
+
+        assert "CPI_M" in calendar and "LF" not in calendar
+        assert calendar.unverified == ["LF"]
+        assert calendar.fresh_until("LF", datetime(2026, 11, 1, tzinfo=timezone.utc).timestamp()) is None
+
+    def test_shipped_calendar_is_a_placeholder(self):
+        calendar = ReleaseCalendar.from_file(DEFAULT_CALENDAR_FILE)
+
+        assert calendar.releases == {}
+        for dataflow_id in ("CPI_M", "LF", "RT", "WPI"):
+            assert dataflow_id in calendar.unverified
+
+    def test_dataflow_from_url(self):
+        base = "https://api.data.abs.gov.au"
+        assert dataflow_from_url(f"{base}/data/CPI_M/3.50") == "CPI_M"
+        assert dataflow_from_url(f"{base}/data/ABS,LF,1.0.0/M13") == "LF"
+        assert dataflow_from_url(f"{base}/dataflow/ABS/RT") == "RT"
+        assert dataflow_from_url(f"{base}/datastructure/ABS/WPI/1.0.0") == "WPI"
+        assert dataflow_from_url(f"{base}/dataflow") is None
+
+
+class TestReleaseFreshness:
+    """Cached responses stay fresh until the next scheduled release."""
+
+    def test_data_hot_until_release(self, mock_abs_api):
+        set_release_calendar(_calendar(-24, 1))
+
+        async def fetch():
+            return await AsyncSDMXService.get_data_with_meta("CPI_M", "3.50")
+
+        _, first = asyncio.run(fetch())
+        _, second = asyncio.run(fetch())
+        assert (first["cache"], second["cache"]) == ("miss", "hit")
+        assert len(mock_abs_api.data_requests()) == 1
+
+        # Two hours later the release has happened: the entry is revalidated
+        later = time.time() + 2 * 3600
+        with patch.object(response_cache.time, "time", return_value=later):
+            _, third = asyncio.run(fetch())
+        assert third["cache"] == "miss"
+        assert len(mock_abs_api.data_requests()) == 2
+
+    def test_no_future_release_means_revalidate(self, mock_abs_api):
+        set_release_calendar(_calendar(-48, -24))
+        mock_abs_api.etag = '"v1"'
+
+        async def fetch():
+            return await AsyncSDMXService.get_data_with_meta("CPI_M", "3.50")
+
+        asyncio.run(fetch())
+        _, meta = asyncio.run(fetch())
+        assert meta["cache"] == "revalidated"
+
+    def test_structure_memory_cache_expires_at_release(self, mock_abs_api):
+        set_release_calendar(_calendar(1))
+        asyncio.run(AsyncSDMXService.get_structure("CPI_M"))
+
+        memory = get_memory_cache()
+        expires = memory._entries[("structure", "CPI_M")].expires
+        assert expires is not None and expires > time.time()
+
+        # After the release the memory entry is dropped and reloaded
+        structure = memory.get(("structure", "CPI_M"))
+        memory.set(("structure", "CPI_M"), {"stale": True}, expires=time.time() - 1)
+        assert asyncio.run(AsyncSDMXService.get_structure("CPI_M")) == structure
+
+    def test_structure_disk_ttl_is_next_release(self, isolated_disk_cache, mock_abs_api):
+        set_release_calendar(_calendar(1))
+        asyncio.run(AsyncSDMXService.get_structure("CPI_M"))
+
+        expires = isolated_disk_cache._conn.execute(
+            "SELECT expires FROM entries WHERE namespace = 'structure'"
+        ).fetchone()[0]
+        assert abs(expires - (time.time() + 3600)) < 60
@@ -0,0 +1,95 @@
+"""Tests for frequency conversion and LTTB downsampling."""
+
+import math
+
+import pytest
+
+from abs_mcp_server.observations import ObservationTable
+from abs_mcp_server.resample import downsample_table, lttb, resample_table, target_period
+
+
+def monthly_table(months=30, regions=("Sydney", "Perth")):
+    periods = [f"{2022 + m // 12}-{m % 12 + 1:02d}" for m in range(months)]
+    table = ObservationTable(["Region", "Time Period"], [list(regions), periods])
+    for r in range(len(regions)):
+        for m in range(months):
+            table.append(float(m + 100 * r), [r, m])
+    return table
+
+
+class TestTargetPeriod:
+    def test_coarser_periods(self):
+        assert target_period("2024-08", "Q") == "2024-Q3"
+        assert target_period("2024-08", "S") == "2024-S2"
+        assert target_period("2024-Q1", "A") == "2024"
+        assert target_period("2024-08-15", "M") == "2024-08"
+
+
+class TestResampleTable:
+    def test_annual_mean_per_series(self):
+        table, meta = resample_table(monthly_table(), "A")
+
+        records = table.to_records()
+        assert records[0] == {"value": 5.5, "Region": "Sydney", "Time Period": "2022"}
+        assert [r["Time Period"] for r in records] == ["2022", "2023", "2024"] * 2
+        assert meta["rows_before"] == 60 and meta["rows_after"] == 6
+        assert meta["from"] == ["M"]
+        # 2024 only has January-June
+        assert {"series": {"Region": "Sydney"}, "period": "2024", "observations": 6, "expected": 12} in meta["partial"]
+
+    def test_aggregations(self):
+        def first_value(aggregation):
+            return resample_table(monthly_table(), "Q", aggregation)[0].values[0]
+
+        assert first_value("sum") == 0 + 1 + 2
+        assert first_value("last") == 2
+        assert first_value("min") == 0
+        assert first_value("max") == 2
+
+    def test_end_of_period_skips_unfinished_periods(self):
+        table, _ = resample_table(monthly_table(months=14, regions=("Sydney",)), "A", "end")
+
+        assert table.to_records() == [{"value": 11.0, "Region": "Sydney", "Time Period": "2022"}]
+
+    def test_cannot_convert_to_finer_frequency(self):
+        table = ObservationTable(["Time Period"], [["2022", "2023"]])
+        table.append(1.0, [0])
+        with pytest.raises(ValueError):
+            resample_table(table, "M")
+
+    def test_unknown_aggregation(self):
+        with pytest.raises(ValueError):
+            resample_table(monthly_table(), "A", "median")
+
+
+class TestDownsample:
+    def test_lttb_keeps_ends_and_peak(self):
+        xs = [float(i) for i in range(100)]
+        ys = [math.sin(i / 5) for i in range(100)]
+        ys[50] = 10.0  # Spike
+
+        kept = lttb(xs, ys, 20)
+
+        assert len(kept) == 20
+        assert kept[0] == 0 and kept[-1] == 99
+        assert 50 in kept
+        assert kept == sorted(kept)
+
+    def test_per_series(self):
+        table, meta = downsample_table(monthly_table(months=30), 10)
+
+        assert len(table) == 20
+        assert meta["series_downsampled"] == 2
+        sydney = [r for r in table.to_records() if r["Region"] == "Sydney"]
+        assert sydney[0]["Time Period"] == "2022-01" and sydney[-1]["Time Period"] == "2024-06"
+
+    def test_short_series_untouched(self):
+        table = monthly_table(months=5)
+        result, meta = downsample_table(table, 10)
+
+        assert result is table
+        assert meta["series_downsampled"] == 0
+
+    def test_too_few_points(self):
+        with pytest.raises(ValueError):
+            downsample_table(monthly_table(), 2)
@@ -0,0 +1,222 @@
+"""Tests for the ETag / Last-Modified revalidation cache."""
+
+import asyncio
+import json
+from unittest.mock import Mock, patch
+
+from abs_mcp_server import server
+from abs_mcp_server.async_sdmx_service import AsyncSDMXService
+from abs_mcp_server.memory_cache import ByteBudgetCache
+from abs_mcp_server.response_cache import (
+    DiskResponseStore,
+    MemoryResponseStore,
+    ResponseCache,
+    get_response_cache,
+)
+from abs_mcp_server.sdmx_service import DATA_ACCEPT, SDMXService
+
+from test_sdmx_service import DATA_MESSAGE
+
+
+def _http_response(status, payload=None, headers=None):
+    response = Mock()
+    response.status_code = status
+    response.headers = headers or {}
+    response.content = json.dumps(payload).encode() if payload is not None else b""
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestResponseCache:
+    """Test validator storage and freshness."""
+
+    def test_stores_only_revalidatable_responses(self):
+        cache = ResponseCache(MemoryResponseStore(ByteBudgetCache(1024)))
+        cache.store_response("plain", {}, b"{}")
+        cache.store_response("tagged", {"ETag": '"v1"'}, b"{}")
+
+        assert cache.lookup("plain") == (None, {})
+        entry, headers = cache.lookup("tagged")
+        assert headers == {"If-None-Match": '"v1"'}
+        assert not cache.is_fresh(entry)
+
+    def test_max_age_is_fresh(self):
+        cache = ResponseCache(MemoryResponseStore(ByteBudgetCache(1024)))
+        cache.store_response("key", {"Cache-Control": "public, max-age=60"}, b"{}")
+
+        entry, _ = cache.lookup("key")
+        assert cache.is_fresh(entry)
+        cache.store_response("key", {"Cache-Control": "no-store", "ETag": "x"}, b"{}")
+        assert cache.lookup("key")[0] is entry  # no-store leaves the old entry untouched
+
+    def test_revalidation_updates_validators(self):
+        cache = ResponseCache(MemoryResponseStore(ByteBudgetCache(1024)))
+        cache.store_response("key", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, b"[1]")
+        entry, _ = cache.lookup("key")
+
+        assert cache.revalidated("key", entry, {"ETag": '"v2"'}) == b"[1]"
+        _, headers = cache.lookup("key")
+        assert headers == {"If-None-Match": '"v2"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+        assert cache.stats()["revalidated"] == 1 and cache.stats()["misses"] == 1
+
+    def test_memory_store_evicts_by_bytes(self):
+        store = MemoryResponseStore(ByteBudgetCache(10, compression="none"))
+        store.set("a", {"body": "123456"})
+        store.set("b", {"body": "123456"})
+
+        assert store.get("a") is None
+        assert store.get("b") is not None
+
+    def test_disk_backend_by_default(self, isolated_disk_cache):
+        cache = get_response_cache()
+
+        assert isinstance(cache.store, DiskResponseStore)
+        cache.store_response("key", {"ETag": "x"}, b"{}")
+        assert isolated_disk_cache.get("http", "key")["etag"] == "x"
+
+    def test_disk_backend_keeps_memory_tier(self, isolated_disk_cache):
+        cache = get_response_cache()
+        cache.store_response("key", {"ETag": "x"}, b"{}")
+        isolated_disk_cache.delete("http", "key")
+
+        # Served from the memory cache in front of the disk store
+        assert cache.lookup("key")[0]["etag"] == "x"
+
+
+class TestConditionalRequests:
+    """Unchanged responses come back as 304s and are served from the cache."""
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_sync_get_data_revalidates(self, mock_session):
+        session = mock_session.return_value
+        session.get.side_effect = [
+            _http_response(200, DATA_MESSAGE, {"ETag": '"v1"'}),
+            _http_response(304, headers={"ETag": '"v1"'}),
+        ]
+
+        first, first_meta = SDMXService.get_data_with_meta("CPI_M", "3.50")
+        second, second_meta = SDMXService.get_data_with_meta("CPI_M", "3.50")
+
+        assert second == first == DATA_MESSAGE
+        assert session.get.call_args.kwargs["headers"] == {"Accept": DATA_ACCEPT, "If-None-Match": '"v1"'}
+        assert (first_meta["cache"], second_meta["cache"]) == ("miss", "revalidated")
+        assert second_meta["bytes"] == 0 and second_meta["body_bytes"] == first_meta["bytes"]
+
+    def test_async_structure_and_data(self, mock_abs_api):
+        mock_abs_api.etag = '"v1"'
+
+        async def run():
+            data = await AsyncSDMXService.get_data_with_meta("CPI_M", "3.50")
+            again = await AsyncSDMXService.get_data_with_meta("CPI_M", "3.50")
+            return data, again
+
+        (data, meta), (again, again_meta) = asyncio.run(run())
+
+        assert again == data
+        assert again_meta["cache"] == "revalidated"
+        assert mock_abs_api.data_requests()[1].headers["If-None-Match"] == '"v1"'
+
+    def test_tool_stream_revalidates(self, mock_abs_api):
+        mock_abs_api.etag = '"v1"'
+        filters = {"MEASURE": "3", "REGION": "50"}
+
+        first = asyncio.run(server.get_dataset_data("CPI_M", filters=filters))
+        second = asyncio.run(server.get_dataset_data("CPI_M", filters=filters))
+
+        assert second["data_sample"] == first["data_sample"]
+        assert (first["transfer"]["cache"], second["transfer"]["cache"]) == ("miss", "revalidated")
+        assert second["transfer"]["bytes_transferred"] == 0
+        stats = asyncio.run(server.get_service_stats())["response_cache"]
+        assert stats["revalidated"] == 1
+
+    def test_fresh_entry_skips_request(self, mock_abs_api):
+        cache = get_response_cache()
+        url, params = SDMXService._data_request("CPI_M", "3.50")
+        cache.store_response(
+            ResponseCache.key(url, params, DATA_ACCEPT), {"Cache-Control": "max-age=300"},
+            json.dumps(DATA_MESSAGE).encode()
+        )
+
+        data, meta = asyncio.run(AsyncSDMXService.get_data_with_meta("CPI_M", "3.50"))
+
+        assert data == DATA_MESSAGE and meta["cache"] == "hit"
+        assert mock_abs_api.data_requests() == []
+
+    def test_async_cache_io_runs_off_the_event_loop(self, mock_abs_api):
+        import threading
+
+        cache = get_response_cache()
+        threads = []
+        lookup, store = cache.lookup, cache.store_response
+
+        def record(method):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return method(*args)
+            return wrapper
+
+        with patch.object(cache, "lookup", record(lookup)), patch.object(cache, "store_response", record(store)):
+            asyncio.run(server.get_dataset_data("CPI_M", filters={"MEASURE": "3", "REGION": "50"}))
+
+        assert threads and threading.get_ident() not in threads
+
+    def test_cached_body_is_parsed_off_the_event_loop(self, mock_abs_api):
+        import threading
+
+        threads = []
+        parse = SDMXService._parse_cached_body
+
+        def record(*args):
+            threads.append(threading.get_ident())
+            return parse(*args)
+
+        filters = {"MEASURE": "3", "REGION": "50"}
+        with patch.object(SDMXService, "_parse_cached_body", record):
+            mock_abs_api.etag = '"v1"'
+            asyncio.run(server.get_dataset_data("CPI_M", filters=filters))
+            second = asyncio.run(server.get_dataset_data("CPI_M", filters=filters))
+
+        assert second["transfer"]["cache"] == "revalidated"
+        assert threads and threading.get_ident() not in threads
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_bytes_count_the_compressed_transfer(self, mock_session):
+        import gzip
+        import io
+
+        import requests
+        from urllib3 import HTTPResponse
+
+        body = json.dumps(DATA_MESSAGE).encode() * 20
+        compressed = gzip.compress(body)
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = HTTPResponse(
+            body=io.BytesIO(compressed), headers={"Content-Encoding": "gzip"}, preload_content=False
+        )
+        mock_session.return_value.get.return_value = response
+
+        status, content, meta = SDMXService._conditional_get("https://abs.test/data/CPI_M", None, DATA_ACCEPT)
+
+        assert content == body
+        assert meta["bytes"] == len(compressed) < meta["body_bytes"] == len(body)
+
+    def test_async_bytes_count_the_compressed_transfer(self):
+        import gzip
+
+        import httpx
+        from abs_mcp_server import async_sdmx_service
+
+        body = json.dumps(DATA_MESSAGE).encode() * 20
+        compressed = gzip.compress(body)
+        client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(200, content=compressed, headers={"Content-Encoding": "gzip"})
+        ))
+
+        with patch.object(async_sdmx_service, "_get_client", return_value=client):
+            status, content, meta = asyncio.run(
+                async_sdmx_service._conditional_get("https://abs.test/data/CPI_M", None, DATA_ACCEPT)
+            )
+
+        assert content == body
+        assert meta["bytes"] == len(compressed) < meta["body_bytes"] == len(body)
@@ -0,0 +1,91 @@
+"""Tests for fitting data tool results into a response budget."""
+
+from unittest.mock import patch
+
+from abs_mcp_server import response_shaping
+from abs_mcp_server.observations import ObservationTable
+from abs_mcp_server.response_shaping import response_budget, response_size, series_rows, shape_rows
+
+
+def build_table(regions=("Sydney", "Melbourne", "Perth"), periods=100):
+    months = [f"{2010 + p // 12}-{p % 12 + 1:02d}" for p in range(periods)]
+    table = ObservationTable(
+        ["Measure", "Region", "Time Period"],
+        [["Percentage change from previous period"], list(regions), months]
+    )
+    for r in range(len(regions)):
+        for p in range(periods):
+            table.append(float(p + r), [0, r, p])
+    return table
+
+
+class TestResponseBudget:
+    def test_smaller_limit_wins(self):
+        assert response_budget(10000, 1000) == 4000
+        assert response_budget(3000, 1000) == 3000
+
+    def test_config_default_and_unlimited(self):
+        with patch.object(response_shaping.Config, "RESPONSE_MAX_BYTES", 5000):
+            assert response_budget() == 5000
+        assert response_budget(0) is None
+
+
+class TestShapeRows:
+    def test_full_without_budget(self):
+        table = build_table()
+        payload, shaping = shape_rows(table, "records", None)
+
+        assert len(payload["data_sample"]) == 300
+        assert shaping["strategy"] == "full"
+        assert shaping["rows_dropped"] == 0
+
+    def test_compact_when_records_do_not_fit(self):
+        table = build_table()
+        compact_size = response_size({"table": table.to_compact()})
+        payload, shaping = shape_rows(table, "records", compact_size + 10)
+
+        assert shaping["strategy"] == "compact"
+        assert len(payload["table"]["rows"]) == 300
+        assert shaping["response_bytes"] <= compact_size + 10
+
+    def test_series_tail_keeps_every_series(self):
+        table = build_table()
+        payload, shaping = shape_rows(table, "compact", 4000)
+
+        assert shaping["strategy"] == "series_tail"
+        count = shaping["periods_per_series"]
+        assert 1 <= count < 100
+        assert shaping["response_bytes"] <= 4000
+        rows = payload["table"]["rows"]
+        assert len(rows) == 3 * count
+        assert {row[0] for row in rows} == {"Sydney", "Melbourne", "Perth"}
+        # Latest periods are kept; the dropped ones are listed exactly
+        assert rows[-1] == ["Perth", "2018-04", 101.0]
+        assert shaping["dropped"][0] == {
+            "series": {"Region": "Sydney"},
+            "rows_dropped": 100 - count,
+            "periods": ["2010-01", table.labels[2][99 - count]],
+        }
+        assert shaping["rows_dropped"] == 3 * (100 - count)
+
+    def test_series_head_when_keeping_first(self):
+        payload, shaping = shape_rows(build_table(), "compact", 4000, keep="first")
+
+        assert payload["table"]["rows"][0] == ["Sydney", "2010-01", 0.0]
+        assert shaping["dropped"][0]["periods"][1] == "2018-04"
+
+    def test_summary_when_nothing_else_fits(self):
+        table = build_table(periods=5)
+        payload, shaping = shape_rows(table, "records", 500)
+
+        assert shaping["strategy"] == "summary"
+        assert shaping["rows_returned"] == 0
+        sydney = payload["summary"][0]
+        assert sydney["series"] == {"Region": "Sydney"}
+        assert sydney["first"] == ["2010-01", 0.0]
+        assert sydney["last"] == ["2010-05", 4.0]
+        assert sydney["max"] == ["2010-05", 4.0]
+        assert sydney["mean"] == 2.0
+
+    def test_series_rows(self):
+        assert [len(rows) for rows in series_rows(build_table(periods=4))] == [4, 4, 4]
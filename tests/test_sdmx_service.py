@@ -0,0 +1,263 @@
+"""Offline tests for SDMXService (HTTP mocked)."""
+
+import json
+
+import pytest
+from unittest.mock import Mock, patch
+from abs_mcp_server.sdmx_service import SDMXService, _parse_urn
+
+
+DATAFLOW_MESSAGE = {
+    "data": {
+        "dataflows": [
+            {
+                "id": "CPI_M",
+                "agencyID": "ABS",
+                "version": "1.0.0",
+                "name": "Monthly Consumer Price Index",
+                "description": "Monthly CPI indicator",
+                "structure": "urn:sdmx:org.sdmx.infomodel.datastructure.DataStructure=ABS:CPI_M(1.0.0)",
+            }
+        ]
+    }
+}
+
+DSD_MESSAGE = {
+    "data": {
+        "dataStructures": [
+            {
+                "id": "CPI_M",
+                "dataStructureComponents": {
+                    "dimensionList": {
+                        "dimensions": [
+                            {
+                                "id": "REGION",
+                                "position": 1,
+                                "conceptIdentity": "urn:sdmx:org.sdmx.infomodel.conceptscheme.Concept=ABS:CS_CPI(1.0.0).REGION",
+                                "localRepresentation": {
+                                    "enumeration": "urn:sdmx:org.sdmx.infomodel.codelist.Codelist=ABS:CL_REGION(1.0.0)"
+                                },
+                            },
+                            {
+                                "id": "MEASURE",
+                                "position": 0,
+                                "conceptIdentity": "urn:sdmx:org.sdmx.infomodel.conceptscheme.Concept=ABS:CS_CPI(1.0.0).MEASURE",
+                                "localRepresentation": {
+                                    "enumeration": "urn:sdmx:org.sdmx.infomodel.codelist.Codelist=ABS:CL_MEASURE(1.0.0)"
+                                },
+                            },
+                        ],
+                        "timeDimensions": [
+                            {
+                                "id": "TIME_PERIOD",
+                                "position": 2,
+                                "conceptIdentity": "urn:sdmx:org.sdmx.infomodel.conceptscheme.Concept=ABS:CS_CPI(1.0.0).TIME_PERIOD",
+                            }
+                        ],
+                    }
+                },
+            }
+        ],
+        "codelists": [
+            {
+                "id": "CL_MEASURE",
+                "agencyID": "ABS",
+                "version": "1.0.0",
+                "codes": [{"id": "1", "name": "Index Numbers"}, {"id": "3", "name": "Percentage Change"}],
+            },
+            {
+                "id": "CL_REGION",
+                "agencyID": "ABS",
+                "version": "1.0.0",
+                "codes": [{"id": "50", "name": "Weighted average of eight capital cities"}],
+            },
+        ],
+        "conceptSchemes": [
+            {
+                "id": "CS_CPI",
+                "concepts": [
+                    {"id": "MEASURE", "name": "Measure"},
+                    {"id": "REGION", "name": "Region"},
+                    {"id": "TIME_PERIOD", "name": "Time Period"},
+                ],
+            }
+        ],
+    }
+}
+
+DATA_MESSAGE = {
+    "data": {
+        "dataSets": [
+            {
+                "series": {
+                    "0:0": {"observations": {"0": [1.5], "1": [2.0]}},
+                }
+            }
+        ],
+        "structures": [
+            {
+                "name": "Monthly Consumer Price Index",
+                "dimensions": {
+                    "series": [
+                        {"id": "MEASURE", "name": "Measure", "values": [{"id": "3", "name": "Percentage Change"}]},
+                        {"id": "REGION", "name": "Region", "values": [{"id": "50", "name": "Weighted average"}]},
+                    ],
+                    "observation": [
+                        {
+                            "id": "TIME_PERIOD",
+                            "name": "Time Period",
+                            "values": [{"id": "2025-01", "name": "2025-01"}, {"id": "2025-02", "name": "2025-02"}],
+                        }
+                    ],
+                },
+            }
+        ],
+    }
+}
+
+
+def _response(payload):
+    response = Mock()
+    response.json.return_value = payload
+    response.content = json.dumps(payload).encode()
+    response.status_code = 200
+    response.headers = {}
+    response.raise_for_status.return_value = None
+    return response
+
+
+class TestParseUrn:
+    """Test SDMX URN splitting."""
+
+    def test_artefact_urn(self):
+        ref = _parse_urn("urn:sdmx:org.sdmx.infomodel.codelist.Codelist=ABS:CL_REGION(1.0.0)")
+        assert ref == {"agency": "ABS", "id": "CL_REGION", "version": "1.0.0", "item": None}
+
+    def test_item_urn(self):
+        ref = _parse_urn("urn:sdmx:org.sdmx.infomodel.conceptscheme.Concept=ABS:CS_CPI(1.0.0).MEASURE")
+        assert ref["id"] == "CS_CPI"
+        assert ref["item"] == "MEASURE"
+
+
+class TestGetStructure:
+    """Test structure-only lookup via dataflow/datastructure endpoints."""
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_resolves_dataflow_dsd_and_codelists(self, mock_session):
+        session = mock_session.return_value
+        session.get.side_effect = [_response(DATAFLOW_MESSAGE), _response(DSD_MESSAGE)]
+
+        structure = SDMXService.get_structure("CPI_M")
+
+        urls = [c.args[0] for c in session.get.call_args_list]
+        assert urls[0].endswith("/dataflow/ABS/CPI_M")
+        assert urls[1].endswith("/datastructure/ABS/CPI_M/1.0.0")
+        for c in session.get.call_args_list:
+            assert c.kwargs["params"] == {"references": "children"}
+            assert "/data/" not in c.args[0]
+
+        assert structure["name"] == "Monthly Consumer Price Index"
+        assert structure["description"] == "Monthly CPI indicator"
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_shape_matches_parse_dimensions(self, mock_session):
+        session = mock_session.return_value
+        session.get.side_effect = [_response(DATAFLOW_MESSAGE), _response(DSD_MESSAGE)]
+
+        structure = SDMXService.get_structure("CPI_M")
+        dims = SDMXService.parse_dimensions(structure)
+
+        # Ordered by DSD position, time dimension last
+        assert [d["id"] for d in dims] == ["MEASURE", "REGION", "TIME_PERIOD"]
+        assert dims[0]["name"] == "Measure"
+        assert dims[0]["values"][1] == {"id": "3", "name": "Percentage Change"}
+        assert dims[2]["values"] == []
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_missing_dataflow_raises(self, mock_session):
+        mock_session.return_value.get.return_value = _response({"data": {"dataflows": []}})
+
+        with pytest.raises(ValueError):
+            SDMXService.get_structure("NOPE")
+
+
+class TestOrKeys:
+    """Test compiling filter sets into SDMX OR-keys."""
+
+    DIMENSIONS = [{"id": "MEASURE"}, {"id": "REGION"}, {"id": "TIME_PERIOD"}]
+
+    def test_expand_filters(self):
+        assert SDMXService.expand_filters({"MEASURE": "3", "REGION": ["1", "2"]}) == [
+            {"MEASURE": "3", "REGION": "1"}, {"MEASURE": "3", "REGION": "2"}
+        ]
+        assert len(SDMXService.expand_filters({"MEASURE": "1+3", "REGION": "1+2"})) == 4
+
+    def test_product_shares_one_key(self):
+        sets = SDMXService.expand_filters({"MEASURE": ["1", "3"], "REGION": ["1", "2"]})
+        assert SDMXService.build_or_keys(self.DIMENSIONS, sets) == [("1+3.1+2", [0, 1, 2, 3])]
+
+    def test_scattered_sets_grouped_exactly(self):
+        sets = [{"MEASURE": str(m), "REGION": str(m)} for m in range(1, 6)]  # Diagonal: 25 combos for 5
+
+        groups = SDMXService.build_or_keys(self.DIMENSIONS, sets)
+        assert len(groups) == 5
+        assert groups[0] == ("1.1", [0])
+        assert SDMXService.build_or_keys(self.DIMENSIONS, sets, max_expansion=5)[0][0] == "1+2+3+4+5.1+2+3+4+5"
+
+
+class TestHTTPPool:
+    """Test the shared keep-alive connection pool against a local server."""
+
+    @pytest.fixture
+    def local_server(self):
+        import threading
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                body = b'{"data": {}}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+        server.shutdown()
+
+    def test_connections_are_reused(self, local_server):
+        from abs_mcp_server.http_pool import HTTPPool
+
+        pool = HTTPPool(pool_maxsize=2)
+        for _ in range(3):
+            pool.session.get(f"{local_server}/dataflow", timeout=5).raise_for_status()
+
+        stats = pool.stats()
+        assert stats["requests"] == 3
+        assert stats["connections_opened"] == 1
+        assert stats["connections_reused"] == 2
+        pool.close()
+        assert pool.stats()["requests"] == 0
+
+    def test_service_methods_share_one_session(self):
+        from abs_mcp_server import sdmx_service
+
+        assert sdmx_service._get_session() is sdmx_service._get_session()
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_get_data_uses_pooled_session(self, mock_session):
+        response = _response({"data": {"dataSets": []}})
+        response.status_code = 200
+        mock_session.return_value.get.return_value = response
+
+        SDMXService.get_data("CPI_M", "3.10001.10.50.M")
+
+        assert mock_session.return_value.get.call_args.args[0].endswith("/data/CPI_M/3.10001.10.50.M")
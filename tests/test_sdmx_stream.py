@@ -0,0 +1,163 @@
+"""Tests for incremental SDMX-JSON data parsing."""
+
+import asyncio
+import copy
+import json
+from unittest.mock import patch
+
+import pytest
+
+from abs_mcp_server import sdmx_stream, server
+from abs_mcp_server.sdmx_service import SDMXService
+from abs_mcp_server.sdmx_stream import StreamingDataParser
+
+from test_sdmx_service import DATA_MESSAGE
+
+
+def _message(n_series=3, n_periods=10, structure_first=True):
+    """Data message with n_series series of n_periods observations."""
+    structure = copy.deepcopy(DATA_MESSAGE["data"]["structures"][0])
+    structure["dimensions"]["series"][1]["values"] = [
+        {"id": str(s), "name": f"Region {s}"} for s in range(n_series)
+    ]
+    structure["dimensions"]["observation"][0]["values"] = [
+        {"id": str(p), "name": f"P{p}"} for p in range(n_periods)
+    ]
+    data_sets = [{"series": {
+        f"0:{s}": {"attributes": [0], "observations": {str(p): [float(s * 100 + p)] for p in range(n_periods)}}
+        for s in range(n_series)
+    }}]
+    data = {"structures": [structure], "dataSets": data_sets} if structure_first else \
+        {"dataSets": data_sets, "structures": [structure]}
+    return {"meta": {"id": "test"}, "data": data}
+
+
+def _parse(message, chunk_size=7, **kwargs):
+    body = json.dumps(message).encode()
+    parser = StreamingDataParser(**kwargs)
+    for i in range(0, len(body), chunk_size):
+        if parser.feed(body[i:i + chunk_size]):
+            break
+    return parser.close(), parser
+
+
+def _records(data):
+    dims = SDMXService.parse_dimensions(SDMXService._parse_structure(data))
+    return SDMXService.parse_observations(data, dims)
+
+
+class TestStreamingDataParser:
+    """Test chunked parsing and bounded retention."""
+
+    def test_matches_full_parse(self):
+        message = _message()
+        data, parser = _parse(message)
+
+        assert _records(data) == _records(message)
+        assert parser.meta()["observations"] == 30
+        assert parser.meta()["series_lengths"] == [10, 10, 10]
+        assert parser.complete
+
+    def test_keep_last_retains_latest(self):
+        message = _message(structure_first=False)
+        data, parser = _parse(message, max_observations=15)
+
+        assert _records(data) == _records(message)[-15:]
+        assert parser.meta()["observations"] == 30
+        assert parser.meta()["observations_kept"] == 15
+
+    @pytest.mark.parametrize("structure_first", [True, False])
+    def test_keep_last_ranks_by_period(self, structure_first):
+        message = _message(n_series=1, structure_first=structure_first)
+        structure = message["data"]["structures"][0]
+        structure["dimensions"]["observation"][0]["values"] = [
+            {"id": f"2024-{m:02d}", "name": f"2024-{m:02d}"} for m in range(1, 11)
+        ]
+        # Upstream lists the newest observation first
+        series = message["data"]["dataSets"][0]["series"]["0:0"]
+        series["observations"] = dict(reversed(list(series["observations"].items())))
+
+        data, parser = _parse(message, max_observations=4)
+
+        periods = sorted(record["Time Period"] for record in _records(data))
+        assert periods == ["2024-07", "2024-08", "2024-09", "2024-10"]
+        assert parser.meta()["observations_kept"] == 4
+
+    def test_keep_first_stops_early(self):
+        message = _message(n_series=50)
+        body_size = len(json.dumps(message).encode())
+        data, parser = _parse(message, chunk_size=256, max_observations=5, keep="first")
+
+        assert _records(data) == _records(message)[:5]
+        assert not parser.complete
+        assert parser.bytes_read < body_size / 2
+
+    def test_keep_first_waits_for_trailing_structure(self):
+        message = _message(structure_first=False)
+        data, parser = _parse(message, max_observations=5, keep="first")
+
+        # Observations after the limit are counted but not kept
+        assert _records(data) == _records(message)[:5]
+        assert parser.meta()["observations"] == 30
+        assert parser.meta()["observations_kept"] == 5
+
+    def test_flat_observations(self):
+        message = {
+            "dataSets": [{"observations": {"0:0": [1], "1:0": [2]}}],
+            "structure": {"dimensions": {"observation": [
+                {"id": "REGION", "name": "Region", "values": [{"id": "1", "name": "NSW"}, {"id": "2", "name": "VIC"}]},
+                {"id": "TIME_PERIOD", "name": "Time Period", "values": [{"id": "2021", "name": "2021"}]},
+            ]}},
+        }
+        data, _ = _parse(message)
+
+        assert _records(data) == _records(message)
+
+    def test_without_ijson(self):
+        message = _message()
+        with patch.object(sdmx_stream, "ijson", None):
+            data, parser = _parse(message, max_observations=4)
+
+        assert _records(data) == _records(message)[-4:]
+        assert parser.meta()["observations"] == 30
+
+    def test_invalid_keep(self):
+        with pytest.raises(ValueError):
+            StreamingDataParser(keep="middle")
+
+
+class TestSyncStreaming:
+    """`SDMXService.stream_data_with_meta` reads the response in chunks."""
+
+    @patch("abs_mcp_server.sdmx_service._get_session")
+    def test_stops_reading_early(self, mock_session):
+        body = json.dumps(_message(n_series=50)).encode()
+        response = mock_session.return_value.get.return_value
+        response.status_code = 200
+        response.headers = {}
+        chunks = [body[i:i + 512] for i in range(0, len(body), 512)]
+        response.iter_content.return_value = iter(chunks)
+
+        data, meta = SDMXService.stream_data_with_meta("CPI_M", max_observations=3, keep="first")
+
+        assert mock_session.return_value.get.call_args.kwargs["stream"] is True
+        assert len(_records(data)) == 3
+        assert meta["bytes"] < len(body) and meta["complete"] is False
+        response.close.assert_called_once()
+
+
+class TestServerStreaming:
+    """`get_dataset_data` keeps at most MAX_OBS observations while parsing."""
+
+    def test_truncates_to_latest(self, mock_abs_api):
+        message = _message(n_series=1, n_periods=server.MAX_OBS + 50)
+        message["data"]["structures"][0]["dimensions"]["series"][1]["values"] = \
+            [{"id": "50", "name": "Weighted average"}]
+        mock_abs_api.data = message
+
+        result = asyncio.run(server.get_dataset_data("CPI_M", filters={"MEASURE": "3", "REGION": "50"}))
+
+        assert result["truncated"] is True
+        assert result["total_observations_found"] == server.MAX_OBS + 50
+        assert len(result["data_sample"]) == server.MAX_OBS
+        assert result["data_sample"][-1]["Time Period"] == f"P{server.MAX_OBS + 49}"
@@ -0,0 +1,186 @@
+"""Tests for the incremental series store and period ranges."""
+
+import asyncio
+import copy
+from datetime import date
+
+import pytest
+
+from abs_mcp_server.async_sdmx_service import AsyncSDMXService
+from abs_mcp_server.periods import (
+    UNKNOWN_PERIOD, convert_ordinal, format_end, format_start, ordinal_period, period_bounds,
+    period_days, period_index, period_ordinal, shift_ordinal
+)
+from abs_mcp_server.series_store import (
+    OPEN, SeriesEntry, gap_periods, load_series, request_days, save_series
+)
+from abs_mcp_server.sdmx_service import SDMXService
+from test_sdmx_service import DATA_MESSAGE
+
+TODAY = date(2026, 10, 17)
+
+
+def _day(text):
+    return date.fromisoformat(text).toordinal()
+
+
+class TestPeriods:
+    """Test SDMX period strings as day ranges."""
+
+    def test_bounds(self):
+        assert period_bounds("2024") == (date(2024, 1, 1), date(2024, 12, 31))
+        assert period_bounds("2024-S2") == (date(2024, 7, 1), date(2024, 12, 31))
+        assert period_bounds("2024-Q1") == (date(2024, 1, 1), date(2024, 3, 31))
+        assert period_bounds("2024-02") == (date(2024, 2, 1), date(2024, 2, 29))
+        assert period_bounds("2024-W01") == (date(2024, 1, 1), date(2024, 1, 7))
+        assert period_bounds("2024-02-10") == (date(2024, 2, 10), date(2024, 2, 10))
+
+    def test_unsupported(self):
+        for period in ("2024-Q5", "FY2024", "24-01"):
+            with pytest.raises(ValueError):
+                period_bounds(period)
+
+    def test_ordinals(self):
+        assert period_ordinal("2024") == ("A", 2024)
+        assert period_ordinal("2024-Q3") == ("Q", 2024 * 4 + 2)
+        assert period_ordinal("2024-07") == ("M", 2024 * 12 + 6)
+        for period in ("2024", "2024-S2", "2024-Q3", "2024-07", "2024-W05", "2024-07-15"):
+            assert ordinal_period(*period_ordinal(period)) == period
+            first, last = period_bounds(period)
+            assert period_days(period) == (first.toordinal(), last.toordinal())
+
+    def test_ordinal_arithmetic(self):
+        frequency, ordinal = period_ordinal("2024-12")
+        assert ordinal_period(frequency, ordinal + 1) == "2025-01"
+        assert ordinal_period("Q", convert_ordinal(frequency, ordinal, "Q")) == "2024-Q4"
+        assert ordinal_period("A", convert_ordinal("W", period_ordinal("2024-W05")[1], "A")) == "2024"
+
+    def test_period_index(self):
+        index = period_index(["2024-02", "2023", "n/a"])
+
+        assert index.frequencies == ["M", "A", None]
+        assert list(index.starts) == [_day("2024-02-01"), _day("2023-01-01"), UNKNOWN_PERIOD]
+        assert index.start(7) == UNKNOWN_PERIOD
+        assert period_index(["2024-02", "2023", "n/a"]) is index
+        assert index.order() == [2, 1, 0]
+        with pytest.raises(ValueError, match="n/a"):
+            period_index(["2024-02", "2023", "n/a"], strict=True)
+
+    def test_year_earlier(self):
+        index = period_index(["2024-Q1", "2023-Q1", "2021-W01", "2020-W01", "2020-W53", "2024-02-29", "2023-02-28"])
+
+        # 2019 has no week 53 and 2023 no 29 February
+        assert index.year_earlier() == [1, None, 3, None, None, None, None]
+        assert list(index.ends[:2]) == [_day("2024-03-31"), _day("2023-03-31")]
+        assert shift_ordinal("W", period_ordinal("2024-W05")[1], -1) == period_ordinal("2023-W05")[1]
+        assert shift_ordinal("D", period_ordinal("2024-02-29")[1], -1) is None
+
+    def test_format(self):
+        assert format_start(date(2024, 1, 1)) == "2024"
+        assert format_start(date(2024, 4, 1)) == "2024-04"
+        assert format_end(date(2024, 3, 31)) == "2024-03"
+        assert format_end(date(2024, 3, 30)) == "2024-03-30"
+
+
+class TestSeriesEntry:
+    """Test coverage bookkeeping and message building."""
+
+    def _entry(self):
+        entry = SeriesEntry()
+        dimensions = SDMXService.parse_dimensions(SDMXService._parse_structure(DATA_MESSAGE))
+        entry.merge(DATA_MESSAGE, dimensions, "CPI", (_day("2025-01-01"), _day("2025-02-28")))
+        return entry
+
+    def test_gaps_around_coverage(self):
+        entry = self._entry()
+
+        assert entry.gaps(_day("2025-01-01"), _day("2025-02-28")) == []
+        gaps = entry.gaps(_day("2024-07-01"), OPEN)
+        assert gaps == [(_day("2024-07-01"), _day("2024-12-31")), (_day("2025-03-01"), OPEN)]
+        assert [gap_periods(gap) for gap in gaps] == [("2024-07", "2024"), ("2025-03", None)]
+
+    def test_request_end_today_or_later_is_open(self):
+        assert request_days("2024", "2026", today=TODAY) == (_day("2024-01-01"), OPEN)
+        assert request_days(None, "2025-06", today=TODAY)[1] == _day("2025-06-30")
+
+    def test_message_filters_range(self):
+        entry = self._entry()
+
+        data, counts = entry.message(_day("2025-02-01"), OPEN)
+        assert counts["observations"] == 1
+        records = SDMXService.parse_observations(
+            data, SDMXService.parse_dimensions(SDMXService._parse_structure(data))
+        )
+        assert records == [
+            {"Measure": "Percentage Change", "Region": "Weighted average", "Time Period": "2025-02", "value": 2.0}
+        ]
+        assert entry.message(_day("2020-01-01"), _day("2020-12-31")) == ({}, {
+            "observations": 0, "observations_kept": 0, "series_lengths": [], "series_totals": {}
+        })
+
+    def test_limit_trims_every_series_to_its_latest_periods(self):
+        message = copy.deepcopy(DATA_MESSAGE)
+        structure = message["data"]["structures"][0]
+        structure["dimensions"]["series"][1]["values"].append({"id": "1", "name": "Sydney"})
+        structure["dimensions"]["observation"][0]["values"].append({"id": "2025-03", "name": "2025-03"})
+        message["data"]["dataSets"][0]["series"] = {
+            "0:0": {"observations": {"0": [1.0], "1": [2.0], "2": [3.0]}},
+            "0:1": {"observations": {"0": [10.0], "1": [20.0], "2": [30.0]}},
+        }
+        entry = SeriesEntry()
+        dimensions = SDMXService.parse_dimensions(SDMXService._parse_structure(message))
+        entry.merge(message, dimensions, "CPI", (_day("2025-01-01"), _day("2025-03-31")))
+
+        data, counts = entry.message(_day("2025-01-01"), OPEN, max_observations=4)
+        records = SDMXService.parse_observations(
+            data, SDMXService.parse_dimensions(SDMXService._parse_structure(data))
+        )
+
+        assert counts == {
+            "observations": 6, "observations_kept": 4, "series_lengths": [3, 3],
+            "series_totals": {"0:0": 3, "0:1": 3},
+        }
+        assert sorted((r["Region"], r["Time Period"]) for r in records) == [
+            ("Sydney", "2025-02"), ("Sydney", "2025-03"),
+            ("Weighted average", "2025-02"), ("Weighted average", "2025-03"),
+        ]
+
+        data, _ = entry.message(_day("2025-01-01"), OPEN, max_observations=2, keep="first")
+        records = SDMXService.parse_observations(
+            data, SDMXService.parse_dimensions(SDMXService._parse_structure(data))
+        )
+        assert {r["Time Period"] for r in records} == {"2025-01"}
+
+    def test_stale_open_coverage_refetches_latest_period(self):
+        entry = self._entry()
+        entry.merge({}, [], None, (_day("2025-03-01"), OPEN), open_until=None)
+
+        assert entry.gaps(_day("2025-01-01"), OPEN) == [(_day("2025-02-01"), OPEN)]
+
+    def test_loaded_entry_does_not_share_cached_state(self):
+        save_series("CPI_M", "3.50", self._entry(), cost=1.0)
+
+        entry = load_series("CPI_M", "3.50")
+        entry.merge({}, [], None, (_day("2025-03-01"), _day("2025-03-31")))
+
+        assert load_series("CPI_M", "3.50").coverage == [[_day("2025-01-01"), _day("2025-02-28")]]
+
+
+class TestSeriesData:
+    """Repeat period-range requests only fetch what is missing."""
+
+    def test_delta_then_hit(self, mock_abs_api):
+        def fetch(start, end):
+            return asyncio.run(AsyncSDMXService.get_series_data("CPI_M", "3.50", start, end))
+
+        data, meta = fetch("2025-01", "2025-02")
+        assert meta["cache"] == "series-delta" and meta["observations"] == 2
+
+        _, meta = fetch("2025-01", "2025-02")
+        assert meta["cache"] == "series-hit" and meta["bytes"] == 0
+        assert len(mock_abs_api.data_requests()) == 1
+
+        _, meta = fetch("2024-07", "2025-02")
+        assert meta["gaps"] == [["2024-07", "2024"]]
+        params = mock_abs_api.data_requests()[1].url.params
+        assert (params["startPeriod"], params["endPeriod"]) == ("2024-07", "2024")
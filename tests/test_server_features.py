@@ -1,3 +1,4 @@
+import asyncio
 import sys
 import os
 import json
@@ -9,7 +10,7 @@ from abs_mcp_server.server import get_dataset_structure, get_dataset_data, searc
 
 def test_server_logic():
     print("1. Searching for datasets...")
-    results = search_datasets(keyword="CPI", limit=1)
+    results = asyncio.run(search_datasets(keyword="CPI", limit=1))
     if not results:
         print("No datasets found.")
         return
@@ -18,7 +19,7 @@ def test_server_logic():
     print(f"Targeting: {dataset_id}")
     
     print("\n2. Getting Structure...")
-    struct = get_dataset_structure(dataset_id)
+    struct = asyncio.run(get_dataset_structure(dataset_id))
     if "error" in struct:
         print("Error getting structure:", struct["error"])
         return
@@ -42,7 +43,7 @@ def test_server_logic():
     
     # 4. Fetch Data
     # Note: The tool expects 'dataset_id' and 'filters'
-    data = get_dataset_data(dataset_id=dataset_id, filters=filters)
+    data = asyncio.run(get_dataset_data(dataset_id=dataset_id, filters=filters))
     
     if "error" in data:
         print("Error getting data:", data["error"])
@@ -0,0 +1,353 @@
+"""Tests for the MCP tool functions in server.py (ABS API mocked)."""
+
+import asyncio
+import copy
+from unittest.mock import patch
+
+from abs_mcp_server import server
+from abs_mcp_server.sdmx_service import SDMXService
+
+
+FILTERS = {"MEASURE": "3", "REGION": "50"}
+
+
+class TestLastNObservations:
+    """`get_dataset_data` pushes latest-N truncation down to the API."""
+
+    def test_request_params(self):
+        _, params = SDMXService._data_request("CPI_M", "3.50", last_n_observations=12)
+        assert params == {"detail": "full", "lastNObservations": "12"}
+
+        _, params = SDMXService._data_request("CPI_M", "3.50", first_n_observations=5)
+        assert params == {"detail": "full", "firstNObservations": "5"}
+
+    def test_latest_path_uses_last_n_by_default(self, mock_abs_api):
+        result = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS))
+
+        params = mock_abs_api.data_requests()[0].url.params
+        assert params["lastNObservations"] == str(server.MAX_OBS)
+        assert result["transfer"]["last_n_observations"] == server.MAX_OBS
+        assert result["transfer"]["bytes_transferred"] > 0
+
+    def test_explicit_period_range_is_not_limited(self, mock_abs_api):
+        asyncio.run(server.get_dataset_data("CPI_M", start_period="2024-01", filters=FILTERS))
+
+        params = mock_abs_api.data_requests()[0].url.params
+        assert "lastNObservations" not in params
+        assert params["startPeriod"] == "2024-01"
+
+    def test_first_and_last_n(self, mock_abs_api):
+        result = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, last_n_observations=2))
+        asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, first_n_observations=1))
+
+        first, second = mock_abs_api.data_requests()
+        assert first.url.params["lastNObservations"] == "2"
+        assert second.url.params["firstNObservations"] == "1"
+        # The single mock series has exactly 2 observations -> limit reached
+        assert result["transfer"]["upstream_truncated"] is True
+
+    def test_bytes_saved_after_full_fetch(self, mock_abs_api):
+        from test_sdmx_service import DATA_MESSAGE
+        import copy
+
+        full = copy.deepcopy(DATA_MESSAGE)
+        full["data"]["dataSets"][0]["series"]["0:0"]["observations"].update(
+            {str(i): [float(i)] for i in range(2, 50)}
+        )
+        mock_abs_api.data = lambda request: DATA_MESSAGE if "lastNObservations" in request.url.params else full
+
+        unbounded = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, last_n_observations=0))
+        latest = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, last_n_observations=2))
+
+        assert "lastNObservations" not in mock_abs_api.data_requests()[0].url.params
+        assert unbounded["transfer"]["bytes_saved"] is None
+        saved = latest["transfer"]["bytes_saved"]
+        assert saved == unbounded["transfer"]["bytes_transferred"] - latest["transfer"]["bytes_transferred"] > 0
+
+    def test_size_bookkeeping_runs_off_the_event_loop(self, isolated_disk_cache, mock_abs_api):
+        import threading
+
+        threads = []
+
+        def record(method):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return method(*args)
+            return wrapper
+
+        with patch.object(isolated_disk_cache, "get", record(isolated_disk_cache.get)), \
+                patch.object(isolated_disk_cache, "set", record(isolated_disk_cache.set)), \
+                patch.object(isolated_disk_cache, "stats", record(isolated_disk_cache.stats)):
+            asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, last_n_observations=0))
+            asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, last_n_observations=2))
+            asyncio.run(server.get_service_stats())
+
+        assert threads and threading.get_ident() not in threads
+
+
+TWO_REGIONS = {
+    "data": {
+        "dataSets": [
+            {
+                "series": {
+                    "0:0": {"observations": {"0": [1.5], "1": [2.0]}},
+                    "0:1": {"observations": {"0": [0.5], "1": [0.7]}},
+                }
+            }
+        ],
+        "structures": [
+            {
+                "name": "Monthly Consumer Price Index",
+                "dimensions": {
+                    "series": [
+                        {"id": "MEASURE", "name": "Measure", "values": [{"id": "3", "name": "Percentage Change"}]},
+                        {"id": "REGION", "name": "Region", "values": [
+                            {"id": "1", "name": "Sydney"}, {"id": "2", "name": "Melbourne"}
+                        ]},
+                    ],
+                    "observation": [
+                        {
+                            "id": "TIME_PERIOD",
+                            "name": "Time Period",
+                            "values": [{"id": "2025-01", "name": "2025-01"}, {"id": "2025-02", "name": "2025-02"}],
+                        }
+                    ],
+                },
+            }
+        ],
+    }
+}
+
+
+class TestOutputFormat:
+    """`output_format` selects records or the compact table."""
+
+    def test_compact_is_smaller(self, mock_abs_api):
+        import json
+
+        records = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS))
+        compact = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, output_format="compact"))
+
+        assert compact["table"]["columns"][-1] == "value"
+        assert [row[-1] for row in compact["table"]["rows"]] == [r["value"] for r in records["data_sample"]]
+        assert len(json.dumps(compact["table"])) < len(json.dumps(records["data_sample"]))
+
+    def test_default_from_config(self, mock_abs_api):
+        with patch.object(server.Config, "OUTPUT_FORMAT", "compact"):
+            result = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS))
+        assert "table" in result and "data_sample" not in result
+
+    def test_unknown_format(self):
+        assert "error" in asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, output_format="csv"))
+
+
+class TestResponseBudget:
+    """`get_dataset_data` fits its rows into the response budget."""
+
+    def test_shaping_reported(self, mock_abs_api):
+        result = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS))
+
+        assert result["shaping"]["strategy"] == "full"
+        assert result["shaping"]["rows_dropped"] == 0
+
+    def test_small_budget_summarizes(self, mock_abs_api):
+        result = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, max_response_tokens=150))
+
+        assert result["shaping"]["strategy"] == "summary"
+        assert result["truncated"] is True
+        assert "summary" in result["note"]
+        assert result["summary"][0]["observations"] == 2
+        assert "data_sample" not in result
+
+
+class TestSeriesStatistics:
+    """`get_series_statistics` returns computed figures instead of observations."""
+
+    def test_statistics(self, mock_abs_api):
+        result = asyncio.run(server.get_series_statistics("CPI_M", filters=FILTERS, metrics=["pop", "minmax"]))
+
+        series = result["series"][0]
+        assert series["last"] == ["2025-02", 2.0]
+        assert series["latest_pop_change"] == 0.5
+        assert series["max"] == ["2025-02", 2.0]
+        assert result["constant"]["Measure"] == "Percentage Change"
+        assert "data_sample" not in result
+
+    def test_unknown_metric(self):
+        assert "error" in asyncio.run(server.get_series_statistics("CPI_M", metrics=["median"]))
+
+
+class TestFrequencyConversion:
+    """`get_dataset_data` aggregates or downsamples rows before returning them."""
+
+    def test_annual_mean(self, mock_abs_api):
+        result = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, frequency="A"))
+
+        assert result["data_sample"] == [
+            {"value": 1.75, "Measure": "Percentage Change", "Region": "Weighted average", "Time Period": "2025"}
+        ]
+        assert result["resampling"]["rows_before"] == 2
+        assert result["resampling"]["partial"][0]["observations"] == 2
+
+    def test_invalid_frequency(self, mock_abs_api):
+        result = asyncio.run(server.get_dataset_data("CPI_M", filters=FILTERS, frequency="W"))
+        assert "error" in result
+
+
+def period_message(periods, values):
+    """DATA_MESSAGE with one observation per period."""
+    import copy
+    from test_sdmx_service import DATA_MESSAGE
+
+    message = copy.deepcopy(DATA_MESSAGE)
+    message["data"]["structures"][0]["dimensions"]["observation"][0]["values"] = [
+        {"id": p, "name": p} for p in periods
+    ]
+    message["data"]["dataSets"][0]["series"]["0:0"]["observations"] = {
+        str(i): [v] for i, v in enumerate(values)
+    }
+    return message
+
+
+class TestJoinSeries:
+    """`join_series` aligns series of different datasets and frequencies."""
+
+    MONTHLY = period_message(["2024-01", "2024-02", "2024-03", "2024-04", "2024-05"], [1.0, 2.0, 3.0, 4.0, 5.0])
+    QUARTERLY = period_message(["2024-Q1", "2024-Q2"], [4.0, 5.0])
+
+    def test_monthly_and_quarterly(self, mock_abs_api):
+        mock_abs_api.data = lambda request: self.MONTHLY if "/CPI_M/" in request.url.path else self.QUARTERLY
+        result = asyncio.run(server.join_series(
+            [{"dataset_id": "CPI_M", "filters": FILTERS, "label": "CPI"},
+             {"dataset_id": "WPI", "filters": FILTERS, "label": "WPI"}],
+            how="outer", derived=["CPI - WPI"]
+        ))
+
+        assert len(mock_abs_api.data_requests()) == 2
+        assert result["frequency"] == "Q"
+        assert result["table"]["columns"] == ["period", "CPI", "WPI", "CPI - WPI"]
+        # 2024-Q2 has two of its three months, so it is left out for CPI
+        assert result["table"]["rows"] == [["2024-Q1", 2.0, 4.0, -2.0], ["2024-Q2", None, 5.0, None]]
+        cpi, wpi = result["series"]
+        assert cpi["source_frequency"] == "M" and cpi["aggregation"] == "mean"
+        assert cpi["partial_periods_dropped"] == 1
+        assert "aggregation" not in wpi
+
+    def test_missing_series_fails_the_join(self, mock_abs_api):
+        mock_abs_api.data = lambda request: self.MONTHLY if "/CPI_M/" in request.url.path else None
+        result = asyncio.run(server.join_series(
+            [{"dataset_id": "CPI_M", "filters": FILTERS}, {"dataset_id": "WPI", "filters": FILTERS}]
+        ))
+
+        assert "WPI" in result["error"]
+
+    def test_invalid_arguments(self):
+        assert "error" in asyncio.run(server.join_series([]))
+        assert "error" in asyncio.run(server.join_series([{"dataset_id": "CPI_M", "start_period": "2024"}]))
+        assert "error" in asyncio.run(server.join_series([{"dataset_id": "CPI_M"}], how="left"))
+
+
+class TestMultiSeries:
+    """`get_multi_series_data` fetches several series with one OR-key request."""
+
+    def test_one_request_split_per_series(self, mock_abs_api):
+        mock_abs_api.data = TWO_REGIONS
+        result = asyncio.run(server.get_multi_series_data(
+            "CPI_M", filters={"MEASURE": "3", "REGION": ["2", "1"]}, last_n_observations=2
+        ))
+
+        requests = mock_abs_api.data_requests()
+        assert len(requests) == 1
+        assert requests[0].url.path.endswith("/data/CPI_M/3.2+1")
+        assert result["transfer"]["upstream_requests"] == 1
+
+        melbourne, sydney = result["series"]
+        assert melbourne["filters"] == {"MEASURE": "3", "REGION": "2"}
+        assert [r["value"] for r in melbourne["data_sample"]] == [0.5, 0.7]
+        assert {r["Region"] for r in sydney["data_sample"]} == {"Sydney"}
+
+    def test_compact_output(self, mock_abs_api):
+        mock_abs_api.data = TWO_REGIONS
+        result = asyncio.run(server.get_multi_series_data(
+            "CPI_M", filters={"MEASURE": "3", "REGION": ["2", "1"]}, output_format="compact"
+        ))
+
+        melbourne = result["series"][0]["table"]
+        assert melbourne["constant"]["Region"] == "Melbourne"
+        assert [row[-1] for row in melbourne["rows"]] == [0.5, 0.7]
+        assert "data_sample" not in result["series"][0]
+
+    def test_missing_series_reported(self, mock_abs_api):
+        mock_abs_api.data = TWO_REGIONS
+        result = asyncio.run(server.get_multi_series_data(
+            "CPI_M", filter_sets=[{"MEASURE": "3", "REGION": "1"}, {"MEASURE": "3", "REGION": "9"}]
+        ))
+
+        assert result["series"][0]["total_observations_found"] == 2
+        assert "error" in result["series"][1]
+
+    def test_cross_product_key_keeps_limit_per_series(self, mock_abs_api):
+        periods = [f"2025-{m:02d}" for m in range(1, 6)]
+        message = copy.deepcopy(TWO_REGIONS)
+        message["data"]["structures"][0]["dimensions"]["series"][0]["values"] = [
+            {"id": "1", "name": "Index Numbers"}, {"id": "3", "name": "Percentage Change"}
+        ]
+        message["data"]["structures"][0]["dimensions"]["observation"][0]["values"] = [
+            {"id": p, "name": p} for p in periods
+        ]
+        message["data"]["dataSets"][0]["series"] = {
+            f"{m}:{r}": {"observations": {str(i): [float(i)] for i in range(len(periods))}}
+            for m in range(2) for r in range(2)
+        }
+        mock_abs_api.data = message
+        # Differing on two dimensions, the sets combine into 1+3.1+2, which also selects 2 unrequested series
+        with patch.object(server, "MAX_OBS", 3):
+            result = asyncio.run(server.get_multi_series_data(
+                "CPI_M", filter_sets=[{"MEASURE": "1", "REGION": "1"}, {"MEASURE": "3", "REGION": "2"}]
+            ))
+
+        assert len(mock_abs_api.data_requests()) == 1
+        for entry in result["series"]:
+            assert [r["value"] for r in entry["data_sample"]] == [2.0, 3.0, 4.0]
+            assert entry["truncated"] is True
+            assert entry["total_observations_found"] == 5
+
+    def test_requires_several_series(self):
+        assert "error" in asyncio.run(server.get_multi_series_data("CPI_M"))
+
+
+class TestBatch:
+    """`batch_get_dataset_data` runs heterogeneous requests concurrently."""
+
+    def test_results_in_order_with_errors(self, mock_abs_api):
+        result = asyncio.run(server.batch_get_dataset_data([
+            {"dataset_id": "CPI_M", "filters": FILTERS, "last_n_observations": 2},
+            {"filters": FILTERS},
+            {"dataset_id": "CPI_M", "region": "NSW"},
+        ]))
+
+        first, missing, unknown = result["results"]
+        assert first["ok"] and first["result"]["total_observations_found"] == 2
+        assert not missing["ok"] and "dataset_id" in missing["error"]
+        assert not unknown["ok"] and "region" in unknown["error"]
+        assert (result["succeeded"], result["failed"]) == (1, 2)
+
+    def test_concurrent_with_per_item_timeout(self):
+        async def fake_get_dataset_data(dataset_id, **kwargs):
+            await asyncio.sleep(1.0 if dataset_id == "SLOW" else 0.2)
+            return {"dataset_id": dataset_id}
+
+        with patch.object(server, "get_dataset_data", side_effect=fake_get_dataset_data):
+            result = asyncio.run(server.batch_get_dataset_data(
+                [{"dataset_id": "A"}, {"dataset_id": "B"}, {"dataset_id": "SLOW"}], timeout_seconds=0.5
+            ))
+
+        a, b, slow = result["results"]
+        assert a["ok"] and b["ok"]
+        assert not slow["ok"] and "Timed out" in slow["error"]
+        assert result["elapsed_ms"] < 900  # Slowest item (the timeout), not the sum
+
+    def test_limits(self):
+        assert "error" in asyncio.run(server.batch_get_dataset_data([]))
+        too_many = [{"dataset_id": "CPI_M"}] * (server.Config.BATCH_MAX_ITEMS + 1)
+        assert "error" in asyncio.run(server.batch_get_dataset_data(too_many))
@@ -0,0 +1,116 @@
+"""Tests for request coalescing of identical concurrent calls."""
+
+import asyncio
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from abs_mcp_server import sdmx_service
+from abs_mcp_server.async_sdmx_service import AsyncSDMXService
+from abs_mcp_server.sdmx_service import SDMXService
+from abs_mcp_server.singleflight import AsyncSingleFlight, SingleFlight
+
+from test_sdmx_service import DATA_MESSAGE, DATAFLOW_MESSAGE, DSD_MESSAGE, _response
+
+
+def _run_threads(n, target):
+    results = [None] * n
+    threads = [threading.Thread(target=lambda i=i: results.__setitem__(i, target())) for i in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+class TestSingleFlight:
+    """Test the thread-based in-flight table."""
+
+    def test_concurrent_calls_share_one_execution(self):
+        flights = SingleFlight()
+        executions = []
+
+        def fetch():
+            executions.append(1)
+            time.sleep(0.1)
+            return {"value": 42}
+
+        results = _run_threads(5, lambda: flights.do("key", fetch))
+
+        assert executions == [1]
+        assert all(r is results[0] for r in results)
+        assert flights.stats() == {"calls": 1, "coalesced": 4, "in_flight": 0}
+
+    def test_error_is_shared_and_not_cached(self):
+        flights = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            flights.do("key", fail)
+        assert flights.do("key", lambda: "ok") == "ok"
+
+    def test_get_structure_coalesced(self):
+        def slow_get(*args, **kwargs):
+            time.sleep(0.05)
+            return _response(DATAFLOW_MESSAGE if "/dataflow/" in args[0] else DSD_MESSAGE)
+
+        before = SDMXService.coalescing_stats()["coalesced"]
+        with patch.object(sdmx_service, "_get_session") as mock_session:
+            mock_session.return_value.get.side_effect = slow_get
+            _run_threads(4, lambda: SDMXService.get_structure("CPI_M"))
+
+        assert mock_session.return_value.get.call_count == 2
+        assert SDMXService.coalescing_stats()["coalesced"] - before == 3
+
+
+class TestAsyncSingleFlight:
+    """Test the event-loop in-flight table."""
+
+    def test_concurrent_structure_and_data(self, mock_abs_api):
+        mock_abs_api.delay = 0.05
+
+        async def run():
+            return await asyncio.gather(
+                *[AsyncSDMXService.get_structure("CPI_M") for _ in range(3)],
+                *[AsyncSDMXService.get_data("CPI_M", "3.50") for _ in range(3)],
+            )
+
+        before = AsyncSDMXService.coalescing_stats()["coalesced"]
+        results = asyncio.run(run())
+
+        paths = [r.url.path for r in mock_abs_api.requests]
+        assert paths.count("/dataflow/ABS/CPI_M") == 1
+        assert len(mock_abs_api.data_requests()) == 1
+        assert results[3] == DATA_MESSAGE
+        assert AsyncSDMXService.coalescing_stats()["coalesced"] - before == 4
+
+    def test_different_keys_not_coalesced(self, mock_abs_api):
+        async def run():
+            await asyncio.gather(
+                AsyncSDMXService.get_data("CPI_M", "3.50"),
+                AsyncSDMXService.get_data("CPI_M", "1.50"),
+            )
+
+        asyncio.run(run())
+        assert len(mock_abs_api.data_requests()) == 2
+
+    def test_cancelled_caller_does_not_cancel_shared_call(self):
+        flights = AsyncSingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "done"
+
+        async def run():
+            first = asyncio.create_task(flights.do("key", fetch))
+            second = asyncio.create_task(flights.do("key", fetch))
+            await asyncio.sleep(0)
+            first.cancel()
+            return await second
+
+        assert asyncio.run(run()) == "done"
+        assert flights.stats()["coalesced"] == 1